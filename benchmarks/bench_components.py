@@ -0,0 +1,160 @@
+"""
+Micro-benchmarks of the per-request work around the LLM call.
+
+Covers JSON extraction on realistic model outputs, calculator throughput
+(single operations, expressions and NumPy batches), order responses with
+pydantic construction at large order counts, schema construction and
+serialization strategies per 10k rows, QPS computation at growing
+``data_points``, package creation with QR rendering and prompt assembly. Usually run
+through ``benchmarks.run_all``; standalone from the repository root:
+
+    python -m benchmarks.bench_components [--quick]
+"""
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from benchmarks import bench_prompt, bench_schemas
+from benchmarks.bench_json_extract import make_response
+from benchmarks.harness import BenchResult, format_ns, measure
+from src.demo.main import FUNCTIONS
+from src.demo.schemas.base import OrderItem, OrderResponse
+from src.demo.services.calculator_service import CalculatorService
+from src.demo.services.order_service import OrderService
+from src.demo.services.package_service import PackageService
+from src.demo.services.qps_service import QPSService
+from src.demo.utils.helpers import extract_json_from_response
+
+# (full sizes, --quick sizes) of every parameterized case
+SIZES: Dict[str, Tuple[Tuple[int, ...], Tuple[int, ...]]] = {
+    "json_chars": ((200, 2_000, 20_000), (200, 2_000)),
+    "order_count": ((100, 10_000, 100_000), (100, 10_000)),
+    "data_points": ((10, 1_000, 100_000), (10, 1_000)),
+    "operands": ((1_000, 1_000_000), (1_000, 100_000)),
+}
+
+
+def _order_rows(count: int) -> List[Dict[str, object]]:
+    date = datetime.now().isoformat()
+    return [
+        {"order_id": f"ORD-{i}", "date": date, "product": f"Product {i % 50}", "quantity": i % 5 + 1,
+         "price": 10.0 * (i % 50), "total": 10.0 * (i % 50) * (i % 5 + 1), "status": "completed"}
+        for i in range(count)
+    ]
+
+
+def _populated_order_service(count: int, users: int = 100) -> OrderService:
+    service = OrderService()
+    now = datetime.now()
+    service.create_orders(
+        {"order_id": f"ORD-{i}", "items": [{"product": f"Product {i % 50}", "quantity": i % 5 + 1, "price": 10.0}],
+         "user_id": f"user-{i % users}", "created_at": now - timedelta(minutes=count - i)}
+        for i in range(count)
+    )
+    return service
+
+
+def bench_json_extract(sizes: Tuple[int, ...]) -> Iterator[BenchResult]:
+    """Single-pass extraction with schema check on fenced and unfenced outputs."""
+    for fenced in (True, False):
+        for size in sizes:
+            response = make_response(size, fenced=fenced)
+            yield measure("extract_json_from_response", lambda: extract_json_from_response(response, FUNCTIONS),
+                          {"layout": "fenced" if fenced else "multi_object", "chars": size})
+
+
+def bench_calculator(sizes: Tuple[int, ...]) -> Iterator[BenchResult]:
+    """Single operations, a cached multi-step expression and element-wise batches."""
+    for operation in ("+", "-", "*", "/"):
+        yield measure("calculator.calculate", lambda: CalculatorService.calculate(operation, 23.0, 45.0),
+                      {"operation": operation})
+    yield measure("calculator.evaluate", lambda: CalculatorService.evaluate("(23*45+12)/3"))
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        x, y = rng.random(size), rng.random(size)
+        yield measure("calculator.calculate_batch", lambda: CalculatorService.calculate_batch("/", x, y),
+                      {"operands": size}, repeat=3)
+
+
+def bench_orders(sizes: Tuple[int, ...]) -> Iterator[BenchResult]:
+    """Order pages and summaries on the per-user index, and validated OrderResponse construction."""
+    service = OrderService()
+    yield measure("order_service.get_recent_orders", lambda: service.get_recent_orders("12345", months=3))
+    for size in sizes:
+        service = _populated_order_service(size)
+        yield measure("order_service.get_recent_orders_page",
+                      lambda: service.get_recent_orders("user-7", months=3, limit=20), {"orders": size})
+        yield measure("order_service.summarize_orders",
+                      lambda: service.summarize_orders("user-7", months=3), {"orders": size})
+        rows = _order_rows(size)
+
+        def build() -> OrderResponse:
+            return OrderResponse(user_id="12345", period="Last 3 months", total_orders=len(rows),
+                                 orders=[OrderItem(**row) for row in rows])
+
+        yield measure("order_response.validate", build, {"orders": size}, repeat=3)
+
+
+def bench_qps(sizes: Tuple[int, ...]) -> Iterator[BenchResult]:
+    """QPSService.calculate_qps on simulated data."""
+    service = QPSService(seed=0)
+    for size in sizes:
+        yield measure("qps_service.calculate_qps",
+                      lambda: service.calculate_qps(time_window_minutes=60, data_points=size),
+                      {"data_points": size}, repeat=3)
+
+
+def bench_package() -> Iterator[BenchResult]:
+    """PackageService.create_custom_package with inline QR rendering and with rendering deferred."""
+    with tempfile.TemporaryDirectory() as scratch:
+        for mode in ("sync", "lazy"):
+            service = PackageService(qr_mode=mode, output_dir=scratch)
+            yield measure("package_service.create_custom_package",
+                          lambda: service.create_custom_package("高级套餐", duration=3), {"qr_mode": mode}, repeat=3)
+            service.renderer.shutdown()
+
+
+def run(quick: bool = False) -> List[BenchResult]:
+    """
+    Run every component benchmark.
+
+    Args:
+        quick: Skip the largest size of each parameterized case.
+
+    Returns:
+        Benchmark results.
+    """
+    size = {name: sizes[1 if quick else 0] for name, sizes in SIZES.items()}
+    suites: List[Callable[[], Iterator[BenchResult]]] = [
+        lambda: bench_json_extract(size["json_chars"]),
+        lambda: bench_calculator(size["operands"]),
+        lambda: bench_orders(size["order_count"]),
+        lambda: bench_qps(size["data_points"]),
+        bench_package,
+        bench_schemas.run,
+        bench_prompt.run,
+    ]
+    return [result for suite in suites for result in suite()]
+
+
+def print_results(results: List[BenchResult]) -> None:
+    """Print results as a table."""
+    width = max(len(result.key) for result in results)
+    print(f"{'benchmark':<{width}} {'time/op':>12} {'ops/s':>14}")
+    for result in results:
+        print(f"{result.key:<{width}} {format_ns(result.ns_per_op):>12} {result.ops_per_sec:>14,.0f}")
+
+
+def main() -> None:
+    """Print the benchmark table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="Skip the largest sizes")
+    args = parser.parse_args()
+    print_results(run(quick=args.quick))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Micro-benchmark for ``extract_json_from_response`` on large, noisy model outputs.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_json_extract
+"""
+import json
+import random
+import re
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.demo.main import FUNCTIONS
+from src.demo.utils.helpers import extract_json_from_response
+
+FUNCTION_CALL = {
+    "function": "calculate_qps",
+    "parameters": {"time_window_minutes": 5, "data_points": 10}
+}
+
+
+def legacy_extract_json_from_response(response: str) -> Optional[Dict[str, Any]]:
+    """Previous regex + find/rfind implementation, kept as the baseline."""
+    json_match = re.search(r"```json\s*(.*?)\s*```", response, re.DOTALL)
+    if json_match:
+        try:
+            return json.loads(json_match.group(1))
+        except json.JSONDecodeError:
+            pass
+    try:
+        start = response.find('{')
+        if start != -1:
+            end = response.rfind('}')
+            if end != -1:
+                return json.loads(response[start:end + 1])
+    except json.JSONDecodeError:
+        pass
+    return None
+
+
+_PROSE = [
+    "好的，我来分析一下用户的请求。",
+    "用户想查看最近一段时间的QPS数据，",
+    "根据函数列表，calculate_qps 最合适。",
+    "参数格式为 {参数名: 值}，",
+    "注意 JSON 对象以 { 开始、以 } 结束。",
+    "模型说明：\"time_window_minutes\" 表示分钟数。",
+    "The user asked for QPS over the last few minutes.",
+    "Set {a, b} notation is not JSON.",
+]
+
+
+def make_response(prose_chars: int, fenced: bool = True, seed: int = 0) -> str:
+    """
+    Build a model output with the function call buried in noisy prose.
+
+    Args:
+        prose_chars: Approximate number of prose characters around the call.
+        fenced: Wrap the call in a markdown ```json fence. Unfenced outputs
+            are followed by a second object, which the legacy extractor
+            cannot handle.
+        seed: Random seed.
+
+    Returns:
+        Response text containing stray braces, quotes and the function call.
+    """
+    rng = random.Random(seed)
+    sentences: List[str] = []
+    while sum(map(len, sentences)) < prose_chars:
+        sentences.append(rng.choice(_PROSE))
+    half = len(sentences) // 2
+    before, after = "".join(sentences[:half]), "".join(sentences[half:])
+    call = json.dumps(FUNCTION_CALL, ensure_ascii=False, indent=2)
+    if fenced:
+        return f"{before}\n```json\n{call}\n```\n{after}"
+    return f"{call}\n{after} 示例：{{\"function\": \"\"}}"
+
+
+def run(sizes: Tuple[int, ...] = (200, 10_000, 200_000), repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    Time the legacy and the single-pass extractor.
+
+    Args:
+        sizes: Prose sizes (characters) to test.
+        repeat: Number of timing repetitions; the best one is reported.
+
+    Returns:
+        One row per (implementation, layout, size) with the best time per
+        call and whether the function call was found.
+    """
+    implementations: Dict[str, Callable[[str], Optional[Dict[str, Any]]]] = {
+        "legacy": legacy_extract_json_from_response,
+        "single_pass": extract_json_from_response,
+        "single_pass_schema": lambda text: extract_json_from_response(text, FUNCTIONS),
+    }
+    rows = []
+    for fenced in (True, False):
+        for size in sizes:
+            response = make_response(size, fenced=fenced)
+            number = max(1, 200_000 // max(size, 1))
+            for name, extract in implementations.items():
+                found = extract(response) == FUNCTION_CALL
+                best = min(timeit.repeat(lambda: extract(response), number=number, repeat=repeat)) / number
+                rows.append({
+                    "impl": name,
+                    "layout": "fenced" if fenced else "multi_object",
+                    "chars": len(response),
+                    "us_per_call": best * 1e6,
+                    "found": found
+                })
+    return rows
+
+
+def main() -> None:
+    """Print the benchmark table."""
+    print(f"{'impl':<20} {'layout':<14} {'chars':>10} {'us/call':>12} {'found':>6}")
+    for row in run():
+        print(
+            f"{row['impl']:<20} {row['layout']:<14} {row['chars']:>10} "
+            f"{row['us_per_call']:>12.1f} {str(row['found']):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of function-calling prompt assembly and the prompt size it produces.
+
+Compares the prompt as it was built before tool selection (every schema
+serialized and pretty-printed on each call, ``legacy``) with the selected,
+compact prompt (``selected``) per query: build time and estimated prompt
+tokens. Prompt tokens are what the model has to evaluate before its first
+output token. Run from the repository root:
+
+    python -m benchmarks.bench_prompt
+"""
+import json
+from typing import Dict, Iterator, List
+
+from benchmarks.harness import BenchResult, format_ns, measure
+from src.demo.core.prompt import PROMPT_TEMPLATE, PromptBuilder, estimate_tokens
+from src.demo.main import TOOLS
+
+QUERIES = [
+    "北京的天气怎么样？",
+    "帮我计算23乘以45",
+    "计算 (23*45+12)/3",
+    "查询用户12345最近3个月的订单",
+    "创建3个月的高级套餐，包含数据分析和专家咨询功能",
+    "计算最近5分钟的QPS",
+    "讲个笑话",
+]
+
+
+def legacy_build(query: str) -> str:
+    """Build the prompt the way it was built before tool selection."""
+    functions = json.dumps(TOOLS.functions(), indent=2, ensure_ascii=False)
+    return PROMPT_TEMPLATE.replace("{query}", query, 1).replace("{functions}", functions, 1)
+
+
+def token_report(builder: PromptBuilder, queries: List[str] = QUERIES) -> List[Dict[str, object]]:
+    """
+    Compare the estimated prompt tokens per query.
+
+    Args:
+        builder: Prompt builder to report on.
+        queries: Queries to build prompts for.
+
+    Returns:
+        One row per query with the selected tools and both token counts.
+    """
+    return [
+        {
+            "query": query,
+            "tools": builder.select(query),
+            "baseline_tokens": estimate_tokens(builder.baseline(query)),
+            "selected_tokens": estimate_tokens(builder.build(query)),
+        }
+        for query in queries
+    ]
+
+
+def run() -> Iterator[BenchResult]:
+    """
+    Time building the legacy and the selected prompt for every query.
+
+    Yields:
+        One result per (strategy, query).
+    """
+    builder = PromptBuilder(TOOLS)
+    for index, query in enumerate(QUERIES):
+        for mode, build in (("legacy", legacy_build), ("selected", builder.build)):
+            yield measure("prompt.build", lambda: build(query), {"mode": mode, "query": index})
+
+
+def main() -> None:
+    """Print build times and the estimated prompt tokens saved per query."""
+    results = {(result.params["mode"], result.params["query"]): result.ns_per_op for result in run()}
+    rows = token_report(PromptBuilder(TOOLS))
+    print(f"{'tools':>5} {'tokens':>14} {'saved':>6} {'build time':>22}  query")
+    for index, row in enumerate(rows):
+        baseline, selected = row["baseline_tokens"], row["selected_tokens"]
+        times = f"{format_ns(results['legacy', index])} -> {format_ns(results['selected', index])}"
+        print(f"{len(row['tools']):>5} {baseline:>6} -> {selected:<5} {1 - selected / baseline:>6.0%} "
+              f"{times:>22}  {row['query']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark of the windowed QPS aggregation behind ``main.calculate_qps``.
+
+Compares the previous per-window Python loop over raw events, a single
+NumPy pass over raw events, and the per-second bucket layout the request
+recorder stores (optionally the client/server strategies against a live
+Redis). Run from the repository root:
+
+    python -m benchmarks.bench_qps_aggregation [--redis-url redis://localhost:6379/15]
+"""
+import argparse
+import time
+import timeit
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.demo.core.request_log import RedisRequestRecorder
+from src.demo.utils.helpers import aggregate_windows
+
+WINDOW_SECONDS = 600
+DATA_POINTS = 10
+# The legacy loop is O(events x windows) in Python; beyond this it takes minutes
+LEGACY_MAX_EVENTS = 1_000_000
+
+
+def legacy_window_counts(scored: List[Tuple[bytes, float]], start_ts: int, end_ts: int,
+                         data_points: int) -> List[int]:
+    """Previous implementation: rescan every event for every window."""
+    window_size = (end_ts - start_ts) / data_points
+    windows = [(start_ts + i * window_size, start_ts + (i + 1) * window_size) for i in range(data_points)]
+    return [len([score for _, score in scored if window_start <= score < window_end])
+            for window_start, window_end in windows]
+
+
+def _best(func: Any, repeat: int = 3) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(sizes: Sequence[int] = (10_000, 1_000_000, 10_000_000),
+        redis_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Time each aggregation strategy at the given event counts.
+
+    Args:
+        sizes: Number of events in the window.
+        redis_url: If given, also time the recorder's client- and server-side
+            strategies against this Redis (the database is written to).
+
+    Returns:
+        One row per (strategy, size) with the best time in milliseconds.
+    """
+    start_ts = int(time.time()) - WINDOW_SECONDS
+    end_ts = start_ts + WINDOW_SECONDS
+    rng = np.random.default_rng(0)
+    recorder = None
+    if redis_url is not None:
+        import redis
+        recorder = RedisRequestRecorder(client=redis.Redis.from_url(redis_url), key_prefix="bench_request_log")
+
+    rows = []
+    for size in sizes:
+        events = rng.uniform(start_ts, end_ts, size)
+        per_second = np.bincount((events - start_ts).astype(np.int64), minlength=WINDOW_SECONDS)
+        seconds = np.arange(start_ts, end_ts, dtype=np.float64)
+        timings: Dict[str, Optional[float]] = {
+            "numpy_raw_events": _best(lambda: aggregate_windows(events, start_ts, end_ts, DATA_POINTS)),
+            "numpy_per_second": _best(
+                lambda: aggregate_windows(seconds, start_ts, end_ts, DATA_POINTS, weights=per_second)
+            ),
+        }
+        if size <= LEGACY_MAX_EVENTS:
+            scored = [(b"", float(ts)) for ts in events]
+            timings["legacy_loop"] = _best(
+                lambda: legacy_window_counts(scored, start_ts, end_ts, DATA_POINTS), repeat=1
+            )
+        else:
+            timings["legacy_loop"] = None
+        if recorder is not None:
+            for second, count in zip(range(start_ts, end_ts), per_second.tolist()):
+                recorder.client.set(recorder.key(second), count)
+            for strategy in ("client", "server"):
+                timings[f"redis_{strategy}"] = _best(
+                    lambda: recorder.window_counts(start_ts, end_ts, DATA_POINTS, strategy=strategy)
+                )
+        for name, seconds_taken in timings.items():
+            rows.append({
+                "strategy": name,
+                "events": size,
+                "ms": None if seconds_taken is None else seconds_taken * 1e3
+            })
+    return rows
+
+
+def main() -> None:
+    """Print the benchmark table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default=None, help="Redis to benchmark the recorder strategies against")
+    args = parser.parse_args()
+    print(f"{'strategy':<20} {'events':>12} {'ms':>12}")
+    for row in run(redis_url=args.redis_url):
+        ms = "skipped" if row["ms"] is None else f"{row['ms']:.3f}"
+        print(f"{row['strategy']:<20} {row['events']:>12} {ms:>12}")
+
+
+if __name__ == "__main__":
+    main()
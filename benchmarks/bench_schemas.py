@@ -0,0 +1,87 @@
+"""
+Benchmark of building and serializing response schemas from internal data.
+
+Compares full validation (``Model(**row)``), ``model_construct`` and one
+cached ``TypeAdapter`` call over the whole list, per ``ROWS`` rows, and a
+response embedding those rows built with and without validation
+(``Model.trusted``, i.e. ``model_construct``). Run from the repository root:
+
+    python -m benchmarks.bench_schemas
+"""
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Type
+
+from benchmarks.harness import BenchResult, format_ns, measure
+from src.demo.schemas.base import OrderItem, OrderResponse, QPSData, TrustedModel, list_adapter
+
+ROWS = 10_000
+
+
+def _order_rows(count: int) -> List[Dict[str, Any]]:
+    date = datetime.now().isoformat()
+    return [
+        {"order_id": f"ORD-{i}", "date": date, "product": f"Product {i % 50}", "quantity": i % 5 + 1,
+         "price": 10.0 * (i % 50), "total": 10.0 * (i % 50) * (i % 5 + 1), "status": "completed"}
+        for i in range(count)
+    ]
+
+
+def _qps_rows(count: int) -> List[Dict[str, Any]]:
+    start = datetime.now()
+    return [{"timestamp": start + timedelta(seconds=i), "qps_value": float(i % 100)} for i in range(count)]
+
+
+def _construct_cases(model: Type[TrustedModel], rows: List[Dict[str, Any]]) -> Dict[str, Callable[[], Any]]:
+    adapter = list_adapter(model)
+    return {
+        "validate": lambda: [model(**row) for row in rows],
+        "model_construct": lambda: [model.model_construct(**row) for row in rows],
+        "adapter": lambda: adapter.validate_python(rows),
+    }
+
+
+def run(rows: int = ROWS) -> Iterator[BenchResult]:
+    """
+    Time every construction and serialization strategy.
+
+    Args:
+        rows: Rows per timed operation.
+
+    Yields:
+        One result per (operation, strategy); ``ns_per_op`` covers all rows.
+    """
+    for model, data in ((OrderItem, _order_rows(rows)), (QPSData, _qps_rows(rows))):
+        for mode, build in _construct_cases(model, data).items():
+            yield measure(f"schema.construct.{model.__name__}", build, {"mode": mode, "rows": rows}, repeat=3)
+
+    items = [OrderItem(**row) for row in _order_rows(rows)]
+    response_cases = {
+        "validate": lambda: OrderResponse(user_id="12345", period="Last 3 months", total_orders=rows, orders=items),
+        "trusted": lambda: OrderResponse.trusted(user_id="12345", period="Last 3 months", total_orders=rows,
+                                                 orders=items),
+    }
+    for mode, build in response_cases.items():
+        yield measure("schema.construct.OrderResponse", build, {"mode": mode, "rows": rows}, repeat=3)
+
+    adapter = list_adapter(OrderItem)
+    dump_cases = {
+        "model_dump": lambda: [item.model_dump() for item in items],
+        "adapter": lambda: adapter.dump_python(items),
+        "adapter_json": lambda: adapter.dump_json(items),
+    }
+    for mode, dump in dump_cases.items():
+        yield measure("schema.dump.OrderItem", dump, {"mode": mode, "rows": rows}, repeat=3)
+
+
+def main() -> None:
+    """Print the cost per ``ROWS`` rows and the speedup over full validation."""
+    results = list(run())
+    baselines = {result.name: result.ns_per_op for result in results if result.params["mode"] in ("validate", "model_dump")}
+    print(f"{'operation':<32} {'mode':<16} {f'time/{ROWS} rows':>16} {'speedup':>8}")
+    for result in results:
+        speedup = baselines[result.name] / result.ns_per_op
+        print(f"{result.name:<32} {result.params['mode']:<16} {format_ns(result.ns_per_op):>16} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
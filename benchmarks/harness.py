@@ -0,0 +1,158 @@
+"""
+Timing, persistence and regression checks shared by the benchmark suite.
+
+Results are stored as JSON so runs can be diffed and compared in CI:
+
+    {"metadata": {...}, "results": [{"name": ..., "params": {...}, "ns_per_op": ...}, ...]}
+"""
+import json
+import platform
+import sys
+import timeit
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class BenchResult:
+    """Best observed time of one benchmark case."""
+    name: str
+    ns_per_op: float
+    params: Dict[str, Any] = field(default_factory=dict)
+    number: int = 1  # calls per timed repeat
+    repeat: int = 1
+
+    @property
+    def key(self) -> str:
+        """Identifier used to match results across runs."""
+        if not self.params:
+            return self.name
+        params = ",".join(f"{name}={value}" for name, value in sorted(self.params.items()))
+        return f"{self.name}[{params}]"
+
+    @property
+    def ops_per_sec(self) -> float:
+        """Throughput implied by :attr:`ns_per_op`."""
+        return 1e9 / self.ns_per_op if self.ns_per_op else 0.0
+
+
+@dataclass
+class Regression:
+    """A case that got slower than the threshold allows."""
+    key: str
+    baseline_ns: float
+    current_ns: float
+
+    @property
+    def ratio(self) -> float:
+        """Current time divided by baseline time."""
+        return self.current_ns / self.baseline_ns
+
+
+def measure(
+        name: str,
+        func: Callable[[], Any],
+        params: Optional[Dict[str, Any]] = None,
+        repeat: int = 5,
+        min_time: float = 0.05
+    ) -> BenchResult:
+    """
+    Time ``func`` and keep the best repeat.
+
+    The number of calls per repeat is calibrated so that one repeat takes at
+    least ``min_time`` seconds, which keeps timer resolution out of the
+    result for fast functions.
+
+    Args:
+        name: Benchmark name.
+        func: Zero-argument callable to time.
+        params: Parameters of this case, part of its key.
+        repeat: Number of timed repeats.
+        min_time: Minimum duration of one repeat in seconds.
+
+    Returns:
+        BenchResult with the best time per call.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    best = min([elapsed] + timer.repeat(repeat=max(repeat - 1, 0), number=number))
+    return BenchResult(name=name, ns_per_op=best / number * 1e9, params=dict(params or {}),
+                       number=number, repeat=repeat)
+
+
+def save_results(path: str, results: Sequence[BenchResult]) -> None:
+    """
+    Write results and run metadata as JSON.
+
+    Args:
+        path: Output file.
+        results: Benchmark results.
+    """
+    document = {
+        "metadata": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine()
+        },
+        "results": [{**asdict(result), "key": result.key} for result in results]
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path: str) -> List[BenchResult]:
+    """
+    Read results written by :func:`save_results`.
+
+    Args:
+        path: Results file.
+
+    Returns:
+        Benchmark results.
+    """
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    return [
+        BenchResult(name=row["name"], ns_per_op=row["ns_per_op"], params=row.get("params", {}),
+                    number=row.get("number", 1), repeat=row.get("repeat", 1))
+        for row in document["results"]
+    ]
+
+
+def compare(baseline: Sequence[BenchResult], current: Sequence[BenchResult],
+            threshold: float = 0.15) -> List[Regression]:
+    """
+    Find cases that got slower than ``threshold`` relative to the baseline.
+
+    Cases missing from either run are ignored.
+
+    Args:
+        baseline: Reference results.
+        current: Results of this run.
+        threshold: Allowed slowdown, e.g. 0.15 for 15%.
+
+    Returns:
+        Regressions, slowest ratio first.
+    """
+    reference = {result.key: result.ns_per_op for result in baseline}
+    regressions = [
+        Regression(key=result.key, baseline_ns=reference[result.key], current_ns=result.ns_per_op)
+        for result in current
+        if result.key in reference and result.ns_per_op > reference[result.key] * (1 + threshold)
+    ]
+    return sorted(regressions, key=lambda regression: regression.ratio, reverse=True)
+
+
+def format_ns(ns: float) -> str:
+    """Render a duration with a readable unit."""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
@@ -0,0 +1,277 @@
+"""
+End-to-end load generator for ``FunctionCallingDemo.process_query``.
+
+Starts the bundled Ollama stand-in (or targets ``--ollama-url``), then
+drives the demo either closed-loop at a fixed concurrency or open-loop at a
+fixed arrival rate, and reports throughput and latency percentiles. The
+routing cache and fast-path router are disabled by default so every query
+reaches the model. Run from the repository root:
+
+    python -m benchmarks.load_test --concurrency 16 --requests 500
+    python -m benchmarks.load_test --rate 40 --requests 1000 --ttft-ms 150
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+from langchain_community.llms import Ollama
+
+from benchmarks.ollama_stub import OllamaStubServer, add_config_arguments, config_from_args
+from src.demo.core.llm import PooledOllama
+from src.demo.core.metrics import PipelineMetrics
+from src.demo.core.qps_counter import RingBufferQPSCounter
+from src.demo.main import FunctionCallingDemo
+
+# Package creation is left out: it writes a QR code image per request
+DEFAULT_QUERIES = [
+    "北京的天气怎么样？",
+    "帮我计算23乘以45",
+    "查询用户12345最近3个月的订单",
+    "计算最近5分钟的QPS",
+    "上海的天气如何？",
+    "计算 15 加 27",
+]
+
+
+@dataclass
+class LoadReport:
+    """Outcome of one load run; latencies are in milliseconds."""
+    mode: str
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_latencies(cls, mode: str, latencies: Sequence[float], errors: int, duration_s: float) -> "LoadReport":
+        """
+        Summarize raw latencies.
+
+        Args:
+            mode: Human-readable description of the load shape.
+            latencies: Per-request latency in seconds.
+            errors: Number of requests that raised.
+            duration_s: Wall time of the run.
+
+        Returns:
+            LoadReport.
+        """
+        values = np.asarray(latencies, dtype=np.float64) * 1e3
+        p50, p95, p99 = np.percentile(values, (50, 95, 99)) if len(values) else (0.0, 0.0, 0.0)
+        return cls(
+            mode=mode,
+            requests=len(values),
+            errors=errors,
+            duration_s=duration_s,
+            throughput_rps=len(values) / duration_s if duration_s else 0.0,
+            mean_ms=float(values.mean()) if len(values) else 0.0,
+            p50_ms=float(p50),
+            p95_ms=float(p95),
+            p99_ms=float(p99),
+            max_ms=float(values.max()) if len(values) else 0.0
+        )
+
+
+def run_closed_loop(process: Callable[[str], Any], queries: Sequence[str], total: int,
+                    concurrency: int) -> LoadReport:
+    """
+    Keep ``concurrency`` requests in flight until ``total`` have completed.
+
+    Args:
+        process: Function handling one query, e.g. ``demo.process_query``.
+        queries: Queries sent round-robin.
+        total: Number of requests.
+        concurrency: Number of concurrent workers.
+
+    Returns:
+        LoadReport.
+
+    Raises:
+        ValueError: If concurrency is less than 1.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors = [0]
+
+    def worker() -> None:
+        while True:
+            with lock:
+                index = next(counter)
+            if index >= total:
+                return
+            start = time.perf_counter()
+            try:
+                process(queries[index % len(queries)])
+                failed = False
+            except Exception:
+                failed = True
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                errors[0] += failed
+
+    began = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return LoadReport.from_latencies(f"concurrency={concurrency}", latencies, errors[0], time.perf_counter() - began)
+
+
+def run_open_loop(process: Callable[[str], Any], queries: Sequence[str], total: int, rate: float,
+                  max_in_flight: int = 256) -> LoadReport:
+    """
+    Issue requests at a fixed arrival rate, independent of completions.
+
+    Latency is measured from each request's scheduled start, so time spent
+    queued behind a saturated system is counted instead of hidden.
+
+    Args:
+        process: Function handling one query.
+        queries: Queries sent round-robin.
+        total: Number of requests.
+        rate: Arrivals per second.
+        max_in_flight: Worker threads available to in-flight requests.
+
+    Returns:
+        LoadReport.
+
+    Raises:
+        ValueError: If rate is not positive.
+    """
+    if rate <= 0:
+        raise ValueError(f"rate must be positive, got {rate}")
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors = [0]
+
+    def call(query: str, scheduled: float) -> None:
+        try:
+            process(query)
+            failed = False
+        except Exception:
+            failed = True
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            latencies.append(elapsed)
+            errors[0] += failed
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        for index in range(total):
+            scheduled = began + index / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(call, queries[index % len(queries)], scheduled)
+    return LoadReport.from_latencies(f"rate={rate:g}/s", latencies, errors[0], time.perf_counter() - began)
+
+
+def build_demo(base_url: str, model: str, streaming: bool = False, with_routing: bool = False,
+               pooled: bool = True) -> FunctionCallingDemo:
+    """
+    Build a FunctionCallingDemo pointed at ``base_url`` with in-process QPS counting.
+
+    Args:
+        base_url: Ollama (or stand-in) URL.
+        model: Model name.
+        streaming: Use streaming early termination.
+        with_routing: Keep the routing cache and fast-path router enabled.
+        pooled: Use the application's pooled client instead of the stock
+            ``Ollama`` client, which opens a connection per call.
+
+    Returns:
+        FunctionCallingDemo.
+    """
+    llm_class = PooledOllama if pooled else Ollama
+    return FunctionCallingDemo(
+        llm=llm_class(model=model, base_url=base_url, temperature=0),
+        enable_cache=with_routing,
+        enable_fast_path=with_routing,
+        streaming=streaming,
+        qps_backend=RingBufferQPSCounter()
+    )
+
+
+def run(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    """
+    Warm up, run the configured load and collect the demo's stage statistics.
+
+    Args:
+        args: Parsed command-line options.
+        base_url: Ollama (or stand-in) URL.
+
+    Returns:
+        Dictionary with the load report and the per-stage latencies.
+    """
+    demo = build_demo(base_url, args.model, streaming=args.streaming, with_routing=args.with_routing,
+                      pooled=not args.plain_client)
+    # process_query prints progress; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        demo.warm_up(background=False)
+        for query in DEFAULT_QUERIES:
+            demo.process_query(query)
+        demo.metrics = PipelineMetrics()  # drop the warm-up samples
+        if args.rate:
+            report = run_open_loop(demo.process_query, DEFAULT_QUERIES, args.requests, args.rate)
+        else:
+            report = run_closed_loop(demo.process_query, DEFAULT_QUERIES, args.requests, args.concurrency)
+    return {"report": asdict(report), "stages": demo.stats()["stages"]}
+
+
+def main() -> None:
+    """Run the load test and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=8, help="Closed loop: requests in flight")
+    load.add_argument("--rate", type=float, default=None, help="Open loop: arrivals per second")
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests")
+    parser.add_argument("--ollama-url", default=None, help="Use this server instead of the stand-in")
+    parser.add_argument("--streaming", action="store_true", help="Stream and stop at the first function call")
+    parser.add_argument("--with-routing", action="store_true", help="Keep the routing cache and fast path")
+    parser.add_argument("--plain-client", action="store_true",
+                        help="Use the stock Ollama client (a new connection per call) instead of the pooled one")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    if args.ollama_url:
+        result = run(args, args.ollama_url)
+    else:
+        with OllamaStubServer(config_from_args(args)) as stub:
+            result = run(args, stub.base_url)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    report = result["report"]
+    print(f"mode:        {report['mode']}")
+    print(f"requests:    {report['requests']} ({report['errors']} errors) in {report['duration_s']:.2f}s")
+    print(f"throughput:  {report['throughput_rps']:.1f} req/s")
+    print(f"latency ms:  mean {report['mean_ms']:.1f}  p50 {report['p50_ms']:.1f}  "
+          f"p95 {report['p95_ms']:.1f}  p99 {report['p99_ms']:.1f}  max {report['max_ms']:.1f}")
+    print(f"\n{'stage':<14} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage, summary in result["stages"].items():
+        print(f"{stage:<14} {summary['count']:>7} {summary['p50_ms']:>9.2f} "
+              f"{summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Local stand-in for the Ollama HTTP API, for benchmarking without a GPU host.
+
+Serves ``POST /api/generate`` (streaming NDJSON or a single JSON body),
+``GET /api/tags`` and ``GET /api/version``. Replies are canned function
+calls chosen by keyword from the user request embedded in the prompt, and
+are emitted token by token after a configurable time to first token. Run
+from the repository root:
+
+    python -m benchmarks.ollama_stub --port 11434 --ttft-ms 200 --tokens-per-second 50
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+# Matches the user request line of ``src.demo.core.prompt.PROMPT_TEMPLATE``
+_QUERY_RE = re.compile(r'用户请求: "(.*)"')
+
+# (pattern on the user request, function call returned by the "model")
+DEFAULT_RESPONSES: List[Tuple[str, Dict[str, Any]]] = [
+    (r"天气|weather", {"function": "get_current_weather", "parameters": {"location": "Beijing"}}),
+    (r"计算.*QPS|QPS|qps", {"function": "calculate_qps", "parameters": {"time_window_minutes": 5, "data_points": 10}}),
+    (r"计算|加|减|乘|除|calculate", {"function": "calculator", "parameters": {"x": 23, "y": 45, "operation": "*"}}),
+    (r"订单|orders?", {"function": "get_recent_orders", "parameters": {"user_id": "12345", "months": 3}}),
+    (r"套餐|package", {"function": "create_custom_package", "parameters": {"name": "高级套餐", "duration": 3}}),
+]
+
+
+@dataclass
+class StubConfig:
+    """Timing and formatting of the simulated model."""
+    model: str = "qwen2.5-coder:32b"
+    ttft_ms: float = 200.0  # delay before the first token
+    tokens_per_second: float = 50.0  # 0 or less emits all tokens at once
+    chars_per_token: int = 4
+    fenced: bool = False  # wrap replies in a ```json fence like chatty models do
+
+
+class OllamaStubServer:
+    """
+    Threaded HTTP server speaking the subset of the Ollama API used by LangChain.
+
+    Example:
+        >>> with OllamaStubServer(StubConfig(ttft_ms=0)) as stub:
+        ...     llm = Ollama(model="qwen2.5-coder:32b", base_url=stub.base_url)
+    """
+
+    def __init__(
+            self,
+            config: Optional[StubConfig] = None,
+            responses: Optional[Sequence[Tuple[str, Dict[str, Any]]]] = None,
+            host: str = "127.0.0.1",
+            port: int = 0
+        ):
+        """
+        Initialize the server; it starts listening on :meth:`start`.
+
+        Args:
+            config: Simulated model timing; defaults to :class:`StubConfig`.
+            responses: ``(pattern, function_call)`` pairs tried in order
+                against the user request. Unmatched requests get ``{}``.
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free one.
+        """
+        self.config = config or StubConfig()
+        self.responses: List[Tuple[Pattern[str], str]] = [
+            (re.compile(pattern, re.IGNORECASE), json.dumps(call, ensure_ascii=False))
+            for pattern, call in (DEFAULT_RESPONSES if responses is None else responses)
+        ]
+        self.requests_served = 0
+        self._counter_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """URL to pass as the LLM ``base_url``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "OllamaStubServer":
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="ollama-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "OllamaStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def reply_for(self, prompt: str) -> str:
+        """
+        Choose the canned reply for a prompt.
+
+        Args:
+            prompt: Prompt received on /api/generate.
+
+        Returns:
+            Model output text.
+        """
+        match = _QUERY_RE.search(prompt)
+        query = match.group(1) if match else prompt
+        reply = "{}"
+        for pattern, call in self.responses:
+            if pattern.search(query):
+                reply = call
+                break
+        if self.config.fenced:
+            reply = f"```json\n{reply}\n```"
+        return reply
+
+    def tokens(self, text: str) -> Iterator[str]:
+        """
+        Split a reply into tokens and pace them like the configured model.
+
+        Args:
+            text: Full reply.
+
+        Yields:
+            Consecutive pieces of ``text``.
+        """
+        size = max(1, self.config.chars_per_token)
+        interval = 1 / self.config.tokens_per_second if self.config.tokens_per_second > 0 else 0.0
+        time.sleep(self.config.ttft_ms / 1000)
+        # Pace against an absolute schedule so sleep overshoot does not accumulate
+        start = time.perf_counter()
+        for index, offset in enumerate(range(0, len(text), size)):
+            if index and interval:
+                delay = start + index * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield text[offset:offset + size]
+
+    def _count_request(self) -> None:
+        with self._counter_lock:
+            self.requests_served += 1
+
+    def _handler_class(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse connections
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _write_chunk(self, body: Dict[str, Any]) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8") + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def do_GET(self) -> None:
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": [{
+                        "name": stub.config.model,
+                        "model": stub.config.model,
+                        "modified_at": _now(),
+                        "size": 0,
+                        "details": {"format": "gguf", "family": "stub"}
+                    }]})
+                elif self.path == "/api/version":
+                    self._send_json(200, {"version": "0.0.0-stub"})
+                else:
+                    self._send_json(404, {"error": f"not found: {self.path}"})
+
+            def do_POST(self) -> None:
+                if self.path != "/api/generate":
+                    self._send_json(404, {"error": f"not found: {self.path}"})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": "invalid JSON body"})
+                    return
+                stub._count_request()
+                model = payload.get("model") or stub.config.model
+                started = time.perf_counter_ns()
+                pieces = stub.tokens(stub.reply_for(payload.get("prompt", "")))
+                if payload.get("stream", True) is False:
+                    text = "".join(pieces)
+                    self._send_json(200, _final(model, started, text, len(text)))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                count = 0
+                try:
+                    for piece in pieces:
+                        count += 1
+                        self._write_chunk({"model": model, "created_at": _now(), "response": piece, "done": False})
+                    self._write_chunk(_final(model, started, "", count))
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped reading early (streaming early termination)
+                    self.close_connection = True
+
+        return Handler
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _final(model: str, started_ns: int, text: str, eval_count: int) -> Dict[str, Any]:
+    duration = time.perf_counter_ns() - started_ns
+    return {
+        "model": model,
+        "created_at": _now(),
+        "response": text,
+        "done": True,
+        "done_reason": "stop",
+        "total_duration": duration,
+        "eval_count": eval_count,
+        "eval_duration": duration
+    }
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the :class:`StubConfig` options to a command-line parser."""
+    defaults = StubConfig()
+    parser.add_argument("--model", default=defaults.model, help="Model name reported by the stub")
+    parser.add_argument("--ttft-ms", type=float, default=defaults.ttft_ms, help="Time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second,
+                        help="Generation speed after the first token")
+    parser.add_argument("--chars-per-token", type=int, default=defaults.chars_per_token)
+    parser.add_argument("--fenced", action="store_true", help="Wrap replies in a ```json fence")
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    """Build a :class:`StubConfig` from parsed :func:`add_config_arguments` options."""
+    return StubConfig(
+        model=args.model,
+        ttft_ms=args.ttft_ms,
+        tokens_per_second=args.tokens_per_second,
+        chars_per_token=args.chars_per_token,
+        fenced=args.fenced
+    )
+
+
+def main() -> None:
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    server = OllamaStubServer(config_from_args(args), host=args.host, port=args.port)
+    print(f"Ollama stand-in listening on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
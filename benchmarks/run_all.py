@@ -0,0 +1,51 @@
+"""
+Run the component benchmark suite, save the results and check for regressions.
+
+Run from the repository root:
+
+    # record a baseline
+    python -m benchmarks.run_all --output baseline.json
+    # later: fail (exit 1) if any case is more than 15% slower
+    python -m benchmarks.run_all --output current.json --baseline baseline.json --threshold 0.15
+"""
+import argparse
+import sys
+
+from benchmarks import bench_components
+from benchmarks.harness import compare, format_ns, load_results, save_results
+
+
+def main() -> int:
+    """
+    Run the suite.
+
+    Returns:
+        Process exit code: 1 if a regression was found, else 0.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results (JSON)")
+    parser.add_argument("--baseline", default=None, help="Results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown, e.g. 0.15 for 15%%")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest sizes")
+    args = parser.parse_args()
+
+    results = bench_components.run(quick=args.quick)
+    bench_components.print_results(results)
+    save_results(args.output, results)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline is None:
+        return 0
+    regressions = compare(load_results(args.baseline), results, threshold=args.threshold)
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+        return 0
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline}:")
+    for regression in regressions:
+        print(f"  {regression.key}: {format_ns(regression.baseline_ns)} -> "
+              f"{format_ns(regression.current_ns)} ({regression.ratio:.2f}x)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Startup-time report for the CLI.
+
+Runs fresh interpreters and reports
+
+* the wall time of each startup phase: importing ``src.demo.main``,
+  constructing ``FunctionCallingDemo``, the first fast-path query, compiling
+  every tool (what the first LLM prompt needs) and creating the LLM client;
+* an import-time breakdown from ``python -X importtime``, summed per
+  top-level package, plus the slowest individual imports.
+
+Run from the repository root:
+
+    python -m benchmarks.startup [--top 15] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+_PHASES_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+marks = {}
+def mark(name):
+    marks[name] = (time.perf_counter() - start) * 1e3
+import importlib
+demo_main = importlib.import_module("src.demo.main")
+mark("import")
+demo = demo_main.FunctionCallingDemo()
+mark("construct")
+demo.process_query("北京的天气怎么样？")
+mark("first_fast_path_query")
+demo_main.TOOLS.functions()
+mark("compile_all_tools")
+demo.llm
+mark("create_llm_client")
+print(json.dumps({"marks": marks, "modules": len(sys.modules)}))
+"""
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run([sys.executable, *args], cwd=root, capture_output=True, text=True, check=True)
+
+
+def phase_times() -> Dict[str, Any]:
+    """
+    Time the startup phases in a fresh interpreter.
+
+    Returns:
+        Dictionary with the cumulative milliseconds after each phase and the
+        number of loaded modules at the end.
+    """
+    output = _run(["-c", _PHASES_SCRIPT]).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_times(module: str = "src.demo.main") -> List[Tuple[str, int, int]]:
+    """
+    Collect ``-X importtime`` data for importing a module in a fresh interpreter.
+
+    Args:
+        module: Module to import.
+
+    Returns:
+        (module, self microseconds, cumulative microseconds) per imported module.
+    """
+    stderr = _run(["-X", "importtime", "-c", f"import {module}"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def report(top: int = 15) -> Dict[str, Any]:
+    """
+    Build the startup report.
+
+    Args:
+        top: Number of packages and modules to list.
+
+    Returns:
+        Dictionary with ``phases_ms``, ``modules_loaded``, ``import_total_ms``,
+        ``packages_ms`` (self time per top-level package) and ``slowest_ms``
+        (cumulative time of the slowest imports).
+    """
+    phases = phase_times()
+    rows = import_times()
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    return {
+        "phases_ms": phases["marks"],
+        "modules_loaded": phases["modules"],
+        "import_total_ms": sum(self_us for _, self_us, _ in rows) / 1e3,
+        "packages_ms": {
+            name: us / 1e3 for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        },
+        "slowest_ms": {
+            name: us / 1e3 for name, _, us in sorted(rows, key=lambda row: -row[2])[:top]
+        },
+    }
+
+
+def main() -> None:
+    """Print the startup report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=15, help="Packages and modules to list")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    result = report(args.top)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print("phase (cumulative)            ms")
+    for name, ms in result["phases_ms"].items():
+        print(f"{name:<26} {ms:>8.1f}")
+    print(f"\nimport src.demo.main: {result['import_total_ms']:.1f} ms of imports (incl. interpreter startup), "
+          f"{result['modules_loaded']} modules loaded after all phases")
+    print("\nself time by package          ms")
+    for name, ms in result["packages_ms"].items():
+        print(f"{name:<26} {ms:>8.1f}")
+    print("\nslowest imports (cumulative)  ms")
+    for name, ms in result["slowest_ms"].items():
+        print(f"{name:<40} {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
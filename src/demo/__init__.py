@@ -1,5 +1,13 @@
 """Demo package."""
 
-from .main import main
-
 __all__ = ["main"]
+
+
+def __getattr__(name):
+    # Import the application only when it is used, so importing a submodule
+    # (e.g. a service) does not load the LLM client and every other service
+    if name == "main":
+        from .main import main
+        globals()["main"] = main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,235 @@
+"""Routing-decision cache for LLM function calls."""
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT = "?？!！.。~～"
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a user query so trivially different spellings share a cache entry.
+
+    Applies NFKC (full-width -> half-width), whitespace collapsing and
+    strips trailing question/exclamation marks. Case is kept: queries may
+    carry case-sensitive identifiers such as user IDs.
+
+    Args:
+        query: Raw user input.
+
+    Returns:
+        Normalized query string.
+    """
+    text = unicodedata.normalize("NFKC", query)
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return text.rstrip(_TRAILING_PUNCT).rstrip()
+
+
+class CacheBackend(Protocol):
+    """Storage interface used by :class:`RoutingCache`."""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for ``key`` or None."""
+        ...
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store ``value`` under ``key``."""
+        ...
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        ...
+
+
+class InMemoryCacheBackend:
+    """In-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 600.0):
+        """
+        Initialize the in-memory backend.
+
+        Args:
+            max_size: Maximum number of entries before the least recently
+                used one is evicted.
+            ttl_seconds: Time-to-live of each entry in seconds.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a key, refreshing its LRU position.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Cached value, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Redis-backed cache shared between worker processes.
+
+    Entries are written with ``SET ... EX`` so Redis enforces the TTL; LRU
+    eviction is delegated to the server's ``maxmemory-policy`` (e.g.
+    ``allkeys-lru``).
+    """
+
+    def __init__(self, client: Any, ttl_seconds: float = 600.0, prefix: str = "routing_cache:"):
+        """
+        Initialize the Redis backend.
+
+        Args:
+            client: A ``redis.Redis`` client.
+            ttl_seconds: Time-to-live of each entry in seconds.
+            prefix: Key prefix used for cache entries.
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return self.prefix + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a key.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Cached value, or None if missing or expired.
+        """
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a value with the configured TTL.
+
+        Args:
+            key: Cache key.
+            value: JSON-serializable value to store.
+        """
+        self.client.set(
+            self._key(key),
+            json.dumps(value, ensure_ascii=False),
+            ex=max(1, int(self.ttl_seconds))
+        )
+
+    def clear(self) -> None:
+        """Delete every key under the configured prefix."""
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class RoutingCache:
+    """Maps normalized queries to the function-call JSON the LLM produced."""
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        """
+        Initialize the routing cache.
+
+        Args:
+            backend: Storage backend; defaults to :class:`InMemoryCacheBackend`.
+        """
+        self.backend = backend if backend is not None else InMemoryCacheBackend()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached function call for a query.
+
+        Args:
+            query: Raw user query.
+
+        Returns:
+            Cached function-call dictionary, or None on a miss.
+        """
+        value = self.backend.get(normalize_query(query))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, query: str, function_call: Dict[str, Any]) -> None:
+        """
+        Cache the function call produced for a query.
+
+        Args:
+            query: Raw user query.
+            function_call: Function-call dictionary to cache.
+        """
+        self.backend.set(normalize_query(query), function_call)
+
+    def clear(self) -> None:
+        """Drop every cached entry and reset the counters."""
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters.
+
+        Returns:
+            Dictionary with hits, misses and hit_rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
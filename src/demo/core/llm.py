@@ -0,0 +1,275 @@
+"""Ollama LLM with pooled, retrying HTTP calls."""
+import asyncio
+import random
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+import httpx
+from langchain_community.llms import Ollama
+from langchain_community.llms.ollama import OllamaEndpointNotFoundError
+from pydantic import PrivateAttr
+
+from .settings import OllamaSettings
+
+# Statuses worth another attempt: the server (or a proxy in front of it) is overloaded or restarting
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Failures before the server produced a response; the request never reached the model
+_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.RemoteProtocolError)
+
+
+class PooledOllama(Ollama):
+    """
+    Ollama LLM that keeps its HTTP connections open and retries failed connects.
+
+    The stock client opens a new connection for every call. This one sends
+    all calls through one pooled ``httpx`` client (one per event loop for
+    async calls), applies separate connect and read timeouts, and retries
+    with exponential backoff when the request fails before the server
+    answered or the server answers 429/502/503/504. Once tokens are
+    streaming nothing is retried, so a caller never sees output twice.
+    """
+
+    timeout: Optional[float] = None
+    """Seconds to wait for a read or write; fractional values are fine for ``httpx``."""
+
+    connect_timeout: float = 5.0
+    """Seconds to wait for a connection; ``timeout`` bounds every read and write."""
+
+    max_retries: int = 2
+    """Additional attempts after a failed connect or a retryable status."""
+
+    backoff_base: float = 0.25
+    """Delay before the first retry in seconds; doubles with every retry."""
+
+    backoff_max: float = 4.0
+    """Upper bound of a single retry delay in seconds."""
+
+    max_connections: int = 16
+    """Connections the pool may hold open to the server."""
+
+    _client: Optional[httpx.Client] = PrivateAttr(default=None)
+    _async_clients: Any = PrivateAttr(default_factory=weakref.WeakKeyDictionary)
+    _client_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def from_settings(cls, settings: OllamaSettings, **kwargs: Any) -> "PooledOllama":
+        """
+        Create a client from :class:`OllamaSettings`.
+
+        Args:
+            settings: Endpoint, model and connection settings.
+            **kwargs: Further ``Ollama`` fields, e.g. ``callbacks``.
+
+        Returns:
+            PooledOllama.
+        """
+        return cls(
+            base_url=settings.base_url,
+            model=settings.model,
+            temperature=settings.temperature,
+            keep_alive=settings.keep_alive,
+            connect_timeout=settings.connect_timeout,
+            timeout=settings.timeout,
+            max_retries=settings.max_retries,
+            backoff_base=settings.backoff_base,
+            backoff_max=settings.backoff_max,
+            max_connections=settings.max_connections,
+            **kwargs
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        """Return type of llm."""
+        return "ollama-llm-pooled"
+
+    def _client_options(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "headers": {"Content-Type": "application/json", **(self.headers or {})},
+            "auth": self.auth,
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            "limits": httpx.Limits(max_connections=self.max_connections,
+                                   max_keepalive_connections=self.max_connections),
+        }
+
+    def _sync_client(self) -> httpx.Client:
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(**self._client_options())
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        # Connections belong to the loop that opened them, so each loop gets its own pool
+        loop = asyncio.get_running_loop()
+        with self._client_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = httpx.AsyncClient(**self._client_options())
+            return client
+
+    def close(self) -> None:
+        """Close the pooled connections of synchronous calls."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of asynchronous calls on the running loop."""
+        with self._client_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based)."""
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        delay = min(self.backoff_base * 2 ** attempt, self.backoff_max)
+        # Jitter spreads out clients that failed together
+        return delay * random.uniform(0.5, 1.0)
+
+    def _request_payload(self, payload: Any, stop: Optional[List[str]], **kwargs: Any) -> Dict[str, Any]:
+        """Merge the prompt with the default and per-call parameters, like ``Ollama._create_stream``."""
+        if self.stop is not None and stop is not None:
+            raise ValueError("`stop` found in both the input and default params.")
+        elif self.stop is not None:
+            stop = self.stop
+
+        params = self._default_params
+        for key in self._default_params:
+            if key in kwargs:
+                params[key] = kwargs[key]
+        if "options" in kwargs:
+            params["options"] = kwargs["options"]
+        else:
+            params["options"] = {
+                **params["options"],
+                "stop": stop,
+                **{k: v for k, v in kwargs.items() if k not in self._default_params},
+            }
+
+        if payload.get("messages"):
+            return {"messages": payload.get("messages", []), **params}
+        return {"prompt": payload.get("prompt"), "images": payload.get("images", []), **params}
+
+    def _raise_for_status(self, status: int, detail: str) -> None:
+        if status == 404:
+            raise OllamaEndpointNotFoundError(
+                "Ollama call failed with status code 404. "
+                "Maybe your model is not found "
+                f"and you should pull the model with `ollama pull {self.model}`."
+            )
+        raise ValueError(f"Ollama call failed with status code {status}. Details: {detail}")
+
+    def _send(self, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """
+        Send a request, retrying failed connects and retryable statuses.
+
+        Args:
+            send: Sends the request and returns the (streaming) response.
+
+        Returns:
+            Response with status 200 whose body has not been read yet.
+
+        Raises:
+            OllamaEndpointNotFoundError: If the model or endpoint does not exist.
+            ValueError: If the call fails with another status or every
+                attempt fails to connect.
+        """
+        for attempt in range(self.max_retries + 1):
+            last = attempt == self.max_retries
+            try:
+                response = send()
+            except _RETRY_ERRORS as e:
+                if last:
+                    raise ValueError(f"Ollama call failed after {attempt + 1} attempts: {e!r}") from e
+                time.sleep(self._backoff(attempt))
+                continue
+            if response.status_code == 200:
+                return response
+            detail = response.read().decode("utf-8", "replace")
+            response.close()
+            if last or response.status_code not in _RETRY_STATUSES:
+                self._raise_for_status(response.status_code, detail)
+            time.sleep(self._backoff(attempt, response))
+        raise AssertionError("unreachable")
+
+    async def _asend(self, send: Callable[[], Any]) -> httpx.Response:
+        """Asynchronous version of :meth:`_send`; ``send`` returns an awaitable."""
+        for attempt in range(self.max_retries + 1):
+            last = attempt == self.max_retries
+            try:
+                response = await send()
+            except _RETRY_ERRORS as e:
+                if last:
+                    raise ValueError(f"Ollama call failed after {attempt + 1} attempts: {e!r}") from e
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            if response.status_code == 200:
+                return response
+            detail = (await response.aread()).decode("utf-8", "replace")
+            await response.aclose()
+            if last or response.status_code not in _RETRY_STATUSES:
+                self._raise_for_status(response.status_code, detail)
+            await asyncio.sleep(self._backoff(attempt, response))
+        raise AssertionError("unreachable")
+
+    def _create_stream(
+        self,
+        api_url: str,
+        payload: Any,
+        stop: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        client = self._sync_client()
+        request = client.build_request("POST", api_url, json=self._request_payload(payload, stop, **kwargs))
+        response = self._send(lambda: client.send(request, stream=True))
+        # Closing the iterator early closes the response, which drops the
+        # connection and makes Ollama stop generating
+        try:
+            yield from response.iter_lines()
+        finally:
+            response.close()
+
+    async def _acreate_stream(
+        self,
+        api_url: str,
+        payload: Any,
+        stop: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        client = self._async_client()
+        request = client.build_request("POST", api_url, json=self._request_payload(payload, stop, **kwargs))
+        response = await self._asend(lambda: client.send(request, stream=True))
+        try:
+            async for line in response.aiter_lines():
+                yield line
+        finally:
+            await response.aclose()
+
+    def warm_up(self) -> float:
+        """
+        Load the model into memory without generating anything.
+
+        An empty prompt makes Ollama load the model and return at once; the
+        ``keep_alive`` sent along keeps it resident, so the first real query
+        does not pay for loading the weights.
+
+        Returns:
+            Seconds the warm-up request took.
+
+        Raises:
+            OllamaEndpointNotFoundError: If the model does not exist on the server.
+            ValueError: If the server cannot be reached or the call fails.
+        """
+        client = self._sync_client()
+        body = {"model": self.model, "prompt": "", "stream": False, "keep_alive": self.keep_alive}
+        request = client.build_request("POST", "/api/generate", json=body)
+        start = time.perf_counter()
+        self._send(lambda: client.send(request)).close()
+        return time.perf_counter() - start
@@ -0,0 +1,279 @@
+"""Low-overhead latency histograms and counters for the query pipeline."""
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Each power-of-two range is split into 2**SUB_BUCKET_BITS linear buckets,
+# i.e. about 6% relative precision, like an HDR histogram with ~1.2
+# significant digits.
+SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# Largest tracked value: 2**40 ns (~18 minutes); larger values are clamped
+_MAX_VALUE_BITS = 40
+_BUCKET_COUNT = (_MAX_VALUE_BITS - SUB_BUCKET_BITS) * _SUB_BUCKETS + _SUB_BUCKETS
+
+# Bucket boundaries (seconds) exported in the OpenMetrics dump
+EXPORT_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape_label(value: str) -> str:
+    # Label values are double-quoted; backslash, quote and newline must be escaped
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _bucket_index(value: int) -> int:
+    if value < 2 * _SUB_BUCKETS:
+        return max(value, 0)
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return min(shift * _SUB_BUCKETS + (value >> shift), _BUCKET_COUNT - 1)
+
+
+def _bucket_upper_bound(index: int) -> int:
+    if index < 2 * _SUB_BUCKETS:
+        return index
+    shift = index // _SUB_BUCKETS - 1
+    mantissa = index - shift * _SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory log-linear histogram of durations in nanoseconds.
+
+    Recording is a bit-length computation and one array increment; memory
+    is a single preallocated ``array('q')`` regardless of sample count.
+    """
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self._counts = array("q", [0]) * _BUCKET_COUNT
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def record(self, value_ns: int) -> None:
+        """
+        Record one duration.
+
+        Args:
+            value_ns: Duration in nanoseconds.
+        """
+        index = _bucket_index(value_ns)
+        with self._lock:
+            self._counts[index] += 1
+            if self.count == 0 or value_ns < self.min_ns:
+                self.min_ns = value_ns
+            if value_ns > self.max_ns:
+                self.max_ns = value_ns
+            self.count += 1
+            self.total_ns += value_ns
+
+    def percentiles(self, quantiles: Sequence[float]) -> List[int]:
+        """
+        Estimate percentiles from the buckets.
+
+        Args:
+            quantiles: Quantiles in [0, 1], e.g. ``(0.5, 0.99)``.
+
+        Returns:
+            Upper bound (ns) of the bucket holding each quantile, capped at
+            the observed maximum.
+        """
+        with self._lock:
+            counts = self._counts.tolist()
+            total = self.count
+            maximum = self.max_ns
+        if total == 0:
+            return [0 for _ in quantiles]
+        targets = sorted((max(1, int(round(q * total))), position) for position, q in enumerate(quantiles))
+        results = [0] * len(quantiles)
+        seen = 0
+        target = 0
+        for index, bucket in enumerate(counts):
+            seen += bucket
+            while target < len(targets) and seen >= targets[target][0]:
+                results[targets[target][1]] = min(_bucket_upper_bound(index), maximum)
+                target += 1
+            if target == len(targets):
+                break
+        return results
+
+    def cumulative_counts(self, bounds_ns: Sequence[int]) -> List[int]:
+        """
+        Count samples whose bucket lies entirely at or below each bound.
+
+        Args:
+            bounds_ns: Increasing upper bounds in nanoseconds.
+
+        Returns:
+            Cumulative count per bound.
+        """
+        with self._lock:
+            counts = self._counts.tolist()
+        results = []
+        seen = 0
+        index = 0
+        for bound in bounds_ns:
+            while index < _BUCKET_COUNT and _bucket_upper_bound(index) <= bound:
+                seen += counts[index]
+                index += 1
+            results.append(seen)
+        return results
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Summarize the histogram in milliseconds.
+
+        Returns:
+            Dictionary with count, mean, min, max, p50, p90, p95 and p99.
+        """
+        p50, p90, p95, p99 = self.percentiles((0.5, 0.9, 0.95, 0.99))
+        count = self.count
+        return {
+            "count": count,
+            "mean_ms": self.total_ns / count / 1e6 if count else 0.0,
+            "min_ms": self.min_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+            "p50_ms": p50 / 1e6,
+            "p90_ms": p90 / 1e6,
+            "p95_ms": p95 / 1e6,
+            "p99_ms": p99 / 1e6
+        }
+
+
+class _StageTimer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self._histogram = histogram
+        self._start = 0
+
+    def __enter__(self) -> "_StageTimer":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._histogram.record(time.perf_counter_ns() - self._start)
+
+
+class PipelineMetrics:
+    """Per-stage latency histograms and per-tool call counters."""
+
+    def __init__(self, namespace: str = "demo"):
+        """
+        Initialize the metrics registry.
+
+        Args:
+            namespace: Prefix of the exported metric names.
+        """
+        self.namespace = namespace
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._tool_calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        """
+        Return the histogram of a stage, creating it on first use.
+
+        Args:
+            stage: Stage name.
+
+        Returns:
+            LatencyHistogram of the stage.
+        """
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def time(self, stage: str) -> _StageTimer:
+        """
+        Time a block with a monotonic clock.
+
+        Example:
+            >>> metrics = PipelineMetrics()
+            >>> with metrics.time("llm_invoke"):
+            ...     pass
+            >>> metrics.histogram("llm_invoke").count
+            1
+
+        Args:
+            stage: Stage name.
+
+        Returns:
+            Context manager recording the elapsed time on exit.
+        """
+        return _StageTimer(self.histogram(stage))
+
+    def count_tool_call(self, tool: str, success: bool = True) -> None:
+        """
+        Count one tool invocation.
+
+        Args:
+            tool: Tool name.
+            success: Whether the call returned without raising.
+        """
+        with self._lock:
+            self._tool_calls[(tool, "success" if success else "error")] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of every stage and tool counter.
+
+        Returns:
+            Dictionary with per-stage latency summaries (ms) and per-tool
+            success/error counts.
+        """
+        tools: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            calls = list(self._tool_calls.items())
+            histograms = list(self._histograms.items())
+        for (tool, outcome), count in calls:
+            tools.setdefault(tool, {"success": 0, "error": 0})[outcome] = count
+        return {
+            "stages": {stage: histogram.snapshot() for stage, histogram in histograms},
+            "tools": tools
+        }
+
+    def to_openmetrics(self, bounds: Optional[Tuple[float, ...]] = None) -> str:
+        """
+        Render the metrics in the OpenMetrics text format.
+
+        Args:
+            bounds: Histogram bucket boundaries in seconds; defaults to
+                :data:`EXPORT_BOUNDS`.
+
+        Returns:
+            OpenMetrics exposition text, terminated by ``# EOF``.
+        """
+        bounds = bounds or EXPORT_BOUNDS
+        bounds_ns = [int(bound * 1e9) for bound in bounds]
+        latency = f"{self.namespace}_stage_latency_seconds"
+        tool_calls = f"{self.namespace}_tool_calls"
+        lines = [
+            f"# TYPE {latency} histogram",
+            f"# UNIT {latency} seconds",
+            f"# HELP {latency} Latency of each query pipeline stage.",
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            calls = sorted(self._tool_calls.items())
+        for stage, histogram in histograms:
+            count = histogram.count
+            stage = _escape_label(stage)
+            for bound, cumulative in zip(bounds, histogram.cumulative_counts(bounds_ns)):
+                lines.append(f'{latency}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{latency}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{latency}_count{{stage="{stage}"}} {count}')
+            lines.append(f'{latency}_sum{{stage="{stage}"}} {histogram.total_ns / 1e9}')
+        lines.append(f"# TYPE {tool_calls} counter")
+        lines.append(f"# HELP {tool_calls} Tool invocations by outcome.")
+        for (tool, outcome), count in calls:
+            lines.append(f'{tool_calls}_total{{tool="{_escape_label(tool)}",outcome="{outcome}"}} {count}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,301 @@
+"""Function-calling prompt assembly with per-query tool selection."""
+import json
+import math
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .registry import ToolRegistry
+
+# ``{query}`` and ``{functions}`` are filled in; every other brace is literal
+PROMPT_TEMPLATE = """你是一个函数调用助手。根据用户的请求，判断是否需要调用函数。
+
+用户请求: "{query}"
+
+可用的函数:
+{functions}
+
+如果需要调用函数，请直接返回一个JSON对象，格式如下：
+{
+    "function": "函数名称",
+    "parameters": {
+        "参数1": "值1",
+        ...
+    }
+}
+
+注意：
+1. 只输出JSON对象，不要有任何其他解释文字
+2. 如果不需要调用函数，返回空的JSON对象 {}
+3. 对于自定义套餐，从用户输入中提取：
+   - 套餐名称（必须）
+   - 时长（如果提到）
+   - 功能列表（如果提到）
+   - 价格（如果提到）
+"""
+
+# Runs of lowercase ASCII words/numbers or of CJK ideographs
+_RUN_RE = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]+")
+
+# CJK ideographs and full-width punctuation, roughly one token each
+_CJK_RE = re.compile(r"[\u3000-\u303f\u4e00-\u9fff\uff00-\uffef]")
+
+# Score of a keyword found in the query, relative to the IDF of an n-gram hit
+KEYWORD_WEIGHT = 2.0
+
+# Best score below which a query is too ambiguous to leave any tool out
+MIN_CONFIDENCE = KEYWORD_WEIGHT
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def terms(text: str) -> Set[str]:
+    """
+    Split text into index terms.
+
+    ASCII words are kept whole (``_`` separates words, so tool names split
+    into their parts); Chinese has no word boundaries, so CJK runs are
+    split into character bigrams, or kept as one term if a single character.
+
+    Args:
+        text: Query, description or parameter documentation.
+
+    Returns:
+        Set of terms.
+    """
+    result: Set[str] = set()
+    for run in _RUN_RE.findall(_normalize(text)):
+        if run.isascii():
+            if not run.isdigit():
+                result.add(run)
+        elif len(run) == 1:
+            result.add(run)
+        else:
+            result.update(run[i:i + 2] for i in range(len(run) - 1))
+    return result
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens of a text.
+
+    A rough count that needs no tokenizer: one token per CJK character and
+    per four other characters. Ollama reports the exact count of a call as
+    ``prompt_eval_count``.
+
+    Args:
+        text: Prompt text.
+
+    Returns:
+        Estimated token count.
+    """
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+@dataclass(frozen=True)
+class _ToolEntry:
+    name: str
+    rendered: str  # compact one-line JSON schema
+    tokens: int
+    terms: FrozenSet[str]
+    keywords: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _Index:
+    tools: Tuple[_ToolEntry, ...]
+    idf: Dict[str, float]
+    all_rendered: str
+    all_tokens: int
+    baseline_rendered: str  # every schema pretty-printed, as prompts were built before selection
+    baseline_tokens: int
+
+
+class PromptBuilder:
+    """
+    Builds function-calling prompts that advertise only the tools relevant to a query.
+
+    The template, the compact one-line JSON of every schema and a small
+    term index are built once, on the first prompt. Each query is then
+    scored against every tool by the IDF of the shared terms (words and
+    Chinese character bigrams of the name, description and parameter
+    docs) plus :data:`KEYWORD_WEIGHT` per ``ToolSpec.keywords`` entry it
+    contains (single characters and symbols are ignored, they match dates
+    and ordinary prose). If the best score reaches ``min_confidence`` the
+    ``max_tools`` highest-scoring tools are included, so a weak runner-up
+    still goes along with the best match; otherwise the query is too
+    ambiguous and every tool is included, so the model can still decide.
+    """
+
+    def __init__(self, registry: ToolRegistry, max_tools: Optional[int] = 3,
+                 min_confidence: float = MIN_CONFIDENCE):
+        """
+        Initialize the builder.
+
+        Args:
+            registry: Tools to choose from.
+            max_tools: Most tools to include per prompt; None includes every
+                tool (still rendered compactly).
+            min_confidence: Best score a query needs before tools are left out.
+
+        Raises:
+            ValueError: If max_tools is less than 1.
+        """
+        if max_tools is not None and max_tools < 1:
+            raise ValueError(f"max_tools must be at least 1, got {max_tools}")
+        self.registry = registry
+        self.max_tools = max_tools
+        self.min_confidence = min_confidence
+        head, _, rest = PROMPT_TEMPLATE.partition("{query}")
+        middle, _, tail = rest.partition("{functions}")
+        self._parts = (head, middle, tail)
+        self._template_tokens = estimate_tokens(head + middle + tail)
+        self._index: Optional[_Index] = None
+        self._lock = threading.Lock()
+        self.prompts = 0
+        self.tools_included = 0
+        self.prompt_tokens = 0
+        self.baseline_tokens = 0
+
+    def _build_index(self) -> _Index:
+        with self._lock:
+            if self._index is not None:
+                return self._index
+            schemas = self.registry.functions()
+            tools = []
+            document_frequency: Dict[str, int] = {}
+            for schema in schemas:
+                spec = self.registry.spec(schema["name"])
+                text = [spec.name.replace("_", " "), spec.description]
+                for name, prop in schema["parameters"]["properties"].items():
+                    text.extend((name.replace("_", " "), prop.get("description", "")))
+                keywords = {_normalize(keyword) for keyword in spec.keywords}
+                rendered = json.dumps(schema, ensure_ascii=False, separators=(",", ":"))
+                entry = _ToolEntry(
+                    name=spec.name,
+                    rendered=rendered,
+                    tokens=estimate_tokens(rendered),
+                    terms=frozenset(terms(" ".join(text))),
+                    keywords=tuple(sorted(keyword for keyword in keywords if len(keyword) > 1))
+                )
+                for term in entry.terms:
+                    document_frequency[term] = document_frequency.get(term, 0) + 1
+                tools.append(entry)
+            # Terms shared by many tools say little about which one is meant
+            idf = {term: math.log(1 + len(tools) / count) for term, count in document_frequency.items()}
+            all_rendered = "\n".join(tool.rendered for tool in tools)
+            baseline_rendered = json.dumps(schemas, indent=2, ensure_ascii=False)
+            self._index = _Index(
+                tools=tuple(tools),
+                idf=idf,
+                all_rendered=all_rendered,
+                all_tokens=estimate_tokens(all_rendered),
+                baseline_rendered=baseline_rendered,
+                baseline_tokens=estimate_tokens(baseline_rendered)
+            )
+            return self._index
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """
+        Score every tool against a query.
+
+        Args:
+            query: User input query.
+
+        Returns:
+            Relevance score per tool name, in declaration order; 0 means no match.
+        """
+        index = self._index or self._build_index()
+        query_terms = terms(query)
+        normalized = _normalize(query)
+        return {
+            tool.name: sum(index.idf[term] for term in query_terms & tool.terms)
+            + KEYWORD_WEIGHT * sum(keyword in normalized for keyword in tool.keywords)
+            for tool in index.tools
+        }
+
+    def select(self, query: str) -> List[str]:
+        """
+        Choose the tools to advertise for a query.
+
+        Args:
+            query: User input query.
+
+        Returns:
+            Tool names, best match first (ties in declaration order); every
+            tool if no score reaches ``min_confidence``.
+        """
+        index = self._index or self._build_index()
+        scores = self.scores(query)
+        ranked = sorted(scores, key=lambda name: -scores[name])
+        if scores[ranked[0]] < self.min_confidence:
+            return [tool.name for tool in index.tools]
+        return ranked[:self.max_tools] if self.max_tools is not None else ranked
+
+    def build(self, query: str) -> str:
+        """
+        Build the function-calling prompt for a query.
+
+        Args:
+            query: User input query.
+
+        Returns:
+            Prompt text sent to the LLM.
+        """
+        index = self._index or self._build_index()
+        selected = set(self.select(query))
+        if len(selected) == len(index.tools):
+            functions, tokens = index.all_rendered, index.all_tokens
+        else:
+            chosen = [tool for tool in index.tools if tool.name in selected]
+            functions = "\n".join(tool.rendered for tool in chosen)
+            tokens = sum(tool.tokens for tool in chosen)
+        head, middle, tail = self._parts
+        query_tokens = self._template_tokens + estimate_tokens(query)
+        with self._lock:
+            self.prompts += 1
+            self.tools_included += len(selected)
+            self.prompt_tokens += query_tokens + tokens
+            self.baseline_tokens += query_tokens + index.baseline_tokens
+        return "".join((head, query, middle, functions, tail))
+
+    def baseline(self, query: str) -> str:
+        """
+        Build the prompt with every schema pretty-printed, as before tool selection.
+
+        Args:
+            query: User input query.
+
+        Returns:
+            Prompt text; the reference the token savings are measured against.
+        """
+        index = self._index or self._build_index()
+        head, middle, tail = self._parts
+        return "".join((head, query, middle, index.baseline_rendered, tail))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report how much prompt text tool selection saved.
+
+        Returns:
+            Dict[str, Any]: prompts built, average tools per prompt, estimated
+            prompt_tokens sent, baseline_tokens the full pretty-printed
+            prompts would have taken, tokens_saved and saved_ratio
+        """
+        with self._lock:
+            prompts, tools_included = self.prompts, self.tools_included
+            prompt_tokens, baseline_tokens = self.prompt_tokens, self.baseline_tokens
+        saved = baseline_tokens - prompt_tokens
+        return {
+            "prompts": prompts,
+            "avg_tools": tools_included / prompts if prompts else 0.0,
+            "prompt_tokens": prompt_tokens,
+            "baseline_tokens": baseline_tokens,
+            "tokens_saved": saved,
+            "saved_ratio": saved / baseline_tokens if baseline_tokens else 0.0
+        }
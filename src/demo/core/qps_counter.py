@@ -0,0 +1,107 @@
+"""In-process ring buffer of per-second request counters."""
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Callable, Optional
+
+import numpy as np
+
+from ..models.qps import QPSResponse
+from ..utils.helpers import aggregate_windows
+
+
+class RingBufferQPSCounter:
+    """
+    Counts requests per second in two fixed, preallocated arrays.
+
+    Slot ``second % capacity`` holds the count of ``second`` and the second
+    it belongs to; a slot left over from an older second is reset when it is
+    reused. Recording a request updates two array cells under an
+    uncontended lock and allocates no containers, so it is safe to call from
+    any thread on the hot path. Reads copy both arrays once and aggregate
+    them with NumPy.
+    """
+
+    def __init__(self, capacity_seconds: int = 3600, clock: Callable[[], float] = time.time):
+        """
+        Initialize the counter.
+
+        Args:
+            capacity_seconds: How many seconds of history are kept.
+            clock: Time source returning Unix time in seconds.
+
+        Raises:
+            ValueError: If capacity_seconds is not positive.
+        """
+        if capacity_seconds <= 0:
+            raise ValueError(f"capacity_seconds must be positive, got {capacity_seconds}")
+        self.capacity_seconds = capacity_seconds
+        self._clock = clock
+        self._counts = array("q", [0]) * capacity_seconds
+        self._seconds = array("q", [-1]) * capacity_seconds
+        self._lock = threading.Lock()
+
+    def record(self, count: int = 1, timestamp: Optional[float] = None) -> None:
+        """
+        Record requests.
+
+        Args:
+            count: Number of requests to record.
+            timestamp: Unix time of the requests; defaults to now.
+        """
+        second = int(self._clock() if timestamp is None else timestamp)
+        slot = second % self.capacity_seconds
+        with self._lock:
+            current = self._seconds[slot]
+            if current == second:
+                self._counts[slot] += count
+            elif current < second:
+                self._seconds[slot] = second
+                self._counts[slot] = count
+            # else: older than the retained history, drop it
+
+    def per_second_counts(self, start_ts: int, end_ts: int) -> np.ndarray:
+        """
+        Return the request count of every second in ``[start_ts, end_ts)``.
+
+        Args:
+            start_ts: First second (inclusive).
+            end_ts: Last second (exclusive).
+
+        Returns:
+            One count per second, zero where nothing was recorded or the
+            second is older than the retained history.
+        """
+        with self._lock:
+            counts = np.frombuffer(self._counts, dtype=np.int64).copy()
+            stamps = np.frombuffer(self._seconds, dtype=np.int64).copy()
+        seconds = np.arange(start_ts, max(start_ts, end_ts), dtype=np.int64)
+        slots = seconds % self.capacity_seconds
+        return np.where(stamps[slots] == seconds, counts[slots], 0)
+
+    def calculate_qps(self, time_window_minutes: int = 5, data_points: int = 10) -> QPSResponse:
+        """
+        Compute QPS over the last ``time_window_minutes`` in ``data_points`` windows.
+
+        Args:
+            time_window_minutes: Time window in minutes.
+            data_points: Number of data points to return.
+
+        Returns:
+            QPSResponse with one point per window, timestamped at the window start.
+        """
+        end_ts = int(self._clock())
+        start_ts = end_ts - time_window_minutes * 60
+        window_size = (end_ts - start_ts) / data_points
+        counts = self.per_second_counts(start_ts, end_ts)
+        window_counts = aggregate_windows(
+            np.arange(start_ts, end_ts, dtype=np.float64), start_ts, end_ts, data_points, weights=counts
+        )
+        step = np.timedelta64(int(window_size * 1e6), "us")
+        return QPSResponse(
+            status="success",
+            message="QPS数据获取成功",
+            timestamps=np.datetime64(datetime.fromtimestamp(start_ts), "us") + np.arange(data_points) * step,
+            values=np.round(window_counts / window_size, 2)
+        )
@@ -0,0 +1,284 @@
+"""Compiled tool registry: one declaration per tool drives the prompt schema, validation and dispatch."""
+import importlib
+import inspect
+import typing
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel, ConfigDict, ValidationError, create_model
+
+_JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+
+@dataclass(frozen=True)
+class ParameterDoc:
+    """Prompt-facing documentation of one tool parameter."""
+    description: str
+    enum: Optional[Tuple[Any, ...]] = None
+    aliases: Dict[Any, Any] = field(default_factory=dict)  # accepted spellings -> canonical value
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """
+    Declaration of a tool backed by a service method.
+
+    Parameter names, types, defaults and which ones are required are read
+    from the method signature; ``parameters`` only adds descriptions, enums
+    and value aliases. ``service_class`` may be given as a
+    ``"module:Class"`` path so the service module is only imported once the
+    tool is first used. ``keywords`` are extra words that signal the tool
+    in a query, used to pick the tools worth advertising in a prompt.
+    """
+    name: str
+    description: str
+    service_class: Union[type, str]
+    service_attr: str  # attribute of the owner object holding the service instance
+    method: str
+    parameters: Dict[str, ParameterDoc] = field(default_factory=dict)
+    keywords: Tuple[str, ...] = ()
+
+
+@dataclass
+class _CompiledTool:
+    spec: ToolSpec
+    model: Type[BaseModel]
+    aliases: Dict[str, Dict[Any, Any]]
+    schema: Dict[str, Any]
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if typing.get_origin(annotation) is Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _json_schema(annotation: Any) -> Dict[str, Any]:
+    annotation = _unwrap_optional(annotation)
+    if typing.get_origin(annotation) in (list, List):
+        (item,) = typing.get_args(annotation) or (str,)
+        return {"type": "array", "items": _json_schema(item)}
+    return {"type": _JSON_TYPES.get(annotation, "string")}
+
+
+class ToolRegistry:
+    """Validates and dispatches LLM function calls in O(1) per call."""
+
+    def __init__(self, specs: Sequence[ToolSpec], package: Optional[str] = None):
+        """
+        Register the tools; each one is compiled when it is first used.
+
+        Args:
+            specs: Tool declarations.
+            package: Anchor for relative ``service_class`` import paths.
+
+        Raises:
+            ValueError: If a tool name is declared twice.
+        """
+        self.package = package
+        self._specs: Dict[str, ToolSpec] = {}
+        for spec in specs:
+            if spec.name in self._specs:
+                raise ValueError(f"Duplicate tool: {spec.name}")
+            self._specs[spec.name] = spec
+        self._tools: Dict[str, _CompiledTool] = {}
+        self._functions: Optional[List[Dict[str, Any]]] = None
+
+    def _tool(self, name: str) -> _CompiledTool:
+        """
+        Return a compiled tool, compiling it on first use.
+
+        Args:
+            name: Tool name.
+
+        Returns:
+            Compiled tool.
+
+        Raises:
+            ValueError: If the tool is unknown or documents a parameter its
+                method does not accept.
+        """
+        tool = self._tools.get(name)
+        if tool is None:
+            spec = self._specs.get(name)
+            if spec is None:
+                raise ValueError(f"Unknown function: {name}")
+            tool = self._tools[name] = self._compile(spec, self.service_class(name))
+        return tool
+
+    def service_class(self, name: str) -> type:
+        """
+        Return the service class of a tool, importing its module if needed.
+
+        Args:
+            name: Tool name.
+
+        Returns:
+            Service class.
+        """
+        service_class = self._specs[name].service_class
+        if isinstance(service_class, str):
+            module, _, attribute = service_class.partition(":")
+            service_class = getattr(importlib.import_module(module, self.package), attribute)
+        return service_class
+
+    @staticmethod
+    def _compile(spec: ToolSpec, service_class: type) -> _CompiledTool:
+        """
+        Build the validator model and the prompt schema from the method signature.
+
+        Args:
+            spec: Tool declaration.
+            service_class: Resolved service class.
+
+        Returns:
+            Compiled tool.
+
+        Raises:
+            ValueError: If the tool documents a parameter its method does not accept.
+        """
+        method = getattr(service_class, spec.method)
+        hints = typing.get_type_hints(method)
+        signature = [
+            parameter for parameter in inspect.signature(method).parameters.values()
+            if parameter.name != "self"
+        ]
+        unknown = set(spec.parameters) - {parameter.name for parameter in signature}
+        if unknown:
+            raise ValueError(f"Tool {spec.name} documents unknown parameters: {sorted(unknown)}")
+
+        # Documented parameters first, in declaration order, then the rest
+        order = {name: index for index, name in enumerate(spec.parameters)}
+        signature.sort(key=lambda parameter: order.get(parameter.name, len(order)))
+
+        fields: Dict[str, Any] = {}
+        properties: Dict[str, Any] = {}
+        required: List[str] = []
+        for parameter in signature:
+            doc = spec.parameters.get(parameter.name)
+            annotation = hints.get(parameter.name, Any)
+            prop = _json_schema(annotation)
+            if doc is not None:
+                prop["description"] = doc.description
+                if doc.enum:
+                    prop["enum"] = list(doc.enum)
+                    annotation = Literal[doc.enum]
+            if parameter.default is inspect.Parameter.empty:
+                fields[parameter.name] = (annotation, ...)
+                required.append(parameter.name)
+            else:
+                fields[parameter.name] = (Optional[annotation], parameter.default)
+                if parameter.default is not None:
+                    prop["default"] = parameter.default
+            properties[parameter.name] = prop
+
+        model = create_model(
+            f"{spec.name}_parameters",
+            __config__=ConfigDict(extra="ignore"),
+            **fields
+        )
+        schema = {
+            "name": spec.name,
+            "description": spec.description,
+            "parameters": {
+                "type": "object",
+                "properties": properties,
+                "required": required
+            }
+        }
+        aliases = {name: doc.aliases for name, doc in spec.parameters.items() if doc.aliases}
+        return _CompiledTool(spec=spec, model=model, aliases=aliases, schema=schema)
+
+    def functions(self) -> List[Dict[str, Any]]:
+        """
+        Return the function schemas advertised to the LLM.
+
+        Compiles every tool that has not been used yet.
+
+        Returns:
+            List of schemas in the ``FUNCTIONS`` format.
+        """
+        if self._functions is None:
+            self._functions = [self._tool(name).schema for name in self._specs]
+        return self._functions
+
+    def spec(self, name: str) -> ToolSpec:
+        """
+        Return the declaration of a tool.
+
+        Args:
+            name: Tool name.
+
+        Returns:
+            Tool declaration.
+
+        Raises:
+            ValueError: If the tool is unknown.
+        """
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown function: {name}")
+        return spec
+
+    def names(self) -> List[str]:
+        """
+        Return the registered tool names.
+
+        Returns:
+            Tool names in declaration order.
+        """
+        return list(self._specs)
+
+    def __contains__(self, name: object) -> bool:
+        """Whether a tool of this name is registered."""
+        return isinstance(name, str) and name in self._specs
+
+    def validate(self, name: str, parameters: Any) -> Dict[str, Any]:
+        """
+        Validate and coerce the parameters of a function call.
+
+        Args:
+            name: Tool name.
+            parameters: Raw parameters produced by the LLM.
+
+        Returns:
+            Keyword arguments for the service method.
+
+        Raises:
+            ValueError: If the tool is unknown or the parameters are invalid.
+        """
+        tool = self._tool(name)
+        if parameters is None:
+            parameters = {}
+        elif not isinstance(parameters, Mapping):
+            raise ValueError(f"Invalid parameters for {name}: expected an object, got {type(parameters).__name__}")
+        parameters = dict(parameters)
+        for key, aliases in tool.aliases.items():
+            value = parameters.get(key)
+            if isinstance(value, str) and value in aliases:
+                parameters[key] = aliases[value]
+        try:
+            return dict(tool.model.model_validate(parameters))
+        except ValidationError as e:
+            raise ValueError(f"Invalid parameters for {name}: {e}") from e
+
+    def dispatch(self, owner: Any, function_call: Dict[str, Any]) -> Any:
+        """
+        Execute a function call against the services held by ``owner``.
+
+        Args:
+            owner: Object exposing the service instances as attributes.
+            function_call: Dictionary containing function name and parameters.
+
+        Returns:
+            Service result.
+
+        Raises:
+            ValueError: If the tool is unknown or the parameters are invalid.
+        """
+        name = function_call["function"]
+        arguments = self.validate(name, function_call.get("parameters"))
+        spec = self._specs[name]
+        return getattr(getattr(owner, spec.service_attr), spec.method)(**arguments)
@@ -0,0 +1,256 @@
+"""Redis-backed request log with per-second counter buckets."""
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import redis
+
+from ..utils.helpers import aggregate_windows
+
+logger = logging.getLogger(__name__)
+
+# Sums the per-second counters of each window on the server, so only
+# ``data_points`` numbers cross the network. Only seconds from ARGV[5] on
+# are read (older counters have expired), with one MGET per 1000 keys. It
+# reads keys that are not declared in KEYS, which is fine on a single node
+# but not on Redis Cluster.
+_WINDOW_SUM_SCRIPT = """
+local prefix = ARGV[1]
+local start_ts = tonumber(ARGV[2])
+local end_ts = tonumber(ARGV[3])
+local points = tonumber(ARGV[4])
+local read_from = tonumber(ARGV[5])
+local size = (end_ts - start_ts) / points
+local sums = {}
+for i = 1, points do sums[i] = 0 end
+for first = read_from, end_ts - 1, 1000 do
+    local keys = {}
+    for second = first, math.min(first + 1000, end_ts) - 1 do
+        keys[#keys + 1] = prefix .. ':' .. second
+    end
+    local values = redis.call('MGET', unpack(keys))
+    for i = 1, #keys do
+        if values[i] then
+            local index = math.min(math.floor((first + i - 1 - start_ts) / size) + 1, points)
+            sums[index] = sums[index] + tonumber(values[i])
+        end
+    end
+end
+return sums
+"""
+
+_pools: Dict[Tuple[str, int, int], redis.ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_redis_client(host: str = "localhost", port: int = 6379, db: int = 0) -> redis.Redis:
+    """
+    Return a Redis client backed by a process-wide connection pool.
+
+    Clients are cheap; the pool is shared per (host, port, db), so repeated
+    calls reuse open connections instead of reconnecting.
+
+    Args:
+        host: Redis host.
+        port: Redis port.
+        db: Redis database index.
+
+    Returns:
+        Redis client.
+    """
+    key = (host, port, db)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = redis.ConnectionPool(host=host, port=port, db=db)
+    return redis.Redis(connection_pool=pool)
+
+
+class RedisRequestRecorder:
+    """
+    Records requests as per-second counters in Redis.
+
+    Every second that saw traffic has one key, ``{key_prefix}:{second}``,
+    holding its request count and expiring after ``retention_seconds``. A
+    write is a single pipelined INCRBY + EXPIRE per touched second, so
+    concurrent requests within the same second are all counted.
+
+    With ``flush_interval_ms`` set, :meth:`record` only bumps an in-process
+    counter and a background thread writes the accumulated counts every
+    interval, keeping Redis off the request path entirely.
+    """
+
+    def __init__(
+            self,
+            client: Optional[redis.Redis] = None,
+            key_prefix: str = "request_log",
+            retention_seconds: int = 600,
+            flush_interval_ms: Optional[int] = None,
+            server_side_threshold: Optional[int] = None
+        ):
+        """
+        Initialize the recorder.
+
+        Args:
+            client: Redis client; defaults to the shared local pool.
+            key_prefix: Prefix of the per-second counter keys.
+            retention_seconds: How long each counter is kept.
+            flush_interval_ms: Enables client-side batching with this flush
+                interval. None writes every request immediately.
+            server_side_threshold: Windows reading more retained seconds
+                than this are aggregated inside Redis instead of fetching
+                every counter. Defaults to half of ``retention_seconds``,
+                since no window reads more than the retention period.
+        """
+        self.client = client if client is not None else get_redis_client()
+        self.key_prefix = key_prefix
+        self.retention_seconds = retention_seconds
+        self.flush_interval_ms = flush_interval_ms
+        self.server_side_threshold = (
+            server_side_threshold if server_side_threshold is not None else retention_seconds // 2
+        )
+        self._window_sum = self.client.register_script(_WINDOW_SUM_SCRIPT)
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval_ms is not None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="request-log-flusher", daemon=True)
+            self._flusher.start()
+
+    def key(self, second: int) -> str:
+        """
+        Return the counter key of a second.
+
+        Args:
+            second: Unix timestamp in whole seconds.
+
+        Returns:
+            Redis key.
+        """
+        return f"{self.key_prefix}:{second}"
+
+    def record(self, count: int = 1, timestamp: Optional[float] = None) -> None:
+        """
+        Record requests.
+
+        Args:
+            count: Number of requests to record.
+            timestamp: Unix time of the requests; defaults to now.
+        """
+        second = int(time.time() if timestamp is None else timestamp)
+        if self.flush_interval_ms is None:
+            self._write({second: count})
+            return
+        with self._lock:
+            self._pending[second] += count
+
+    def flush(self) -> None:
+        """Write any batched counts to Redis."""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, Counter()
+        self._write(pending)
+
+    def close(self) -> None:
+        """Stop the background flusher and write remaining counts."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        interval = self.flush_interval_ms / 1000
+        while not self._stop.wait(interval):
+            try:
+                self.flush()
+            except Exception:
+                # Keep the thread alive; counts of this batch are dropped
+                logger.exception("Flushing request counts to Redis failed")
+
+    def _write(self, counts: Dict[int, int]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for second, count in counts.items():
+            key = self.key(second)
+            pipe.incrby(key, count)
+            pipe.expire(key, self.retention_seconds)
+        pipe.execute()
+
+    def per_second_counts(self, start_ts: int, end_ts: int) -> List[int]:
+        """
+        Fetch the request count of every second in ``[start_ts, end_ts)``.
+
+        Args:
+            start_ts: First second (inclusive).
+            end_ts: Last second (exclusive).
+
+        Returns:
+            One count per second, zero where nothing was recorded.
+        """
+        if end_ts <= start_ts:
+            return []
+        values = self.client.mget([self.key(second) for second in range(start_ts, end_ts)])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def window_counts(
+            self,
+            start_ts: int,
+            end_ts: int,
+            data_points: int,
+            strategy: str = "auto"
+        ) -> np.ndarray:
+        """
+        Count the requests in each of ``data_points`` equal windows of ``[start_ts, end_ts)``.
+
+        Only the last ``retention_seconds`` before ``end_ts`` are read; older
+        counters have expired and count as zero.
+
+        Args:
+            start_ts: First second (inclusive).
+            end_ts: Last second (exclusive).
+            data_points: Number of windows.
+            strategy: ``"client"`` fetches the per-second counters and bins
+                them with NumPy, ``"server"`` sums them in a Lua script,
+                ``"auto"`` picks by the number of seconds to read.
+
+        Returns:
+            Request count per window.
+
+        Raises:
+            ValueError: If the strategy is unknown.
+        """
+        read_from = max(start_ts, end_ts - self.retention_seconds)
+        if strategy == "auto":
+            strategy = "server" if end_ts - read_from > self.server_side_threshold else "client"
+        if strategy == "server":
+            if end_ts <= read_from:
+                return np.zeros(data_points, dtype=np.float64)
+            sums = self._window_sum(args=[self.key_prefix, start_ts, end_ts, data_points, read_from])
+            return np.asarray(sums, dtype=np.float64)
+        if strategy == "client":
+            counts = np.asarray(self.per_second_counts(read_from, end_ts), dtype=np.float64)
+            seconds = np.arange(read_from, read_from + len(counts), dtype=np.float64)
+            return aggregate_windows(seconds, start_ts, end_ts, data_points, weights=counts)
+        raise ValueError(f"Unknown aggregation strategy: {strategy}")
+
+
+_default_recorder: Optional[RedisRequestRecorder] = None
+_default_recorder_lock = threading.Lock()
+
+
+def get_default_recorder() -> RedisRequestRecorder:
+    """
+    Return the process-wide recorder on the local Redis.
+
+    Returns:
+        Shared RedisRequestRecorder.
+    """
+    global _default_recorder
+    with _default_recorder_lock:
+        if _default_recorder is None:
+            _default_recorder = RedisRequestRecorder()
+    return _default_recorder
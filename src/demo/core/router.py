@@ -0,0 +1,197 @@
+"""Deterministic fast-path router that maps fixed-shape queries to function calls."""
+import re
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from .cache import normalize_query
+
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+
+# Chinese and symbolic operator spellings -> CalculatorService operations
+_OPERATORS = {
+    "加": "+", "加上": "+", "+": "+",
+    "减": "-", "减去": "-", "-": "-",
+    "乘": "*", "乘以": "*", "*": "*", "×": "*", "x": "*",
+    "除": "/", "除以": "/", "/": "/", "÷": "/",
+}
+
+# Cities the router is confident about, mapped to the names the LLM is asked for
+_CITIES = {
+    "北京": "Beijing",
+    "上海": "Shanghai",
+    "广州": "Guangzhou",
+    "深圳": "Shenzhen",
+    "杭州": "Hangzhou",
+    "南京": "Nanjing",
+    "成都": "Chengdu",
+    "武汉": "Wuhan",
+    "西安": "Xi'an",
+    "天津": "Tianjin",
+    "重庆": "Chongqing",
+}
+
+# Characters of a multi-step arithmetic expression, and an operator following an operand
+_EXPRESSION_RE = r"[-+*/×÷^%().\d\s]+?"
+_INFIX_RE = re.compile(r"\d[\s)]*[-+*/×÷^%]")
+
+# Dates such as 2023-01-01, 2024/1/2 or 10/2/2024 look like subtraction or division
+_DATE_RE = re.compile(r"\d{4}\s*([-/.])\s*\d{1,2}\s*\1\s*\d{1,2}|\d{1,2}\s*([-/.])\s*\d{1,2}\s*\2\s*\d{4}")
+
+Rule = Tuple[Pattern[str], Callable[["re.Match[str]"], Optional[Dict[str, Any]]]]
+
+
+def _number(text: str) -> float:
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def _calculator(match: "re.Match[str]") -> Optional[Dict[str, Any]]:
+    return {
+        "function": "calculator",
+        "parameters": {
+            "x": _number(match.group(1)),
+            "y": _number(match.group(3)),
+            "operation": _OPERATORS[match.group(2).lower()]
+        }
+    }
+
+
+def _expression(match: "re.Match[str]") -> Optional[Dict[str, Any]]:
+    expression = match.group("expression").strip()
+    if not _INFIX_RE.search(expression) or _DATE_RE.search(expression):
+        return None
+    # Imported here so loading the router does not load the services
+    from ..services.calculator_service import compile_expression
+    try:
+        # The same validation the calculator applies, so anything it would
+        # reject (unbalanced parentheses, 01, a trailing %) goes to the LLM
+        compile_expression(expression)
+    except ValueError:
+        return None
+    return {"function": "evaluate_expression", "parameters": {"expression": expression}}
+
+
+def _orders(match: "re.Match[str]") -> Optional[Dict[str, Any]]:
+    parameters: Dict[str, Any] = {"user_id": match.group("user_id")}
+    if match.group("months"):
+        parameters["months"] = int(match.group("months"))
+    return {"function": "get_recent_orders", "parameters": parameters}
+
+
+def _qps(match: "re.Match[str]") -> Optional[Dict[str, Any]]:
+    return {
+        "function": "calculate_qps",
+        "parameters": {"time_window_minutes": int(match.group(1))}
+    }
+
+
+def _weather(match: "re.Match[str]") -> Optional[Dict[str, Any]]:
+    location = _CITIES.get(match.group("city"))
+    if location is None:
+        return None
+    parameters: Dict[str, Any] = {"location": location}
+    if match.group("unit"):
+        parameters["unit"] = "fahrenheit" if match.group("unit") in ("华氏", "华氏度") else "celsius"
+    return {"function": "get_current_weather", "parameters": parameters}
+
+
+_OPERATOR_PATTERN = "|".join(
+    re.escape(op) for op in sorted(_OPERATORS, key=len, reverse=True)
+)
+
+_RULES: List[Rule] = [
+    (
+        re.compile(
+            rf"^(?:请)?(?:帮我)?(?:计算|算一下|算)?\s*{_NUMBER}\s*({_OPERATOR_PATTERN})\s*{_NUMBER}"
+            r"\s*(?:等于多少|是多少|等于几|=)?$",
+            re.IGNORECASE
+        ),
+        _calculator
+    ),
+    (
+        re.compile(
+            rf"^(?:请)?(?:帮我)?(?:计算|算一下|算)?\s*(?P<expression>{_EXPRESSION_RE})"
+            r"\s*(?:等于多少|是多少|等于几|=)?$"
+        ),
+        _expression
+    ),
+    (
+        re.compile(
+            r"^(?:请)?(?:帮我)?(?:查询|查看|查一下|查)?\s*用户\s*(?P<user_id>[A-Za-z0-9_-]+)\s*"
+            r"(?:最近\s*(?P<months>\d+)\s*个?月)?\s*的?\s*(?:所有|全部)?订单(?:信息|记录)?$",
+            re.IGNORECASE
+        ),
+        _orders
+    ),
+    (
+        re.compile(
+            r"^(?:请)?(?:帮我)?(?:计算|查询|查看|统计)?\s*(?:最近|过去)\s*(\d+)\s*分钟(?:内)?\s*的?\s*qps(?:数据)?$",
+            re.IGNORECASE
+        ),
+        _qps
+    ),
+    (
+        re.compile(
+            r"^(?:请问)?(?P<city>[一-鿿]{2,4}?)(?:市)?(?:今天)?的?天气(?:怎么样|如何|好吗|情况)?"
+            r"(?:,?用(?P<unit>摄氏度?|华氏度?)(?:表示)?)?$"
+        ),
+        _weather
+    ),
+]
+
+
+class FastPathRouter:
+    """Routes unambiguous queries to a function call without calling the LLM."""
+
+    def __init__(self, rules: Optional[List[Rule]] = None):
+        """
+        Initialize the router.
+
+        Args:
+            rules: (pattern, builder) pairs tried in order. A builder may
+                return None to reject a match it is not confident about.
+        """
+        self.rules = rules if rules is not None else _RULES
+        self.matched = 0
+        self.fallback = 0
+        self.matched_by_function: Dict[str, int] = {}
+
+    def route(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Try to map a query to a function call.
+
+        Args:
+            query: Raw user query.
+
+        Returns:
+            Function-call dictionary, or None when no rule matches confidently.
+        """
+        # Same normalization as the routing cache key, so both see the same text
+        text = normalize_query(query)
+        for pattern, build in self.rules:
+            match = pattern.match(text)
+            if match is None:
+                continue
+            function_call = build(match)
+            if function_call is not None:
+                self.matched += 1
+                name = function_call["function"]
+                self.matched_by_function[name] = self.matched_by_function.get(name, 0) + 1
+                return function_call
+        self.fallback += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return how much traffic the router answered without the LLM.
+
+        Returns:
+            Dictionary with matched/fallback counts, per-function matches
+            and the bypass ratio.
+        """
+        total = self.matched + self.fallback
+        return {
+            "matched": self.matched,
+            "fallback": self.fallback,
+            "matched_by_function": dict(self.matched_by_function),
+            "bypass_ratio": self.matched / total if total else 0.0
+        }
@@ -0,0 +1,99 @@
+"""Ollama endpoint, model and connection settings read from the environment."""
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Union
+
+
+def _parse_bool(value: str) -> bool:
+    normalized = value.strip().lower()
+    if normalized in ("1", "true", "yes", "on"):
+        return True
+    if normalized in ("0", "false", "no", "off", ""):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _parse_keep_alive(value: str) -> Union[int, str]:
+    # Ollama takes a number of seconds or a Go duration such as "30m"
+    value = value.strip()
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _parse_base_url(value: str) -> str:
+    # OLLAMA_HOST is commonly set as "host:port"
+    value = value.strip().rstrip("/")
+    return value if "://" in value else f"http://{value}"
+
+
+# OllamaSettings field -> (environment variables, first one set wins; parser)
+_ENV_VARIABLES = {
+    "base_url": (("OLLAMA_BASE_URL", "OLLAMA_HOST"), _parse_base_url),
+    "model": (("OLLAMA_MODEL",), str.strip),
+    "temperature": (("OLLAMA_TEMPERATURE",), float),
+    "keep_alive": (("OLLAMA_KEEP_ALIVE",), _parse_keep_alive),
+    "connect_timeout": (("OLLAMA_CONNECT_TIMEOUT",), float),
+    "timeout": (("OLLAMA_TIMEOUT",), float),
+    "max_retries": (("OLLAMA_MAX_RETRIES",), int),
+    "backoff_base": (("OLLAMA_BACKOFF_BASE",), float),
+    "backoff_max": (("OLLAMA_BACKOFF_MAX",), float),
+    "max_connections": (("OLLAMA_MAX_CONNECTIONS",), int),
+    "warm_up": (("OLLAMA_WARM_UP",), _parse_bool),
+}
+
+
+@dataclass(frozen=True)
+class OllamaSettings:
+    """
+    Endpoint, model and connection settings of the Ollama client.
+
+    The defaults match the shared GPU host; :meth:`from_env` overrides them
+    from ``OLLAMA_*`` environment variables and a ``.env`` file.
+    """
+    base_url: str = "http://192.168.0.16:11434"
+    model: str = "qwen2.5-coder:32b"
+    temperature: float = 0.0
+    keep_alive: Union[int, str] = "30m"  # how long Ollama keeps the model loaded after a request
+    connect_timeout: float = 5.0
+    timeout: float = 120.0  # read/write timeout; a cold 32B model can take a while to load
+    max_retries: int = 2
+    backoff_base: float = 0.25
+    backoff_max: float = 4.0
+    max_connections: int = 16
+    warm_up: bool = True
+
+    @classmethod
+    def from_env(cls, env_file: Optional[str] = ".env",
+                 environ: Optional[Mapping[str, str]] = None) -> "OllamaSettings":
+        """
+        Read the settings from the environment.
+
+        Args:
+            env_file: ``.env`` file to read first; variables set in the
+                process environment take precedence. None skips the file.
+            environ: Environment to read instead of ``os.environ``.
+
+        Returns:
+            Settings with every variable that is set applied to the defaults.
+
+        Raises:
+            ValueError: If a variable cannot be parsed.
+        """
+        values: Dict[str, Optional[str]] = {}
+        if env_file and os.path.exists(env_file):
+            from dotenv import dotenv_values
+            values.update(dotenv_values(env_file))
+        values.update(os.environ if environ is None else environ)
+
+        overrides: Dict[str, Any] = {}
+        for field_name, (names, parse) in _ENV_VARIABLES.items():
+            name = next((name for name in names if values.get(name)), None)
+            if name is None:
+                continue
+            try:
+                overrides[field_name] = parse(values[name])
+            except ValueError as e:
+                raise ValueError(f"Invalid {name}={values[name]!r}: {e}") from e
+        return cls(**overrides)
@@ -1,28 +1,39 @@
 """Main application module."""
-import json
-from typing import Dict, Any, Optional, List, Tuple
-from langchain_community.llms import Ollama
-from langchain.callbacks.manager import CallbackManager
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+import asyncio
+import threading
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple
 
-from .services.calculator_service import CalculatorService
-from .services.order_service import OrderService
-from .services.package_service import PackageService
-from .services.qps_service import QPSService
-from .services.weather_service import WeatherService
-from .utils.helpers import extract_json_from_response
+# LangChain, NumPy, Redis and qrcode are imported where they are first used,
+# so a CLI start or a fast-path query does not pay for loading them
+from .utils.helpers import IncrementalJSONScanner, extract_json_from_response, matches_function_schema
+from .core.cache import RoutingCache
+from .core.router import FastPathRouter
+from .core.registry import ParameterDoc, ToolRegistry, ToolSpec
+from .core.metrics import PipelineMetrics
+from .core.prompt import PromptBuilder
+from .core.settings import OllamaSettings
 from .schemas.base import (
     WeatherResponse,
     CalculationResponse,
+    ExpressionResponse,
+    OrderItem,
     OrderResponse,
     PackageResponse,
-    QPSResponse
+    QPSResponse,
+    QueryResult
 )
 
-import time
-import redis
 from datetime import datetime, timedelta
-import numpy as np
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.llms import BaseLLM
+    from .core.qps_counter import RingBufferQPSCounter
+    from .services.calculator_service import CalculatorService
+    from .services.order_service import OrderService, OrderStream
+    from .services.package_service import PackageService
+    from .services.qps_service import QPSService
+    from .services.weather_service import WeatherService
 
 def calculate_qps(time_window_minutes: int = 5, data_points: int = 10) -> List[Tuple[datetime, float]]:
     """
@@ -35,7 +46,8 @@ def calculate_qps(time_window_minutes: int = 5, data_points: int = 10) -> List[T
     Returns:
         List of tuples containing timestamp and QPS value
     """
-    redis_client = redis.Redis(host='localhost', port=6379, db=0)
+    from .core.request_log import get_default_recorder
+    recorder = get_default_recorder()
     
     end_time = datetime.now()
     start_time = end_time - timedelta(minutes=time_window_minutes)
@@ -44,27 +56,12 @@ def calculate_qps(time_window_minutes: int = 5, data_points: int = 10) -> List[T
     end_ts = int(end_time.timestamp())
     start_ts = int(start_time.timestamp())
     
-    # Get counts from Redis
-    counts = redis_client.zrangebyscore('request_log', start_ts, end_ts, withscores=True)
-    
-    if not counts:
-        return [(datetime.fromtimestamp(start_ts + i * (end_ts - start_ts) / data_points), 0.0) 
-                for i in range(data_points)]
-    
-    # Create time windows
+    # Sum the per-second counters of every window in one vectorized pass
     window_size = (end_ts - start_ts) / data_points
-    windows = [(start_ts + i * window_size, start_ts + (i + 1) * window_size) 
-              for i in range(data_points)]
-    
-    # Calculate QPS for each window
-    result = []
-    for window_start, window_end in windows:
-        window_counts = [count for _, count in counts 
-                        if window_start <= count < window_end]
-        qps = len(window_counts) / window_size
-        result.append((datetime.fromtimestamp(window_start), qps))
-    
-    return result
+    window_counts = recorder.window_counts(start_ts, end_ts, data_points)
+    
+    return [(datetime.fromtimestamp(start_ts + i * window_size), float(count / window_size))
+            for i, count in enumerate(window_counts)]
 
 def format_qps_response(qps_data: List[Tuple[datetime, float]]) -> Dict[str, Any]:
     """Format QPS data into standard response structure."""
@@ -78,140 +75,238 @@ def format_qps_response(qps_data: List[Tuple[datetime, float]]) -> Dict[str, Any
     }
 
 def record_request():
-    """Record a request in Redis with current timestamp"""
-    redis_client = redis.Redis(host='localhost', port=6379, db=0)
-    current_ts = int(time.time())
-    redis_client.zadd('request_log', {str(current_ts): current_ts})
-    
-    # Clean old data (keep only last 10 minutes)
-    old_ts = current_ts - 600  # 10 minutes
-    redis_client.zremrangebyscore('request_log', 0, old_ts)
+    """Record a request in the Redis per-second request log"""
+    from .core.request_log import get_default_recorder
+    get_default_recorder().record()
+
+# Declare each tool once; the prompt schemas, validators and dispatch table
+# are compiled from these declarations and the service signatures. Service
+# modules are named by path and imported when their tool is first used.
+TOOLS = ToolRegistry([
+    ToolSpec(
+        name="get_current_weather",
+        description="获取指定城市的天气信息",
+        service_class=".services.weather_service:WeatherService",
+        service_attr="weather_service",
+        method="get_current_weather",
+        parameters={
+            "location": ParameterDoc("城市名称，如：Beijing, Shanghai"),
+            "unit": ParameterDoc("温度单位", enum=("celsius", "fahrenheit"))
+        },
+        keywords=("天气", "气温", "温度", "多少度", "几度", "下雨", "下雪", "weather", "temperature", "forecast")
+    ),
+    ToolSpec(
+        name="calculator",
+        description="执行基本的数学运算",
+        service_class=".services.calculator_service:CalculatorService",
+        service_attr="calculator_service",
+        method="calculate",
+        parameters={
+            "x": ParameterDoc("第一个数"),
+            "y": ParameterDoc("第二个数"),
+            "operation": ParameterDoc(
+                "运算类型：+ 加, - 减, * 乘, / 除",
+                enum=("+", "-", "*", "/"),
+                aliases={"加": "+", "减": "-", "乘": "*", "除": "/", "×": "*", "÷": "/"}
+            )
+        },
+        keywords=("计算", "等于", "乘以", "除以", "calculate")
+    ),
+    ToolSpec(
+        name="evaluate_expression",
+        description="一次计算包含多步运算的算术表达式，支持 + - * / // % ** 和括号",
+        service_class=".services.calculator_service:CalculatorService",
+        service_attr="calculator_service",
+        method="evaluate",
+        parameters={
+            "expression": ParameterDoc("算术表达式，如：(23*45+12)/3")
+        },
+        keywords=("计算", "表达式", "calculate", "expression")
+    ),
+    ToolSpec(
+        name="get_recent_orders",
+        description="获取用户最近的订单信息",
+        service_class=".services.order_service:OrderService",
+        service_attr="order_service",
+        method="stream_recent_orders",
+        parameters={
+            "user_id": ParameterDoc("用户ID"),
+            "months": ParameterDoc("查询最近几个月的订单"),
+            "limit": ParameterDoc("最多列出的订单数量，不填则列出全部")
+        },
+        keywords=("订单", "购买", "买过", "下单", "到货", "物流", "快递", "order")
+    ),
+    ToolSpec(
+        name="create_custom_package",
+        description="创建自定义套餐",
+        service_class=".services.package_service:PackageService",
+        service_attr="package_service",
+        method="create_custom_package",
+        parameters={
+            "name": ParameterDoc("套餐名称"),
+            "duration": ParameterDoc("套餐时长（月）"),
+            "features": ParameterDoc("套餐包含的功能列表"),
+            "price": ParameterDoc("套餐价格")
+        },
+        keywords=("套餐", "定制", "创建", "会员", "开通", "vip", "package")
+    ),
+    ToolSpec(
+        name="calculate_qps",
+        description="计算最近一段时间的QPS数据",
+        service_class=".services.qps_service:QPSService",
+        service_attr="qps_service",
+        method="calculate_qps",
+        parameters={
+            "time_window_minutes": ParameterDoc("时间窗口（分钟）"),
+            "data_points": ParameterDoc("返回的数据点数量")
+        },
+        keywords=("qps", "请求量", "流量", "每秒")
+    ),
+], package=__package__)
+
 
-# Define function schemas
-FUNCTIONS = [
-    {
-        "name": "get_current_weather",
-        "description": "获取指定城市的天气信息",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "location": {
-                    "type": "string",
-                    "description": "城市名称，如：Beijing, Shanghai"
-                },
-                "unit": {
-                    "type": "string",
-                    "enum": ["celsius", "fahrenheit"],
-                    "description": "温度单位"
-                }
-            },
-            "required": ["location"]
-        }
-    },
-    {
-        "name": "calculator",
-        "description": "执行基本的数学运算",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "x": {
-                    "type": "number",
-                    "description": "第一个数"
-                },
-                "y": {
-                    "type": "number",
-                    "description": "第二个数"
-                },
-                "operation": {
-                    "type": "string",
-                    "enum": ["加", "减", "乘", "除"],
-                    "description": "运算类型"
-                }
-            },
-            "required": ["x", "y", "operation"]
-        }
-    },
-    {
-        "name": "get_recent_orders",
-        "description": "获取用户最近的订单信息",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "user_id": {
-                    "type": "string",
-                    "description": "用户ID"
-                }
-            },
-            "required": ["user_id"]
-        }
-    },
-    {
-        "name": "create_custom_package",
-        "description": "创建自定义套餐",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "name": {
-                    "type": "string",
-                    "description": "套餐名称"
-                },
-                "duration": {
-                    "type": "integer",
-                    "description": "套餐时长（月）"
-                },
-                "features": {
-                    "type": "array",
-                    "items": {
-                        "type": "string"
-                    },
-                    "description": "套餐包含的功能列表"
-                },
-                "price": {
-                    "type": "number",
-                    "description": "套餐价格"
-                }
-            },
-            "required": ["name"]
-        }
-    },
-    {
-        "name": "calculate_qps",
-        "description": "计算最近一段时间的QPS数据",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "time_window_minutes": {
-                    "type": "integer",
-                    "description": "时间窗口（分钟）"
-                },
-                "data_points": {
-                    "type": "integer",
-                    "description": "返回的数据点数量",
-                    "default": 10
-                }
-            },
-            "required": ["time_window_minutes"]
-        }
-    }
-]
+
+def __getattr__(name: str) -> Any:
+    # FUNCTIONS compiles (and imports) every tool, so it is built on first access
+    if name == "FUNCTIONS":
+        return TOOLS.functions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _default_llm(settings: Optional[OllamaSettings] = None) -> "BaseLLM":
+    """Create the shared Ollama client from ``settings`` (default: ``OLLAMA_*`` variables and ``.env``)."""
+    from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+    from .core.llm import PooledOllama
+    return PooledOllama.from_settings(
+        settings or OllamaSettings.from_env(),
+        callbacks=[StreamingStdOutCallbackHandler()]
+    )
 
 
 class FunctionCallingDemo:
     """Main application class for the function calling demo."""
     
-    def __init__(self):
-        """Initialize the demo application."""
-        self.llm = Ollama(
-            model="qwen2.5-coder:32b",
-            base_url="http://192.168.0.16:11434",
-            callbacks=[StreamingStdOutCallbackHandler()],
-            temperature=0
-        )
-        self.weather_service = WeatherService()
-        self.calculator_service = CalculatorService()
-        self.order_service = OrderService()
-        self.package_service = PackageService()
-        self.qps_service = QPSService()
+    def __init__(
+            self,
+            routing_cache: Optional[RoutingCache] = None,
+            enable_cache: bool = True,
+            enable_fast_path: bool = True,
+            streaming: bool = False,
+            qps_backend: Optional["RingBufferQPSCounter"] = None,
+            metrics: Optional[PipelineMetrics] = None,
+            llm: Optional["BaseLLM"] = None,
+            ollama_settings: Optional[OllamaSettings] = None,
+            max_prompt_tools: Optional[int] = 3
+        ):
+        """
+        Initialize the demo application.
+
+        Args:
+            routing_cache: Cache mapping queries to function calls. Defaults to
+                an in-process LRU cache; pass one built on
+                ``RedisCacheBackend`` to share it between workers.
+            enable_cache: Whether to consult the routing cache at all.
+            enable_fast_path: Whether to try the deterministic router before
+                the LLM.
+            streaming: Stream the LLM output and stop generation as soon as a
+                complete function-call JSON object has been received.
+            qps_backend: In-process counter that records every query and
+                answers calculate_qps with real data instead of a simulation.
+            metrics: Per-stage latency histograms and tool counters; a fresh
+                registry is created when omitted.
+            llm: Language model to route queries with. Defaults to the
+                shared Ollama host, connected when the LLM is first needed;
+                pass another instance (e.g. pointed at
+                ``benchmarks.ollama_stub``) for benchmarks.
+            ollama_settings: Endpoint, model, keep-alive, timeout and retry
+                settings of the default client; read from ``OLLAMA_*``
+                variables and ``.env`` when omitted.
+            max_prompt_tools: Most tool schemas advertised in an LLM prompt,
+                picked per query by relevance; None advertises every tool.
+        
+        The services are likewise built on first use.
+        """
+        if llm is not None:
+            self.llm = llm
+        self.ollama_settings = ollama_settings
+        self.qps_backend = qps_backend
+        self.routing_cache = (routing_cache or RoutingCache()) if enable_cache else None
+        self.fast_path_router = FastPathRouter() if enable_fast_path else None
+        self.route_counts = {"fast_path": 0, "cache": 0, "llm": 0}
+        self.streaming = streaming
+        self.metrics = metrics or PipelineMetrics()
+        self.prompt_builder = PromptBuilder(TOOLS, max_tools=max_prompt_tools)
+    
+    @cached_property
+    def llm(self) -> "BaseLLM":
+        """Language model, created on first use unless one was passed in."""
+        return _default_llm(self.ollama_settings)
+    
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Load the model on the Ollama host before the first query needs it.
+        
+        Clients without a ``warm_up`` method (e.g. a plain ``Ollama``) are
+        left alone. A failed warm-up is reported and otherwise ignored; the
+        first query then simply pays for loading the model.
+        
+        Args:
+            background: Warm up in a daemon thread instead of blocking.
+            
+        Returns:
+            The warm-up thread when running in the background, else None.
+        """
+        def run() -> None:
+            warm_up = getattr(self.llm, "warm_up", None)
+            if warm_up is None:
+                return
+            try:
+                with self.metrics.time("llm_warm_up"):
+                    warm_up()
+            except Exception as e:
+                print(f"\n模型预热失败: {str(e)}")
+        
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="llm-warm-up", daemon=True)
+        thread.start()
+        return thread
+    
+    @cached_property
+    def weather_service(self) -> "WeatherService":
+        """Weather service, built on first use."""
+        from .services.weather_service import WeatherService
+        return WeatherService()
+    
+    @cached_property
+    def calculator_service(self) -> "CalculatorService":
+        """Calculator service, built on first use."""
+        from .services.calculator_service import CalculatorService
+        return CalculatorService()
+    
+    @cached_property
+    def order_service(self) -> "OrderService":
+        """Order service, built on first use."""
+        from .services.order_service import OrderService
+        return OrderService()
+    
+    @cached_property
+    def package_service(self) -> "PackageService":
+        """Package service, built on first use."""
+        from .services.package_service import PackageService
+        return PackageService()
+    
+    @cached_property
+    def qps_service(self) -> "QPSService":
+        """QPS service, built on first use."""
+        from .services.qps_service import QPSService
+        return QPSService(backend=self.qps_backend)
+    
+    def _record_request(self) -> None:
+        """Count a query for calculate_qps; only a configured backend needs the QPS service."""
+        if self.qps_backend is not None:
+            self.qps_service.record_request()
     
     def process_query(self, query: str) -> Optional[Dict[str, Any]]:
         """
@@ -223,43 +318,246 @@ class FunctionCallingDemo:
         Returns:
             Function result or None if query couldn't be processed.
         """
-        print("\n正在思考...")
+        with self.metrics.time("total"):
+            self._record_request()
+            with self.metrics.time("route"):
+                function_call = self._route(query)
+            if function_call is None:
+                print("\n正在思考...")
+                self.route_counts["llm"] += 1
+                
+                # Generate response with function calling capability
+                with self.metrics.time("prompt_build"):
+                    prompt = self.prompt_builder.build(query)
+                if self.streaming:
+                    # Generation and extraction overlap, so they are timed together
+                    with self.metrics.time("llm_stream"):
+                        function_call = self._stream_function_call(prompt)
+                else:
+                    with self.metrics.time("llm_invoke"):
+                        response = self.llm.invoke(prompt)
+                    with self.metrics.time("json_extract"):
+                        function_call = self._parse_function_call(response)
+                from_llm = True
+            else:
+                from_llm = False
+            
+            if function_call and "function" in function_call and function_call["function"]:
+                result = self._execute_function(function_call)
+                if from_llm:
+                    self._remember(query, function_call)
+                return result
+            return None
+    
+    async def aprocess_query(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Asynchronous version of :meth:`process_query`.
         
-        # Generate response with function calling capability
-        response = self.llm.invoke(
-            f"""你是一个函数调用助手。根据用户的请求，判断是否需要调用函数。
-
-用户请求: "{query}"
-
-可用的函数:
-{json.dumps(FUNCTIONS, indent=2, ensure_ascii=False)}
-
-如果需要调用函数，请直接返回一个JSON对象，格式如下：
-{{
-    "function": "函数名称",
-    "parameters": {{
-        "参数1": "值1",
-        ...
-    }}
-}}
-
-注意：
-1. 只输出JSON对象，不要有任何其他解释文字
-2. 如果不需要调用函数，返回空的JSON对象 {{}}
-3. 对于自定义套餐，从用户输入中提取：
-   - 套餐名称（必须）
-   - 时长（如果提到）
-   - 功能列表（如果提到）
-   - 价格（如果提到）
-"""
-        )
+        The LLM is awaited through ``ainvoke`` and the (synchronous) service
+        call runs in a worker thread, so the event loop is never blocked.
+        
+        Args:
+            query: User input query.
+            
+        Returns:
+            Function result or None if query couldn't be processed.
+        """
+        with self.metrics.time("total"):
+            self._record_request()
+            with self.metrics.time("route"):
+                function_call = self._route(query)
+            if function_call is None:
+                self.route_counts["llm"] += 1
+                with self.metrics.time("prompt_build"):
+                    prompt = self.prompt_builder.build(query)
+                if self.streaming:
+                    with self.metrics.time("llm_stream"):
+                        function_call = await self._astream_function_call(prompt)
+                else:
+                    with self.metrics.time("llm_invoke"):
+                        response = await self.llm.ainvoke(prompt)
+                    with self.metrics.time("json_extract"):
+                        function_call = self._parse_function_call(response)
+                from_llm = True
+            else:
+                from_llm = False
+            
+            if function_call and "function" in function_call and function_call["function"]:
+                result = await asyncio.to_thread(self._execute_function, function_call)
+                if from_llm:
+                    self._remember(query, function_call)
+                return result
+            return None
+    
+    async def aprocess_many(self, queries: List[str], max_concurrency: int = 8) -> List[QueryResult]:
+        """
+        Process a batch of queries concurrently.
+        
+        Args:
+            queries: User input queries.
+            max_concurrency: Maximum number of queries in flight at once.
+            
+        Returns:
+            One QueryResult per query, in input order. A failing query
+            carries its error message instead of raising.
+            
+        Raises:
+            ValueError: If max_concurrency is less than 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(query: str) -> QueryResult:
+            async with semaphore:
+                try:
+                    return QueryResult(query=query, result=await self.aprocess_query(query))
+                except Exception as e:
+                    return QueryResult(query=query, error=str(e))
+        
+        return list(await asyncio.gather(*(run(query) for query in queries)))
+    
+    @staticmethod
+    def _parse_function_call(response: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract the function call from an LLM response.
+        
+        Args:
+            response: Raw LLM output.
+            
+        Returns:
+            Function-call dictionary, or None if none was found.
+        """
+        return extract_json_from_response(response, TOOLS.functions())
+    
+    def _remember(self, query: str, function_call: Dict[str, Any]) -> None:
+        """
+        Cache a function call produced by the LLM.
+        
+        Only called once the call has been validated and executed without
+        error, so a malformed reply is never replayed from the cache.
+        
+        Args:
+            query: User input query.
+            function_call: Function-call dictionary that executed successfully.
+        """
+        if self.routing_cache:
+            self.routing_cache.set(query, function_call)
+    
+    def _stream_function_call(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        Stream the LLM output and stop at the first complete JSON object.
+        
+        Closing the stream drops the HTTP connection, which makes Ollama stop
+        generating instead of producing tokens nobody reads.
+        
+        Args:
+            prompt: Prompt text sent to the LLM.
+            
+        Returns:
+            First function call in the output, or None.
+        """
+        scanner = IncrementalJSONScanner()
+        stream = self.llm.stream(prompt)
+        try:
+            for chunk in stream:
+                for candidate in scanner.feed(chunk):
+                    if not candidate:
+                        return None  # "{}" means no function applies
+                    if matches_function_schema(candidate, TOOLS.functions()):
+                        return candidate
+        finally:
+            stream.close()
+        return None
+    
+    async def _astream_function_call(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        Asynchronous version of :meth:`_stream_function_call`.
+        
+        Args:
+            prompt: Prompt text sent to the LLM.
+            
+        Returns:
+            First function call in the output, or None.
+        """
+        scanner = IncrementalJSONScanner()
+        stream = self.llm.astream(prompt)
+        try:
+            async for chunk in stream:
+                for candidate in scanner.feed(chunk):
+                    if not candidate:
+                        return None  # "{}" means no function applies
+                    if matches_function_schema(candidate, TOOLS.functions()):
+                        return candidate
+        finally:
+            await stream.aclose()
+        return None
+    
+    def _route(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a query without the LLM, via the fast-path router or the cache.
         
-        # Extract and process function call
-        function_call = extract_json_from_response(response)
-        if function_call and "function" in function_call and function_call["function"]:
-            return self._execute_function(function_call)
+        Args:
+            query: User input query.
+            
+        Returns:
+            Function-call dictionary, or None if the LLM has to decide.
+        """
+        if self.fast_path_router:
+            function_call = self.fast_path_router.route(query)
+            if function_call is not None:
+                self.route_counts["fast_path"] += 1
+                return function_call
+        if self.routing_cache:
+            function_call = self.routing_cache.get(query)
+            if function_call is not None:
+                self.route_counts["cache"] += 1
+                return function_call
         return None
     
+    def routing_stats(self) -> Dict[str, Any]:
+        """
+        Report how queries were routed and how much traffic skipped the LLM.
+        
+        Returns:
+            Dictionary with per-route counts, the LLM bypass ratio and the
+            router and cache statistics.
+        """
+        total = sum(self.route_counts.values())
+        skipped = self.route_counts["fast_path"] + self.route_counts["cache"]
+        return {
+            **self.route_counts,
+            "total": total,
+            "llm_bypass_ratio": skipped / total if total else 0.0,
+            "fast_path_router": self.fast_path_router.stats() if self.fast_path_router else None,
+            "routing_cache": self.routing_cache.stats() if self.routing_cache else None
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report per-stage latencies, tool call counts, routing, weather cache and prompt size statistics.
+        
+        Returns:
+            Dictionary with ``stages`` (latency summaries in milliseconds),
+            ``tools`` (success/error counts per tool), ``routing``, ``weather``
+            and ``prompt`` (estimated prompt tokens saved by tool selection).
+        """
+        return {
+            **self.metrics.stats(),
+            "routing": self.routing_stats(),
+            "weather": self.weather_service.stats(),
+            "prompt": self.prompt_builder.stats()
+        }
+    
+    def openmetrics(self) -> str:
+        """
+        Dump the pipeline metrics in the OpenMetrics text format.
+        
+        Returns:
+            Exposition text, e.g. to serve from a ``/metrics`` endpoint.
+        """
+        return self.metrics.to_openmetrics()
+    
     def _execute_function(self, function_call: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute the specified function with given parameters.
@@ -271,30 +569,18 @@ class FunctionCallingDemo:
             Function result.
             
         Raises:
-            ValueError: If function is not recognized.
+            ValueError: If function is not recognized or its parameters are invalid.
         """
-        function_name = function_call["function"]
-        parameters = function_call["parameters"]
-        
-        if function_name == "get_current_weather":
-            return self.weather_service.get_current_weather(**parameters)
-        elif function_name == "calculator":
-            return self.calculator_service.calculate(**parameters)
-        elif function_name == "get_recent_orders":
-            return self.order_service.get_recent_orders(**parameters)
-        elif function_name == "create_custom_package":
-            return self.package_service.create_custom_package(**parameters)
-        elif function_name == "calculate_qps":
-            result = self.qps_service.calculate_qps(**parameters)
-            print("\nQPS统计结果:")
-            print(f"状态: {result.status}")
-            print(f"消息: {result.message}")
-            print("\n时间点数据:")
-            for point in result.data:
-                print(f"时间: {point.timestamp.strftime('%Y-%m-%d %H:%M:%S')}, QPS: {point.qps_value:.2f}")
-            return result
-        else:
-            raise ValueError(f"Unknown function: {function_name}")
+        # The name comes from the LLM; unknown names share one counter series
+        name = function_call["function"] if function_call["function"] in TOOLS else "unknown"
+        with self.metrics.time("execute"):
+            try:
+                result = TOOLS.dispatch(self, function_call)
+            except Exception:
+                self.metrics.count_tool_call(name, success=False)
+                raise
+        self.metrics.count_tool_call(name)
+        return result
     
     def print_result(self, result: Dict[str, Any]):
         """
@@ -303,6 +589,24 @@ class FunctionCallingDemo:
         Args:
             result: Function result to print.
         """
+        with self.metrics.time("print_result"):
+            self._print_result(result)
+    
+    @staticmethod
+    def _print_order_header():
+        """Print the heading of the order table."""
+        print("\n订单详情:")
+        print("-" * 80)
+        print(f"{'订单号':<15} {'日期':<30} {'商品':<15} {'数量':<10} {'单价':<10} {'总价':<10} {'状态':<10}")
+        print("-" * 80)
+    
+    @staticmethod
+    def _format_order_row(order: OrderItem) -> str:
+        """Format one row of the order table."""
+        return f"{order.order_id:<15} {order.date:<30} {order.product:<15} {order.quantity:<10} {order.price:<10.1f} {order.total:<10.1f} {order.status:<10}"
+    
+    def _print_result(self, result: Dict[str, Any]):
+        """Print a function result without timing it."""
         if isinstance(result, WeatherResponse):
             print("查询结果:")
             print(f"城市: {result.location}")
@@ -313,17 +617,20 @@ class FunctionCallingDemo:
             print("计算结果:")
             print(f"{result.x} {result.operation} {result.y} = {result.result}")
             
+        elif isinstance(result, ExpressionResponse):
+            print("计算结果:")
+            print(f"{result.expression} = {result.result}")
+            
         elif isinstance(result, OrderResponse):
             print(f"{result.user_id} 的订单查询结果:")
             print(f"查询期间: {result.period}")
             print(f"订单总数: {result.total_orders}")
-            print("\n订单详情:")
-            print("-" * 80)
-            print(f"{'订单号':<15} {'日期':<30} {'商品':<15} {'数量':<10} {'单价':<10} {'总价':<10} {'状态':<10}")
-            print("-" * 80)
+            self._print_order_header()
             for order in result.orders:
-                print(f"{order.order_id:<15} {order.date:<30} {order.product:<15} {order.quantity:<10} {order.price:<10.1f} {order.total:<10.1f} {order.status:<10}")
+                print(self._format_order_row(order))
             print("-" * 80)
+            if result.next_cursor:
+                print(f"还有更多订单，下一页 cursor: {result.next_cursor}")
             
         elif isinstance(result, PackageResponse):
             print("自定义套餐创建成功!")
@@ -334,21 +641,44 @@ class FunctionCallingDemo:
             print("\n包含功能:")
             for feature in result.package.features:
                 print(f"- {feature}")
-            print(f"\n二维码已生成: {result.qr_file}")
+            if result.qr_file:
+                # In background mode the file is written after the response is returned
+                image = self.package_service.get_qr_image(result.package.id)
+                if image is not None and not image.done():
+                    print(f"\n二维码生成中，完成后保存到: {result.qr_file}")
+                else:
+                    print(f"\n二维码已生成: {result.qr_file}")
             print(f"支付链接: {result.payment_url}")
             
-        elif isinstance(result, QPSResponse):
-            print("\nQPS统计结果:")
-            print(f"状态: {result.status}")
-            print(f"消息: {result.message}")
-            print("\n时间点数据:")
-            for point in result.data:
-                print(f"时间: {point.timestamp.strftime('%Y-%m-%d %H:%M:%S')}, QPS: {point.qps_value:.2f}")
+        else:
+            # Only loaded once a result of these types can exist
+            from .models import qps as qps_models
+            from .services.order_service import OrderStream
+            if isinstance(result, OrderStream):
+                self._print_order_stream(result)
+            elif isinstance(result, (QPSResponse, qps_models.QPSResponse)):
+                self.print_qps_result(result)
+    
+    def _print_order_stream(self, result: "OrderStream"):
+        """Print the summary of an order stream, then each page as soon as it is fetched."""
+        summary = result.summary
+        print(f"{summary.user_id} 的订单查询结果:")
+        print(f"查询期间: {summary.period}")
+        print(f"订单总数: {summary.total_orders}")
+        print(f"订单总额: {summary.total_amount:.1f}")
+        print(f"状态分布: {', '.join(f'{status} {count}' for status, count in summary.status_counts.items())}")
+        self._print_order_header()
+        for page in result.pages():
+            print("\n".join(self._format_order_row(order) for order in page), flush=True)
+        print("-" * 80)
     
     def print_qps_result(self, result: Dict[str, Any]):
         """
         Print QPS result in a formatted way.
         
+        Columnar results are formatted in one vectorized pass without
+        creating per-point objects.
+        
         Args:
             result: QPS result to print.
         """
@@ -356,22 +686,29 @@ class FunctionCallingDemo:
         print(f"状态: {result.status}")
         print(f"消息: {result.message}")
         print("\n时间点数据:")
+        from .models import qps as qps_models
+        if isinstance(result, qps_models.QPSResponse):
+            print(result.format_lines())
+            return
         for point in result.data:
             print(f"时间: {point.timestamp.strftime('%Y-%m-%d %H:%M:%S')}, QPS: {point.qps_value:.2f}")
 
 
 def main():
     """Main function to run the demo."""
-    demo = FunctionCallingDemo()
+    settings = OllamaSettings.from_env()
+    demo = FunctionCallingDemo(ollama_settings=settings)
+    if settings.warm_up:
+        demo.warm_up()
     
     print("\n欢迎使用 Function Calling Demo!")
     print("你可以问我：")
     print("1. 天气相关：'北京的天气怎么样？'")
-    print("2. 计算相关：'帮我计算23乘以45'")
+    print("2. 计算相关：'帮我计算23乘以45'、'计算 (23*45+12)/3'")
     print("3. 订单查询：'查询用户12345最近3个月的订单'")
     print("4. 套餐定制：'创建3个月的高级套餐，包含数据分析和专家咨询功能'")
     print("5. QPS计算：'计算最近5分钟的QPS'")
-    print("输入 'q' 退出\n")
+    print("输入 'stats' 查看各阶段耗时统计，输入 'q' 退出\n")
     
     while True:
         query = input("\n请输入你的问题: ")
@@ -380,9 +717,13 @@ def main():
             print("谢谢使用，再见！")
             break
         
+        if query.lower() == 'stats':
+            print(demo.openmetrics())
+            continue
+        
         try:
             result = demo.process_query(query)
-            if result:
+            if result is not None:
                 demo.print_result(result)
             else:
                 print("\n无法理解你的问题，请尝试换个方式提问。")
@@ -1,17 +1,136 @@
 """QPS数据模型模块"""
+import json
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Sequence, Union, overload
 from dataclasses import dataclass
 
+import numpy as np
+
 @dataclass
 class QPSData:
     """单个QPS数据点的模型"""
     timestamp: datetime
     qps_value: float
 
-@dataclass
+class QPSPointsView(Sequence[QPSData]):
+    """
+    按需生成 QPSData 的只读视图，兼容原来的 ``List[QPSData]`` 用法
+
+    只有被访问的数据点才会创建对象。
+    """
+
+    def __init__(self, timestamps: np.ndarray, values: np.ndarray):
+        """
+        初始化视图
+
+        Args:
+            timestamps: 时间点数组（datetime64[us]）
+            values: QPS值数组
+        """
+        self._timestamps = timestamps
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @overload
+    def __getitem__(self, index: int) -> QPSData: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "QPSPointsView": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[QPSData, "QPSPointsView"]:
+        if isinstance(index, slice):
+            return QPSPointsView(self._timestamps[index], self._values[index])
+        return QPSData(timestamp=self._timestamps[index].item(), qps_value=float(self._values[index]))
+
+    def __iter__(self) -> Iterator[QPSData]:
+        for timestamp, value in zip(self._timestamps.tolist(), self._values.tolist()):
+            yield QPSData(timestamp=timestamp, qps_value=value)
+
+@dataclass(eq=False)
 class QPSResponse:
-    """QPS响应数据的模型"""
+    """
+    QPS响应数据的模型（列式存储）
+
+    时间点和QPS值分别保存在两个 NumPy 数组中，长时间窗口只占用两块连续内存；
+    ``data`` 属性按需生成 QPSData，序列化直接在数组上完成。
+    """
     status: str
     message: str
-    data: List[QPSData]
+    timestamps: np.ndarray  # datetime64[us]
+    values: np.ndarray  # float64
+
+    def __post_init__(self):
+        # np.asarray 在类型已匹配时不复制数据
+        self.timestamps = np.asarray(self.timestamps, dtype="datetime64[us]")
+        self.values = np.asarray(self.values, dtype=np.float64)
+
+    @classmethod
+    def from_points(cls, status: str, message: str, data: List[QPSData]) -> "QPSResponse":
+        """
+        从逐点数据构建响应，兼容旧的构造方式
+
+        Args:
+            status: 状态
+            message: 消息
+            data: QPS数据点列表
+
+        Returns:
+            QPSResponse: 列式响应对象
+        """
+        return cls(
+            status=status,
+            message=message,
+            timestamps=np.array([point.timestamp for point in data], dtype="datetime64[us]"),
+            values=np.array([point.qps_value for point in data], dtype=np.float64)
+        )
+
+    @property
+    def data(self) -> QPSPointsView:
+        """按需生成 QPSData 的只读视图"""
+        return QPSPointsView(self.timestamps, self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _timestamp_strings(self) -> List[str]:
+        # datetime64 -> 'YYYY-MM-DDTHH:MM:SS'，再把 'T' 原地替换为空格
+        strings = self.timestamps.astype("datetime64[s]").astype("U19")
+        strings.view(np.uint32).reshape(-1, 19)[:, 10] = ord(" ")
+        return strings.tolist()
+
+    def format_lines(self) -> str:
+        """
+        生成命令行输出的时间点数据，每行一个数据点
+
+        Returns:
+            str: 格式化后的文本
+        """
+        return "\n".join(map("时间: {}, QPS: {:.2f}".format, self._timestamp_strings(), self.values.tolist()))
+
+    def to_json(self) -> str:
+        """
+        序列化为列式JSON，结构与 format_qps_response 一致
+
+        Returns:
+            str: JSON 字符串
+        """
+        return json.dumps({
+            "status": self.status,
+            "data": {
+                "timestamps": self._timestamp_strings(),
+                "qps_values": np.round(self.values, 2).tolist()
+            },
+            "message": self.message
+        }, ensure_ascii=False)
+
+    def to_csv(self) -> str:
+        """
+        序列化为CSV（表头 timestamp,qps_value）
+
+        Returns:
+            str: CSV 文本
+        """
+        rows = map("{},{:.2f}\n".format, self._timestamp_strings(), self.values.tolist())
+        return "timestamp,qps_value\n" + "".join(rows)
@@ -1,8 +1,59 @@
 """Base schemas for the application."""
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Type, TypeVar
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 
+ModelT = TypeVar("ModelT", bound="TrustedModel")
+
+
+class TrustedModel(BaseModel):
+    """
+    Schema that services may also build from data they produced themselves.
+    
+    ``Model(**data)`` validates every field. :meth:`trusted` skips validation
+    for internal producers that already guarantee the field types. Anything
+    from outside the process, such as LLM function-call parameters, must keep
+    going through validation.
+    """
+    
+    @classmethod
+    def trusted(cls: Type[ModelT], **data: Any) -> ModelT:
+        """
+        Build an instance from already valid data without validating it.
+        
+        Uses ``model_construct``; for flat rows that is no faster than
+        validation, the gain is in responses that embed models which were
+        already built, such as a page of :class:`OrderItem` rows.
+        
+        Args:
+            **data: Field values of the declared types; every required field
+                must be given.
+        
+        Returns:
+            The model instance.
+        """
+        return cls.model_construct(**data)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """
+    Return the cached adapter for ``List[model]``.
+    
+    Validating or serializing a whole list through one adapter runs in a
+    single call into pydantic-core instead of one call per row, and building
+    the adapter is paid once per model.
+    
+    Args:
+        model: Row schema
+    
+    Returns:
+        TypeAdapter: Adapter with ``validate_python``, ``dump_python`` and ``dump_json``
+    """
+    return TypeAdapter(List[model])
+
+
 class WeatherResponse(BaseModel):
     """Weather response schema."""
     location: str
@@ -19,7 +70,20 @@ class CalculationResponse(BaseModel):
     result: float
 
 
-class OrderItem(BaseModel):
+class ExpressionResponse(BaseModel):
+    """Expression evaluation response schema."""
+    expression: str
+    result: float
+
+
+class BatchCalculationResponse(TrustedModel):
+    """Element-wise calculation response schema."""
+    operation: str
+    count: int
+    results: List[float]
+
+
+class OrderItem(TrustedModel):
     """Order item schema."""
     order_id: str
     date: str
@@ -30,12 +94,22 @@ class OrderItem(BaseModel):
     status: str
 
 
-class OrderResponse(BaseModel):
+class OrderResponse(TrustedModel):
     """Order response schema."""
     user_id: str
     period: str
     total_orders: int
     orders: List[OrderItem]
+    next_cursor: Optional[str] = None  # pass back to fetch the next page
+
+
+class OrderSummary(TrustedModel):
+    """Aggregate of a user's orders over a period."""
+    user_id: str
+    period: str
+    total_orders: int
+    total_amount: float
+    status_counts: Dict[str, int]
 
 
 class PackageFeature(BaseModel):
@@ -44,7 +118,7 @@ class PackageFeature(BaseModel):
     description: Optional[str] = None
 
 
-class Package(BaseModel):
+class Package(TrustedModel):
     """Package schema."""
     id: str
     name: str
@@ -53,14 +127,14 @@ class Package(BaseModel):
     features: List[str]
 
 
-class PackageResponse(BaseModel):
+class PackageResponse(TrustedModel):
     """Package response schema."""
     package: Package
-    qr_file: str
+    qr_file: Optional[str] = None  # None when the QR code is kept in memory
     payment_url: str
 
 
-class QPSData(BaseModel):
+class QPSData(TrustedModel):
     """QPS data point schema."""
     timestamp: datetime
     qps_value: float
@@ -71,3 +145,10 @@ class QPSResponse(BaseModel):
     status: str
     message: str
     data: List[QPSData]
+
+
+class QueryResult(BaseModel):
+    """Outcome of one query in a batch: either a result or an error."""
+    query: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
@@ -1,6 +1,109 @@
 """Calculator service module."""
-from typing import Dict, Any
-from ..schemas.base import CalculationResponse
+import ast
+import unicodedata
+from functools import lru_cache
+from types import CodeType
+from typing import TYPE_CHECKING, Callable, Dict, Any, Sequence, Union
+from ..schemas.base import BatchCalculationResponse, CalculationResponse, ExpressionResponse
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAX_EXPRESSION_LENGTH = 256
+
+# AST nodes an arithmetic expression may consist of; anything else is rejected
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub
+)
+
+# Alternative operator spellings -> Python operators
+_SPELLINGS = str.maketrans({"×": "*", "÷": "/", "^": "**"})
+
+
+def _reject(expression: str, reason: str) -> ValueError:
+    return ValueError(f"Invalid expression {expression!r}: {reason}")
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str) -> CodeType:
+    """
+    Validate an arithmetic expression and compile it to bytecode.
+    
+    Only numbers, parentheses, unary +/- and the operators
+    ``+ - * / // % **`` are accepted; names, calls, attributes and every
+    other construct are rejected before compiling, so evaluating the result
+    cannot reach anything but arithmetic. Numbers are compiled as floats,
+    which keeps ``**`` from building huge integers. Results are cached, so
+    repeated expressions skip parsing.
+    
+    Args:
+        expression: Expression such as ``(23*45+12)/3``; ``×``, ``÷`` and
+            ``^`` are accepted for ``*``, ``/`` and ``**``
+    
+    Returns:
+        CodeType: Code object for ``eval``
+    
+    Raises:
+        ValueError: If the expression is too long, malformed or not plain arithmetic
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise _reject(expression[:20] + "...", f"longer than {MAX_EXPRESSION_LENGTH} characters")
+    source = unicodedata.normalize("NFKC", expression).translate(_SPELLINGS).strip()
+    try:
+        tree = ast.parse(source, mode="eval")
+    except (SyntaxError, RecursionError, MemoryError) as e:
+        raise _reject(expression, "not a valid expression") from e
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise _reject(expression, f"{type(node).__name__} is not allowed")
+        if isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise _reject(expression, f"{node.value!r} is not a number")
+            node.value = float(node.value)
+    return compile(tree, "<expression>", "eval")
+
+
+def evaluate_expression(expression: str) -> float:
+    """
+    Evaluate an arithmetic expression.
+    
+    Args:
+        expression: Expression accepted by :func:`compile_expression`
+    
+    Returns:
+        float: Result
+    
+    Raises:
+        ValueError: If the expression is invalid, divides by zero, overflows
+            or has no real result
+    """
+    code = compile_expression(expression)
+    try:
+        result = eval(code, {"__builtins__": {}})
+    except ZeroDivisionError as e:
+        raise _reject(expression, "division by zero") from e
+    except OverflowError as e:
+        raise _reject(expression, "result is too large") from e
+    if not isinstance(result, float):
+        # e.g. a fractional power of a negative number is complex
+        raise _reject(expression, "result is not a real number")
+    return result
+
+
+@lru_cache(maxsize=None)
+def _batch_operations() -> Dict[str, Callable[["np.ndarray", "np.ndarray"], "np.ndarray"]]:
+    # NumPy is only loaded once a batch is actually calculated
+    import numpy as np
+    
+    def divide(x: "np.ndarray", y: "np.ndarray") -> "np.ndarray":
+        # Same rule as calculate(): division by zero yields inf
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(y != 0, x / np.where(y != 0, y, 1.0), np.inf)
+    
+    return {'+': np.add, '-': np.subtract, '*': np.multiply, '/': divide}
+
 
 class CalculatorService:
     """Calculator service for basic arithmetic operations."""
@@ -38,3 +141,53 @@ class CalculatorService:
             y=y,
             result=result
         )
+    
+    @staticmethod
+    def evaluate(expression: str) -> ExpressionResponse:
+        """
+        Evaluate a multi-step arithmetic expression in one call.
+        
+        Args:
+            expression: Expression such as ``(23*45+12)/3``
+        
+        Returns:
+            ExpressionResponse: Expression and its result
+        
+        Raises:
+            ValueError: If the expression is invalid or cannot be evaluated
+        """
+        return ExpressionResponse(expression=expression, result=evaluate_expression(expression))
+    
+    @staticmethod
+    def calculate_batch(
+            operation: str,
+            x: Union[Sequence[float], "np.ndarray"],
+            y: Union[Sequence[float], "np.ndarray", float]
+        ) -> BatchCalculationResponse:
+        """
+        Apply one operation element-wise over arrays of operands.
+        
+        Args:
+            operation: Type of operation (+, -, *, /)
+            x: First operands
+            y: Second operands, or one number applied to every ``x``
+        
+        Returns:
+            BatchCalculationResponse: One result per operand pair
+        
+        Raises:
+            ValueError: If operation is not supported, the operands are not
+                numeric or their shapes do not match
+        """
+        operations = _batch_operations()
+        if operation not in operations:
+            raise ValueError(f"Unsupported operation: {operation}")
+        import numpy as np
+        x_values = np.asarray(x, dtype=np.float64)
+        y_values = np.asarray(y, dtype=np.float64)
+        if x_values.ndim != 1 or y_values.ndim > 1:
+            raise ValueError("x must be one-dimensional and y one-dimensional or a number")
+        if y_values.ndim == 1 and len(y_values) != len(x_values):
+            raise ValueError(f"x and y differ in length: {len(x_values)} != {len(y_values)}")
+        results = operations[operation](x_values, y_values)
+        return BatchCalculationResponse.trusted(operation=operation, count=len(results), results=results.tolist())
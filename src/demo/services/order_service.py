@@ -1,16 +1,228 @@
 """Order service module."""
-from typing import Dict, List, Optional
+import base64
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
-from ..schemas.base import OrderResponse, OrderItem
+from ..schemas.base import OrderResponse, OrderItem, OrderSummary
+from .order_store import IndexKey, InMemoryOrderStore, OrderStore
+
+
+def months_ago(now: datetime, months: int) -> datetime:
+    """
+    Return the same moment ``months`` calendar months earlier.
+    
+    The day is clamped to the length of the target month, e.g. three months
+    before May 31st is February 28th (or 29th).
+    
+    Args:
+        now: Reference time
+        months: Number of months to go back
+    
+    Returns:
+        datetime: Shifted time
+    """
+    month_index = now.year * 12 + now.month - 1 - months
+    year, month = divmod(month_index, 12)
+    month += 1
+    next_month = datetime(year + month // 12, month % 12 + 1, 1)
+    last_day = (next_month - datetime(year, month, 1)).days
+    return now.replace(year=year, month=month, day=min(now.day, last_day))
+
+
+def encode_cursor(key: IndexKey) -> str:
+    """
+    Encode the position after which the next page starts.
+    
+    Args:
+        key: Index key of the last returned order
+    
+    Returns:
+        str: Opaque URL-safe cursor
+    """
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> IndexKey:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+    
+    Args:
+        cursor: Opaque cursor
+    
+    Returns:
+        IndexKey: Index key of the last returned order
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        timestamp, order_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(timestamp), str(order_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def order_total(items: List[Dict]) -> float:
+    """
+    Sum price times quantity over the items of an order.
+    
+    Args:
+        items: Order items holding price and (optionally) quantity
+    
+    Returns:
+        float: Order total
+    """
+    return sum(float(item.get('price', 0.0)) * int(item.get('quantity', 1)) for item in items)
+
+
+def order_to_item(order: Dict) -> OrderItem:
+    """
+    Summarize a stored order as one order row.
+    
+    Args:
+        order: Stored order with ``items`` entries holding product, quantity and price
+    
+    Returns:
+        OrderItem: Row with the product names, total quantity, average unit price and total
+    """
+    items = order['items']
+    quantity = sum(int(item.get('quantity', 1)) for item in items)
+    total = order['total']
+    # Validating a flat row is faster than model_construct in pydantic v2
+    return OrderItem(
+        order_id=order['order_id'],
+        date=order['created_at'],
+        product=", ".join(str(item.get('product', item.get('name', ''))) for item in items),
+        quantity=quantity,
+        price=total / quantity if quantity else 0.0,
+        total=total,
+        status=order['status']
+    )
+
+
+class OrderStream:
+    """
+    A user's order history, fetched page by page while it is iterated.
+    
+    Only one page of orders is in memory at a time, and :attr:`summary` is
+    aggregated by the store without building any order rows, so the first
+    rows and the totals are available long before a large history has been
+    read.
+    """
+    
+    def __init__(
+            self,
+            store: OrderStore,
+            user_id: str,
+            months: int,
+            since_ts: float,
+            page_size: int = 500,
+            limit: Optional[int] = None
+        ):
+        """
+        Initialize the stream; nothing is fetched until it is iterated.
+        
+        Args:
+            store: Order storage backend
+            user_id: User ID
+            months: Number of months the period covers
+            since_ts: Start of the period (Unix time)
+            page_size: Number of orders fetched per query
+            limit: Maximum number of orders to yield; None yields all
+        """
+        self.user_id = user_id
+        self.period = f"Last {months} months"
+        self.page_size = page_size
+        self.limit = limit
+        self._store = store
+        self._since_ts = since_ts
+        self._summary: Optional[OrderSummary] = None
+    
+    @property
+    def summary(self) -> OrderSummary:
+        """Order count, total amount and status breakdown of the whole period."""
+        if self._summary is None:
+            groups = self._store.summarize(self.user_id, self._since_ts)
+            self._summary = OrderSummary(
+                user_id=self.user_id,
+                period=self.period,
+                total_orders=sum(count for count, _ in groups.values()),
+                total_amount=float(sum(total for _, total in groups.values())),
+                status_counts={status: count for status, (count, _) in groups.items()}
+            )
+        return self._summary
+    
+    def pages(self) -> Iterator[List[OrderItem]]:
+        """
+        Yield the orders page by page, newest first.
+        
+        Yields:
+            List[OrderItem]: Up to ``page_size`` orders
+        """
+        remaining = self.limit
+        before = None
+        while remaining is None or remaining > 0:
+            size = self.page_size if remaining is None else min(self.page_size, remaining)
+            page = self._store.page(self.user_id, self._since_ts, before=before, limit=size)
+            if not page:
+                return
+            yield [order_to_item(order) for order in page]
+            if len(page) < size:
+                return
+            before = (page[-1]['created_ts'], page[-1]['order_id'])
+            if remaining is not None:
+                remaining -= len(page)
+    
+    def __iter__(self) -> Iterator[OrderItem]:
+        for page in self.pages():
+            yield from page
+
 
 class OrderService:
     """Service for handling order operations."""
     
-    def __init__(self):
-        """Initialize the order service."""
-        self._orders: Dict[str, Dict] = {}
+    def __init__(self, store: Optional[OrderStore] = None, page_size: int = 500):
+        """
+        Initialize the order service.
         
-    def create_order(self, order_id: str, items: List[Dict], user_id: str) -> OrderResponse:
+        Args:
+            store: Order storage backend; defaults to a process-local
+                :class:`InMemoryOrderStore`. Use ``SQLiteOrderStore`` to keep
+                orders across restarts and share them between processes.
+            page_size: Orders fetched per query by :meth:`stream_recent_orders`
+        """
+        self.store = store if store is not None else InMemoryOrderStore()
+        self.page_size = page_size
+        # Demo orders share one creation time so their cursors stay valid across calls
+        self._demo_created_at = datetime.now()
+    
+    @staticmethod
+    def _new_order(
+            order_id: str,
+            items: List[Dict],
+            user_id: str,
+            created_at: Optional[datetime] = None,
+            status: str = 'created'
+        ) -> Dict:
+        """Build the stored representation of an order."""
+        created_at = created_at or datetime.now()
+        return {
+            'order_id': order_id,
+            'items': items,
+            'user_id': user_id,
+            'status': status,
+            'total': order_total(items),
+            'created_at': created_at.isoformat(),
+            'created_ts': created_at.timestamp()
+        }
+    
+    def create_order(
+            self,
+            order_id: str,
+            items: List[Dict],
+            user_id: str,
+            created_at: Optional[datetime] = None
+        ) -> OrderResponse:
         """
         Create a new order.
         
@@ -18,18 +230,13 @@ class OrderService:
             order_id: Unique order identifier
             items: List of items in the order
             user_id: ID of the user placing the order
-            
+            created_at: Creation time; defaults to now (set it when importing history)
+        
         Returns:
             OrderResponse: Created order details
         """
-        order = {
-            'order_id': order_id,
-            'items': items,
-            'user_id': user_id,
-            'status': 'created',
-            'created_at': datetime.now().isoformat()
-        }
-        self._orders[order_id] = order
+        order = self._new_order(order_id, items, user_id, created_at)
+        self.store.add([order])
         return OrderResponse(
             user_id=user_id,
             period="",
@@ -37,7 +244,7 @@ class OrderService:
             orders=[
                 OrderItem(
                     order_id=order_id,
-                    date=datetime.now().isoformat(),
+                    date=order['created_at'],
                     product="",
                     quantity=0,
                     price=0.0,
@@ -46,18 +253,39 @@ class OrderService:
                 )
             ]
         )
+    
+    def create_orders(self, orders: Iterable[Dict]) -> int:
+        """
+        Create many orders at once, e.g. to import history.
+        
+        All orders are stored in one transaction where the backend supports it.
         
+        Args:
+            orders: Dictionaries with ``order_id``, ``items`` and ``user_id``,
+                and optionally ``created_at`` (datetime) and ``status``
+            
+        Returns:
+            int: Number of orders created
+        """
+        batch = [
+            self._new_order(order['order_id'], order['items'], order['user_id'],
+                            order.get('created_at'), order.get('status', 'created'))
+            for order in orders
+        ]
+        self.store.add(batch)
+        return len(batch)
+    
     def get_order(self, order_id: str) -> Optional[OrderResponse]:
         """
         Retrieve order details by ID.
         
         Args:
             order_id: Order identifier
-            
+        
         Returns:
             Optional[OrderResponse]: Order details if found, None otherwise
         """
-        order = self._orders.get(order_id)
+        order = self.store.get(order_id)
         if order:
             return OrderResponse(
                 user_id=order['user_id'],
@@ -76,35 +304,92 @@ class OrderService:
                 ]
             )
         return None
-
-    def get_recent_orders(self, user_id: str, months: int = 3) -> OrderResponse:
+    
+    def get_recent_orders(
+            self,
+            user_id: str,
+            months: int = 3,
+            limit: Optional[int] = None,
+            offset: int = 0,
+            cursor: Optional[str] = None
+        ) -> OrderResponse:
         """
-        Get recent orders for a user.
+        Get recent orders for a user, newest first.
         
         Args:
             user_id: User ID to get orders for
             months: Number of months to look back
-            
+            limit: Maximum number of orders to return; None returns all
+            offset: Number of orders to skip (applied after the cursor)
+            cursor: ``next_cursor`` of the previous page
+        
         Returns:
-            OrderResponse: Recent order data
-        """
-        # Mock order data
-        orders = [
-            OrderItem(
-                order_id=f"ORD-{i}",
-                date=datetime.now().isoformat(),
-                product=f"Product {i}",
-                quantity=i,
-                price=10.0 * i,
-                total=10.0 * i * i,
-                status="completed"
-            )
-            for i in range(1, 4)
-        ]
+            OrderResponse: Recent order data. ``total_orders`` counts every
+            order in the period; ``next_cursor`` is set when more pages follow.
         
-        return OrderResponse(
+        Raises:
+            ValueError: If the cursor is malformed or limit/offset are negative
+        """
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError(f"limit and offset must not be negative, got {limit} and {offset}")
+        before = decode_cursor(cursor) if cursor is not None else None
+        store, since_ts = self._source(user_id, months)
+        # Fetch one extra order to learn whether another page follows
+        page = store.page(user_id, since_ts, before=before, offset=offset,
+                          limit=None if limit is None else limit + 1)
+        next_cursor = None
+        if limit is not None and len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor((page[-1]['created_ts'], page[-1]['order_id'])) if page else None
+        
+        return OrderResponse.trusted(
             user_id=user_id,
             period=f"Last {months} months",
-            total_orders=len(orders),
-            orders=orders
+            total_orders=store.count_range(user_id, since_ts),
+            orders=[order_to_item(order) for order in page],
+            next_cursor=next_cursor
         )
+    
+    def stream_recent_orders(self, user_id: str, months: int = 3, limit: Optional[int] = None) -> OrderStream:
+        """
+        Get a user's recent orders as a lazily paged stream, newest first.
+        
+        Args:
+            user_id: User ID to get orders for
+            months: Number of months to look back
+            limit: Maximum number of orders to list; None lists all
+            
+        Returns:
+            OrderStream: Orders fetched while iterating, plus an aggregate summary
+        """
+        store, since_ts = self._source(user_id, months)
+        return OrderStream(store, user_id, months, since_ts, self.page_size, limit)
+    
+    def summarize_orders(self, user_id: str, months: int = 3) -> OrderSummary:
+        """
+        Aggregate a user's recent orders without listing them.
+        
+        Args:
+            user_id: User ID
+            months: Number of months to look back
+            
+        Returns:
+            OrderSummary: Order count, sum of totals and status breakdown
+        """
+        return self.stream_recent_orders(user_id, months).summary
+    
+    def _source(self, user_id: str, months: int) -> Tuple[OrderStore, float]:
+        """Return the store and period start to read from; demo orders while no order has been created."""
+        if self.store.is_empty():
+            return self._demo_store(user_id), 0.0
+        return self.store, months_ago(datetime.now(), months).timestamp()
+    
+    def _demo_store(self, user_id: str) -> InMemoryOrderStore:
+        """Build the demo orders of a user, paged like stored orders."""
+        store = InMemoryOrderStore()
+        store.add([
+            self._new_order(f"ORD-{i}", [{'product': f"Product {i}", 'quantity': i, 'price': 10.0 * i}],
+                            user_id, created_at=self._demo_created_at, status="completed")
+            for i in range(1, 4)
+        ])
+        return store
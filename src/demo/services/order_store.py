@@ -0,0 +1,374 @@
+"""Storage backends for OrderService."""
+import bisect
+import json
+import os
+import queue
+import shutil
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+# Position of an order in a user's history: (created_at timestamp, order_id)
+IndexKey = Tuple[float, str]
+
+
+class OrderStore(Protocol):
+    """
+    Storage interface used by :class:`OrderService`.
+
+    Orders are plain dictionaries with ``order_id``, ``user_id``, ``items``,
+    ``status``, ``total``, ``created_at`` (ISO string) and ``created_ts``
+    (Unix time).
+    """
+
+    def add(self, orders: Sequence[Dict]) -> None:
+        """Insert or replace orders, all or nothing."""
+        ...
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        """Return one order or None."""
+        ...
+
+    def is_empty(self) -> bool:
+        """Whether no order has been stored."""
+        ...
+
+    def count_range(self, user_id: str, since_ts: float) -> int:
+        """Count a user's orders created at or after ``since_ts``."""
+        ...
+
+    def page(self, user_id: str, since_ts: float, before: Optional[IndexKey] = None,
+             offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Return a user's orders created at or after ``since_ts``, newest first."""
+        ...
+
+    def summarize(self, user_id: str, since_ts: float) -> Dict[str, Tuple[int, float]]:
+        """Return ``status -> (order count, sum of total)`` over a user's orders since ``since_ts``."""
+        ...
+
+
+class InMemoryOrderStore:
+    """
+    Process-local order table with a per-user time index.
+
+    Every user has a list of ``(created_ts, order_id)`` keys kept sorted on
+    insert, so time-range queries are two binary searches regardless of how
+    many orders exist.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._orders: Dict[str, Dict] = {}
+        self._user_index: Dict[str, List[IndexKey]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, orders: Sequence[Dict]) -> None:
+        """
+        Insert or replace orders.
+
+        Args:
+            orders: Orders to store.
+        """
+        with self._lock:
+            order_ids = {order['order_id'] for order in orders}
+            if len(orders) < 2 or len(order_ids) < len(orders) or not order_ids.isdisjoint(self._orders):
+                for order in orders:
+                    self._insert(order)
+                return
+            # Bulk import of new orders: append everything, then sort each touched index once
+            touched = set()
+            for order in orders:
+                self._orders[order['order_id']] = order
+                self._user_index.setdefault(order['user_id'], []).append((order['created_ts'], order['order_id']))
+                touched.add(order['user_id'])
+            for user_id in touched:
+                self._user_index[user_id].sort()
+
+    def _insert(self, order: Dict) -> None:
+        previous = self._orders.get(order['order_id'])
+        if previous is not None:
+            self._unindex(previous)
+        self._orders[order['order_id']] = order
+        # Orders usually arrive in time order, which makes this an append
+        bisect.insort(self._user_index.setdefault(order['user_id'], []), (order['created_ts'], order['order_id']))
+
+    def _unindex(self, order: Dict) -> None:
+        keys = self._user_index.get(order['user_id'], [])
+        key = (order['created_ts'], order['order_id'])
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        """
+        Look up an order.
+
+        Args:
+            order_id: Order identifier.
+
+        Returns:
+            The order, or None if unknown.
+        """
+        return self._orders.get(order_id)
+
+    def is_empty(self) -> bool:
+        """Whether no order has been stored."""
+        return not self._orders
+
+    def _bounds(self, user_id: str, since_ts: float) -> Tuple[List[IndexKey], int]:
+        keys = self._user_index.get(user_id, [])
+        return keys, bisect.bisect_left(keys, (since_ts, ""))
+
+    def count_range(self, user_id: str, since_ts: float) -> int:
+        """
+        Count a user's orders created at or after ``since_ts``.
+
+        Args:
+            user_id: User ID.
+            since_ts: Start of the range (Unix time, inclusive).
+
+        Returns:
+            Number of orders.
+        """
+        keys, lo = self._bounds(user_id, since_ts)
+        return len(keys) - lo
+
+    def page(self, user_id: str, since_ts: float, before: Optional[IndexKey] = None,
+             offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Return a user's orders created at or after ``since_ts``, newest first.
+
+        Args:
+            user_id: User ID.
+            since_ts: Start of the range (Unix time, inclusive).
+            before: Only return orders strictly older than this key.
+            offset: Number of orders to skip.
+            limit: Maximum number of orders; None returns all.
+
+        Returns:
+            Orders, newest first.
+        """
+        with self._lock:
+            keys, lo = self._bounds(user_id, since_ts)
+            hi = len(keys) if before is None else max(lo, bisect.bisect_left(keys, before))
+            hi = max(lo, hi - offset)
+            start = lo if limit is None else max(lo, hi - limit)
+            return [self._orders[order_id] for _, order_id in reversed(keys[start:hi])]
+
+    def summarize(self, user_id: str, since_ts: float) -> Dict[str, Tuple[int, float]]:
+        """
+        Aggregate a user's orders created at or after ``since_ts`` by status.
+
+        Args:
+            user_id: User ID.
+            since_ts: Start of the range (Unix time, inclusive).
+
+        Returns:
+            ``status -> (order count, sum of total)``.
+        """
+        counts: Dict[str, int] = {}
+        totals: Dict[str, float] = {}
+        with self._lock:
+            keys, lo = self._bounds(user_id, since_ts)
+            for _, order_id in keys[lo:]:
+                order = self._orders[order_id]
+                status = order['status']
+                counts[status] = counts.get(status, 0) + 1
+                totals[status] = totals.get(status, 0.0) + order['total']
+        return {status: (count, totals[status]) for status, count in counts.items()}
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    order_id   TEXT PRIMARY KEY,
+    user_id    TEXT NOT NULL,
+    created_ts REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    items      TEXT NOT NULL,
+    total      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_user_created ON orders (user_id, created_ts, order_id);
+"""
+
+# Constant statement texts, so sqlite3's per-connection statement cache
+# prepares each of them once
+_INSERT = ("INSERT OR REPLACE INTO orders (order_id, user_id, created_ts, created_at, status, items, total) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_SELECT_ONE = "SELECT order_id, user_id, created_ts, created_at, status, items, total FROM orders WHERE order_id = ?"
+_SELECT_ANY = "SELECT 1 FROM orders LIMIT 1"
+_COUNT_RANGE = "SELECT COUNT(*) FROM orders WHERE user_id = ? AND created_ts >= ?"
+_SUMMARY = ("SELECT status, COUNT(*), COALESCE(SUM(total), 0) FROM orders "
+            "WHERE user_id = ? AND created_ts >= ? GROUP BY status")
+_PAGE = ("SELECT order_id, user_id, created_ts, created_at, status, items, total FROM orders "
+         "WHERE user_id = ? AND created_ts >= ? ORDER BY created_ts DESC, order_id DESC LIMIT ? OFFSET ?")
+_PAGE_BEFORE = ("SELECT order_id, user_id, created_ts, created_at, status, items, total FROM orders "
+                "WHERE user_id = ? AND created_ts >= ? AND (created_ts, order_id) < (?, ?) "
+                "ORDER BY created_ts DESC, order_id DESC LIMIT ? OFFSET ?")
+
+
+def _row_to_order(row: Tuple) -> Dict:
+    order_id, user_id, created_ts, created_at, status, items, total = row
+    return {
+        'order_id': order_id,
+        'items': json.loads(items),
+        'user_id': user_id,
+        'status': status,
+        'total': total,
+        'created_at': created_at,
+        'created_ts': created_ts
+    }
+
+
+class SQLiteOrderStore:
+    """
+    Persistent order table in an embedded SQLite database.
+
+    The database runs in WAL mode, so readers never block the writer and
+    several processes can share one file. Writes go through a single
+    connection under a lock; reads borrow a connection from a small pool.
+    Range queries use the ``(user_id, created_ts, order_id)`` index.
+    """
+
+    def __init__(self, path: str = "orders.db", read_pool_size: int = 4, timeout: float = 30.0):
+        """
+        Open (and create if needed) the database.
+
+        Args:
+            path: Database file; ``":memory:"`` keeps a private database in a
+                temporary directory that :meth:`close` removes. (SQLite's
+                shared-cache in-memory databases use table locks instead of
+                WAL, so their readers fail while a write is in progress.)
+            read_pool_size: Number of pooled read connections.
+            timeout: Seconds to wait for a lock held by another process.
+        """
+        self._temp_dir: Optional[str] = None
+        if path == ":memory:":
+            self._temp_dir = tempfile.mkdtemp(prefix="orders-")
+            self._target = os.path.join(self._temp_dir, "orders.db")
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._target = path
+        self.path = path
+        self._timeout = timeout
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.executescript(_SCHEMA)
+        self._write_lock = threading.Lock()
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(read_pool_size):
+            self._readers.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._target, timeout=self._timeout,
+                                     check_same_thread=False, cached_statements=64)
+        # WAL makes NORMAL durable against application crashes; only an OS
+        # crash can lose the last transactions
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        connection = self._readers.get()
+        try:
+            yield connection
+        finally:
+            self._readers.put(connection)
+
+    def add(self, orders: Sequence[Dict]) -> None:
+        """
+        Insert or replace orders in one transaction.
+
+        Args:
+            orders: Orders to store.
+        """
+        rows = [
+            (order['order_id'], order['user_id'], order['created_ts'], order['created_at'],
+             order['status'], json.dumps(order['items'], ensure_ascii=False), order['total'])
+            for order in orders
+        ]
+        with self._write_lock, self._writer:
+            self._writer.executemany(_INSERT, rows)
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        """
+        Look up an order.
+
+        Args:
+            order_id: Order identifier.
+
+        Returns:
+            The order, or None if unknown.
+        """
+        with self._reader() as connection:
+            row = connection.execute(_SELECT_ONE, (order_id,)).fetchone()
+        return _row_to_order(row) if row else None
+
+    def is_empty(self) -> bool:
+        """Whether no order has been stored."""
+        with self._reader() as connection:
+            return connection.execute(_SELECT_ANY).fetchone() is None
+
+    def count_range(self, user_id: str, since_ts: float) -> int:
+        """
+        Count a user's orders created at or after ``since_ts``.
+
+        Args:
+            user_id: User ID.
+            since_ts: Start of the range (Unix time, inclusive).
+
+        Returns:
+            Number of orders.
+        """
+        with self._reader() as connection:
+            return connection.execute(_COUNT_RANGE, (user_id, since_ts)).fetchone()[0]
+
+    def page(self, user_id: str, since_ts: float, before: Optional[IndexKey] = None,
+             offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Return a user's orders created at or after ``since_ts``, newest first.
+
+        Args:
+            user_id: User ID.
+            since_ts: Start of the range (Unix time, inclusive).
+            before: Only return orders strictly older than this key.
+            offset: Number of orders to skip.
+            limit: Maximum number of orders; None returns all.
+
+        Returns:
+            Orders, newest first.
+        """
+        limit = -1 if limit is None else limit  # SQLite: negative LIMIT means no limit
+        with self._reader() as connection:
+            if before is None:
+                rows = connection.execute(_PAGE, (user_id, since_ts, limit, offset)).fetchall()
+            else:
+                rows = connection.execute(_PAGE_BEFORE, (user_id, since_ts, *before, limit, offset)).fetchall()
+        return [_row_to_order(row) for row in rows]
+
+    def summarize(self, user_id: str, since_ts: float) -> Dict[str, Tuple[int, float]]:
+        """
+        Aggregate a user's orders created at or after ``since_ts`` by status, inside SQLite.
+
+        Args:
+            user_id: User ID.
+            since_ts: Start of the range (Unix time, inclusive).
+
+        Returns:
+            ``status -> (order count, sum of total)``.
+        """
+        with self._reader() as connection:
+            rows = connection.execute(_SUMMARY, (user_id, since_ts)).fetchall()
+        return {status: (count, total) for status, count, total in rows}
+
+    def close(self) -> None:
+        """Close every connection and remove the temporary database, if any."""
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        self._writer.close()
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
@@ -1,17 +1,56 @@
 """Package service module."""
+from collections import OrderedDict
 from typing import Dict, List, Optional
 import uuid
-import qrcode
-import os
 from urllib.parse import urlencode
 from ..schemas.base import Package, PackageResponse
+from .qr_renderer import QRImage, QRRenderer
+from .qr_store import QRStore
+
+QR_MODES = ("background", "memory", "lazy", "sync")
 
 class PackageService:
     """Service for managing package operations."""
     
-    def __init__(self):
-        """Initialize the package service."""
+    def __init__(
+            self,
+            renderer: Optional[QRRenderer] = None,
+            store: Optional[QRStore] = None,
+            qr_mode: str = "background",
+            qr_format: str = "png",
+            output_dir: str = "qrcodes",
+            max_qr_images: int = 256
+        ):
+        """
+        Initialize the package service.
+        
+        Args:
+            renderer: QR renderer; defaults to a small private thread pool.
+            store: Content-addressed store the QR code files are kept in;
+                defaults to one rooted at ``output_dir``.
+            qr_mode: How payment QR codes are produced:
+                ``"background"`` writes the file on the renderer pool,
+                ``"memory"`` renders bytes on the pool without a file,
+                ``"lazy"`` renders bytes only when first fetched and
+                ``"sync"`` writes the file before returning.
+            qr_format: ``"png"`` or ``"svg"``.
+            output_dir: Root directory of the QR code store.
+            max_qr_images: How many recent QR handles are kept for
+                :meth:`get_qr_image`.
+            
+        Raises:
+            ValueError: If qr_mode is unknown.
+        """
+        if qr_mode not in QR_MODES:
+            raise ValueError(f"Unsupported QR mode: {qr_mode}")
         self._packages: Dict[str, Dict] = {}
+        self.renderer = renderer or QRRenderer()
+        self.qr_mode = qr_mode
+        self.qr_format = qr_format
+        self.output_dir = output_dir
+        self.store = store or QRStore(output_dir, renderer=self.renderer)
+        self.max_qr_images = max_qr_images
+        self._qr_images: "OrderedDict[str, QRImage]" = OrderedDict()
         self.base_features = [
             "基础功能访问",
             "在线文档",
@@ -51,32 +90,65 @@ class PackageService:
             price = len(features) * 100.0 * duration  # Basic pricing
             
         package_id = str(uuid.uuid4())
+        # Coerce the numbers for direct callers; the response embeds the
+        # validated package without validating it again
         package = Package(
             id=package_id,
-            name=name,
-            price=price,
-            duration=duration,
-            features=features
+            name=str(name),
+            price=float(price),
+            duration=int(duration),
+            features=list(features)
         )
         
-        # Generate QR code
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
         payment_data = {
-            'id': package_id,
             'amount': price,
             'description': f"{name} Package for {duration} months"
         }
-        qr.add_data(urlencode(payment_data))
-        qr.make(fit=True)
-        
-        qr_file = f"qrcodes/package_{package_id}.png"
-        img = qr.make_image(fill_color="black", back_color="white")
-        img.save(qr_file)
+        # The QR code encodes only the payment content, so identical packages
+        # share one stored image; the id stays in the handle mapping and the URL
+        qr_image = self._render_qr(package_id, urlencode(payment_data))
+        qr_file = qr_image.path
         
-        payment_url = f"https://example.com/pay?{urlencode(payment_data)}"
+        payment_url = f"https://example.com/pay?{urlencode({'id': package_id, **payment_data})}"
         
-        return PackageResponse(
+        return PackageResponse.trusted(
             package=package,
             qr_file=qr_file,
             payment_url=payment_url
         )
+    
+    def _render_qr(self, package_id: str, payload: str) -> QRImage:
+        """
+        Start (or defer) rendering the payment QR code of a package.
+        
+        Args:
+            package_id: Package identifier.
+            payload: Encoded payment data.
+            
+        Returns:
+            QRImage handle, also kept for :meth:`get_qr_image`.
+        """
+        if self.qr_mode == "lazy":
+            image = self.renderer.defer(payload, self.qr_format)
+        elif self.qr_mode == "memory":
+            image = self.renderer.submit(payload, self.qr_format)
+        else:
+            # Identical payloads map to the same stored file and render once
+            image = self.store.get(payload, self.qr_format, background=self.qr_mode == "background")
+        self._qr_images[package_id] = image
+        while len(self._qr_images) > self.max_qr_images:
+            self._qr_images.popitem(last=False)
+        return image
+    
+    def get_qr_image(self, package_id: str) -> Optional[QRImage]:
+        """
+        Return the QR code handle of a recently created package.
+        
+        Args:
+            package_id: Package identifier.
+            
+        Returns:
+            Optional[QRImage]: Handle whose ``bytes()`` returns the image, or
+            None if the package is unknown or its handle was evicted.
+        """
+        return self._qr_images.get(package_id)
@@ -1,16 +1,68 @@
 """QPS服务模块"""
 from datetime import datetime, timedelta
-from typing import List
-import random
+from typing import Optional
 import numpy as np
-from ..models.qps import QPSData, QPSResponse
+from ..core.qps_counter import RingBufferQPSCounter
+from ..models.qps import QPSResponse
+
+# 指数移动平均分块计算时，块内累积衰减的对数下限（避免浮点下溢）
+_EMA_LOG_DECAY_LIMIT = 500.0
+_EMA_MAX_BLOCK = 4096
+
+
+def _exponential_moving_average(values: np.ndarray, alphas: np.ndarray, initial: float) -> np.ndarray:
+    """
+    向量化计算变系数指数移动平均 c[i] = (1 - a[i]) * c[i-1] + a[i] * v[i]
+    
+    利用闭式解 c[j] = P[j] * (c0 + sum(a[i] * v[i] / P[i]))，其中 P 为累积衰减，
+    按块计算以保证 P 不会下溢。
+    
+    Args:
+        values: 每个点的目标值
+        alphas: 每个点的平滑系数，取值 [0, 1]
+        initial: 初始值 c[-1]
+        
+    Returns:
+        np.ndarray: 平滑后的序列
+    """
+    result = np.empty_like(values, dtype=np.float64)
+    decay = 1.0 - alphas
+    current = initial
+    start = 0
+    while start < len(values):
+        block = decay[start:start + _EMA_MAX_BLOCK]
+        with np.errstate(divide="ignore"):
+            log_decay = np.cumsum(np.log(block))
+        size = int(np.searchsorted(-log_decay, _EMA_LOG_DECAY_LIMIT, side="right"))
+        if size == 0:
+            # 该点衰减过强（如 alpha = 1），直接递推一步
+            current = decay[start] * current + alphas[start] * values[start]
+            result[start] = current
+            start += 1
+            continue
+        stop = start + size
+        cumulative = np.exp(log_decay[:size])
+        weighted = np.cumsum(alphas[start:stop] * values[start:stop] / cumulative)
+        result[start:stop] = cumulative * (current + weighted)
+        current = result[stop - 1]
+        start = stop
+    return result
+
 
 class QPSService:
     """处理QPS相关操作的服务类"""
     
-    def __init__(self):
-        """初始化QPS服务"""
-        self.base_qps = random.uniform(10, 50)  # 基础QPS值
+    def __init__(self, backend: Optional[RingBufferQPSCounter] = None, seed: Optional[int] = None):
+        """
+        初始化QPS服务
+        
+        Args:
+            backend: 真实的QPS计数后端；为 None 时返回模拟数据
+            seed: 模拟数据的随机种子，相同种子生成相同数据
+        """
+        self.backend = backend
+        self._rng = np.random.default_rng(seed)
+        self.base_qps = self._rng.uniform(10, 50)  # 基础QPS值
         self.last_update = datetime.now()
         self.current_qps = self.base_qps
         
@@ -38,11 +90,11 @@ class QPSService:
             time_factor = 0.5
             
         # 随机波动 (±20%)
-        noise = random.uniform(0.8, 1.2)
+        noise = self._rng.uniform(0.8, 1.2)
         
         # 突发流量 (5%概率出现突发，流量增加50%-150%)
-        if random.random() < 0.05:
-            burst = random.uniform(1.5, 2.5)
+        if self._rng.random() < 0.05:
+            burst = self._rng.uniform(1.5, 2.5)
         else:
             burst = 1.0
             
@@ -59,6 +111,57 @@ class QPSService:
             
         return round(self.current_qps, 2)
         
+    def _generate_realistic_qps_batch(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        向量化版本的 _generate_realistic_qps，一次生成整个时间序列
+        
+        时间因子、随机波动、突发流量和指数移动平均都在 NumPy 数组上计算，
+        与逐点生成在统计上一致。
+        
+        Args:
+            timestamps: 递增的时间点数组（datetime64）
+            
+        Returns:
+            np.ndarray: 每个时间点的QPS值
+        """
+        count = len(timestamps)
+        if count == 0:
+            return np.empty(0)
+        
+        # 时间周期性因子 (0.5 到 1.5)，早上9点到晚上10点是高峰期
+        hours = (timestamps.astype("datetime64[h]") - timestamps.astype("datetime64[D]")).astype(np.int64)
+        peak = (hours >= 9) & (hours <= 22)
+        time_factor = np.where(peak, 1.0 + 0.5 * np.sin(np.pi * (hours - 9) / 13), 0.5)
+        
+        # 随机波动 (±20%) 与突发流量 (5%概率，流量增加50%-150%)
+        noise = self._rng.uniform(0.8, 1.2, count)
+        burst = np.where(self._rng.random(count) < 0.05, self._rng.uniform(1.5, 2.5, count), 1.0)
+        qps = self.base_qps * time_factor * noise * burst
+        
+        # 只有晚于上次更新的时间点才参与平滑（与逐点生成一致）
+        seconds = (timestamps - np.datetime64(self.last_update, "us")) / np.timedelta64(1, "s")
+        active = seconds > 0
+        smoothed = np.full(count, self.current_qps)
+        if active.any():
+            elapsed = seconds[active]
+            time_diff = np.diff(elapsed, prepend=0.0)
+            alphas = np.minimum(1.0, time_diff / 60)  # 一分钟内完成过渡
+            smoothed[active] = _exponential_moving_average(qps[active], alphas, self.current_qps)
+            self.current_qps = float(smoothed[-1])
+            self.last_update = timestamps[-1].astype(datetime)
+        
+        return np.round(smoothed, 2)
+        
+    def record_request(self, count: int = 1) -> None:
+        """
+        记录请求，仅在配置了计数后端时生效
+        
+        Args:
+            count: 请求数量
+        """
+        if self.backend is not None:
+            self.backend.record(count)
+        
     def calculate_qps(self, time_window_minutes: int = 5, data_points: int = 10) -> QPSResponse:
         """
         计算指定时间窗口内的QPS数据
@@ -70,26 +173,22 @@ class QPSService:
         Returns:
             QPSResponse: 包含QPS数据的响应对象
         """
+        if self.backend is not None:
+            return self.backend.calculate_qps(time_window_minutes, data_points)
+        
         end_time = datetime.now()
         start_time = end_time - timedelta(minutes=time_window_minutes)
         
         # 创建时间点
-        timestamps = [
-            start_time + timedelta(seconds=i * (time_window_minutes * 60 / data_points))
-            for i in range(data_points)
-        ]
-        
-        # 生成QPS数据
-        qps_data = []
-        for ts in timestamps:
-            qps = self._generate_realistic_qps(ts)
-            qps_data.append(QPSData(
-                timestamp=ts,
-                qps_value=qps
-            ))
+        step = np.timedelta64(int(time_window_minutes * 60 / data_points * 1e6), "us")
+        timestamps = np.datetime64(start_time, "us") + np.arange(data_points) * step
+        
+        # 生成QPS数据（列式存储，不逐点创建对象）
+        values = self._generate_realistic_qps_batch(timestamps)
         
         return QPSResponse(
             status="success",
             message="QPS数据获取成功",
-            data=qps_data
+            timestamps=timestamps,
+            values=values
         )
@@ -0,0 +1,284 @@
+"""QR code rendering off the request path."""
+import asyncio
+import io
+import os
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import qrcode
+import qrcode.image.svg
+
+FORMATS = ("png", "svg")
+
+
+def render_qr(payload: str, fmt: str = "png", box_size: int = 10, border: int = 5) -> bytes:
+    """
+    Encode and rasterize a QR code.
+
+    A plain module-level function so it can also run in a process pool.
+
+    Args:
+        payload: Data to encode.
+        fmt: ``"png"`` or ``"svg"``.
+        box_size: Pixels per module (PNG) or relative module size (SVG).
+        border: Quiet zone width in modules.
+
+    Returns:
+        Encoded image.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported QR format: {fmt}")
+    qr = qrcode.QRCode(version=1, box_size=box_size, border=border)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    if fmt == "svg":
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Write a file so readers never observe a partial image.
+
+    Args:
+        path: Destination file.
+        data: File contents.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _render_to_file(payload: str, path: str, fmt: str, box_size: int, border: int) -> bytes:
+    data = render_qr(payload, fmt, box_size, border)
+    write_atomic(path, data)
+    return data
+
+
+class QRImage:
+    """
+    Handle of a QR code that is being, or will be, rendered.
+
+    Rendering either runs in the renderer's pool (``future`` is set) or is
+    deferred until the first :meth:`bytes` call. A handle with ``stored``
+    set points at a file that already exists and is read instead.
+    """
+
+    def __init__(self, renderer: "QRRenderer", payload: str, fmt: str,
+                 path: Optional[str] = None, future: Optional[Future] = None, stored: bool = False):
+        """
+        Initialize the handle; use :meth:`QRRenderer.submit` or :meth:`QRRenderer.defer`.
+
+        Args:
+            renderer: Renderer that produces the image.
+            payload: Data encoded in the QR code.
+            fmt: Image format.
+            path: File the image is written to, or None to keep it in memory.
+            future: Pending pool render, or None for a deferred render.
+            stored: ``path`` already holds the rendered image.
+        """
+        self.payload = payload
+        self.fmt = fmt
+        self.path = path
+        self._renderer = renderer
+        self._future = future
+        self._stored = stored
+        self._data: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    @property
+    def media_type(self) -> str:
+        """MIME type of the image."""
+        return "image/svg+xml" if self.fmt == "svg" else "image/png"
+
+    def done(self) -> bool:
+        """Whether the image is available without waiting."""
+        if self._data is not None or self._stored:
+            return True
+        return self._future is not None and self._future.done()
+
+    def add_done_callback(self, fn: Callable[["QRImage"], None]) -> None:
+        """
+        Call ``fn(self)`` when a pool render finishes, or right away for other handles.
+
+        Args:
+            fn: Callback taking the handle.
+        """
+        if self._future is None:
+            fn(self)
+        else:
+            self._future.add_done_callback(lambda _: fn(self))
+
+    def bytes(self, timeout: Optional[float] = None) -> bytes:
+        """
+        Return the encoded image, rendering it now if it was deferred.
+
+        Args:
+            timeout: Seconds to wait for a pool render.
+
+        Returns:
+            Encoded image.
+        """
+        if self._data is not None:
+            return self._data
+        if self._future is not None:
+            return self._future.result(timeout)
+        with self._lock:
+            if self._data is None:
+                if self._stored:
+                    try:
+                        with open(self.path, "rb") as f:
+                            self._data = f.read()
+                    except FileNotFoundError:
+                        # Collected by the store since the handle was created; render it again
+                        self._data = self._renderer.render(self.payload, self.fmt, self.path)
+                else:
+                    self._data = self._renderer.render(self.payload, self.fmt, self.path)
+        return self._data
+
+    async def abytes(self) -> bytes:
+        """
+        Asynchronous version of :meth:`bytes`.
+
+        Returns:
+            Encoded image.
+        """
+        if self._future is not None:
+            return await asyncio.wrap_future(self._future)
+        return await asyncio.to_thread(self.bytes)
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait until the image exists, e.g. before serving its file.
+
+        Args:
+            timeout: Seconds to wait for a pool render.
+
+        Returns:
+            File path, or None for in-memory images.
+        """
+        data = self.bytes(timeout)
+        if self.path is not None and not os.path.exists(self.path):
+            # The store's collector removed the file after it was written
+            write_atomic(self.path, data)
+        return self.path
+
+
+class QRRenderer:
+    """
+    Renders QR codes on a bounded worker pool.
+
+    At most ``max_pending`` renders are queued or running; further
+    submissions block until one finishes, so a burst cannot grow the queue
+    (and memory) without limit.
+    """
+
+    def __init__(
+            self,
+            max_workers: int = 2,
+            max_pending: int = 64,
+            box_size: int = 10,
+            border: int = 5,
+            executor: Optional[Executor] = None
+        ):
+        """
+        Initialize the renderer.
+
+        Args:
+            max_workers: Size of the default thread pool.
+            max_pending: Maximum number of renders queued or running.
+            box_size: Pixels per module.
+            border: Quiet zone width in modules.
+            executor: Pool to render on instead of a private thread pool,
+                e.g. a ``ProcessPoolExecutor`` for CPU parallelism.
+        """
+        self.box_size = box_size
+        self.border = border
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="qr-render")
+        self._owns_executor = executor is None
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def render(self, payload: str, fmt: str = "png", path: Optional[str] = None) -> bytes:
+        """
+        Render synchronously in the calling thread.
+
+        Args:
+            payload: Data to encode.
+            fmt: ``"png"`` or ``"svg"``.
+            path: File to write the image to, or None.
+
+        Returns:
+            Encoded image.
+        """
+        if path is None:
+            return render_qr(payload, fmt, self.box_size, self.border)
+        return _render_to_file(payload, path, fmt, self.box_size, self.border)
+
+    def submit(self, payload: str, fmt: str = "png", path: Optional[str] = None) -> QRImage:
+        """
+        Render on the pool and return immediately.
+
+        Args:
+            payload: Data to encode.
+            fmt: ``"png"`` or ``"svg"``.
+            path: File to write the image to, or None to keep it in memory.
+
+        Returns:
+            QRImage whose bytes become available when the render finishes.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported QR format: {fmt}")
+        self._slots.acquire()
+        try:
+            if path is None:
+                future = self._executor.submit(render_qr, payload, fmt, self.box_size, self.border)
+            else:
+                future = self._executor.submit(_render_to_file, payload, path, fmt, self.box_size, self.border)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return QRImage(self, payload, fmt, path=path, future=future)
+
+    def defer(self, payload: str, fmt: str = "png", path: Optional[str] = None) -> QRImage:
+        """
+        Return a handle that renders on first access.
+
+        Args:
+            payload: Data to encode.
+            fmt: ``"png"`` or ``"svg"``.
+            path: File to write the image to when rendered, or None.
+
+        Returns:
+            QRImage rendering lazily in the thread that fetches it.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported QR format: {fmt}")
+        return QRImage(self, payload, fmt, path=path)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the private pool.
+
+        Args:
+            wait: Whether to wait for pending renders.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
@@ -0,0 +1,219 @@
+"""Content-addressed QR code storage with bounded size and age."""
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .qr_renderer import FORMATS, QRImage, QRRenderer
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+class QRStore:
+    """
+    Stores rendered QR codes under a hash of what they encode.
+
+    Images live at ``{root}/{h[0:2]}/{h[2:4]}/{h}.{fmt}``, where ``h`` is the
+    SHA-256 of the payload and the render settings, so identical payloads
+    are rendered once and later requests are cache hits. Files are written
+    atomically, concurrent requests for the same payload share one render,
+    and a garbage collector keeps the store within ``max_bytes`` and
+    ``max_age_seconds``. Only the shard directories are managed; other
+    files under ``root`` are left alone.
+    """
+
+    def __init__(
+            self,
+            root: str = "qrcodes",
+            renderer: Optional[QRRenderer] = None,
+            shard_depth: int = 2,
+            max_bytes: Optional[int] = 64 * 1024 * 1024,
+            max_age_seconds: Optional[float] = 7 * 24 * 3600,
+            gc_every: int = 256
+        ):
+        """
+        Initialize the store.
+
+        Args:
+            root: Root directory.
+            renderer: Renderer used on cache misses; defaults to a private one.
+            shard_depth: Number of two-character directory levels.
+            max_bytes: Total size the garbage collector trims the store to;
+                None disables the size bound.
+            max_age_seconds: Files not used for longer are removed; None
+                disables the age bound.
+            gc_every: Run the garbage collector in the background after this
+                many new files; 0 disables automatic collection.
+        """
+        self.root = root
+        self.renderer = renderer or QRRenderer()
+        self.shard_depth = shard_depth
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.gc_every = gc_every
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[str, QRImage] = {}
+        self._writes_since_gc = 0
+        self._gc_running = False
+        self._lock = threading.Lock()
+
+    def key(self, payload: str, fmt: str = "png") -> str:
+        """
+        Return the content address of a payload rendered with this store's settings.
+
+        Args:
+            payload: Data to encode.
+            fmt: Image format.
+
+        Returns:
+            Hex digest.
+        """
+        settings = f"{fmt}:{self.renderer.box_size}:{self.renderer.border}:"
+        return hashlib.sha256((settings + payload).encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, fmt: str = "png") -> str:
+        """
+        Return the file path of a key.
+
+        Args:
+            key: Content address from :meth:`key`.
+            fmt: Image format.
+
+        Returns:
+            Sharded file path.
+        """
+        shards = [key[2 * level:2 * level + 2] for level in range(self.shard_depth)]
+        return os.path.join(self.root, *shards, f"{key}.{fmt}")
+
+    def get(self, payload: str, fmt: str = "png", background: bool = True) -> QRImage:
+        """
+        Return the stored image of a payload, rendering it on a miss.
+
+        Args:
+            payload: Data to encode.
+            fmt: ``"png"`` or ``"svg"``.
+            background: Render misses on the renderer pool instead of in the
+                calling thread.
+
+        Returns:
+            QRImage whose ``path`` is the stored file.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported QR format: {fmt}")
+        key = self.key(payload, fmt)
+        path = self.path_for(key, fmt)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.hits += 1
+                return pending
+        if self._touch(path):
+            with self._lock:
+                self.hits += 1
+            return QRImage(self.renderer, payload, fmt, path=path, stored=True)
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.hits += 1
+                return pending
+            self.misses += 1
+            image = (self.renderer.submit if background else self.renderer.defer)(payload, fmt, path)
+            self._pending[key] = image
+        if background:
+            image.add_done_callback(lambda _: self._finished(key))
+            return image
+        try:
+            image.bytes()
+        finally:
+            self._finished(key)
+        return image
+
+    @staticmethod
+    def _touch(path: str) -> bool:
+        # Refresh the modification time so the collector evicts least recently used files
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _finished(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+            self._writes_since_gc += 1
+            start_gc = bool(self.gc_every) and self._writes_since_gc >= self.gc_every and not self._gc_running
+            if start_gc:
+                self._writes_since_gc = 0
+                self._gc_running = True
+        if start_gc:
+            threading.Thread(target=self._background_gc, name="qr-store-gc", daemon=True).start()
+
+    def _background_gc(self) -> None:
+        try:
+            self.gc()
+        finally:
+            with self._lock:
+                self._gc_running = False
+
+    def _files(self) -> List[Tuple[float, int, str]]:
+        files = []
+        for directory, subdirs, names in os.walk(self.root):
+            if directory == self.root:
+                # Only descend into shard directories
+                subdirs[:] = [name for name in subdirs if len(name) == 2 and set(name) <= _HEX_DIGITS]
+                continue
+            for name in names:
+                try:
+                    stat = os.stat(os.path.join(directory, name))
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, os.path.join(directory, name)))
+        return files
+
+    def gc(self, max_bytes: Optional[int] = None, max_age_seconds: Optional[float] = None) -> Dict[str, int]:
+        """
+        Remove expired files, then the least recently used until within the size bound.
+
+        Args:
+            max_bytes: Overrides the store's size bound.
+            max_age_seconds: Overrides the store's age bound.
+
+        Returns:
+            Dictionary with the number of removed files, freed bytes and the
+            remaining file count and size.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age_seconds = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        cutoff = time.time() - max_age_seconds if max_age_seconds is not None else None
+        removed = freed = 0
+        for mtime, size, path in files:
+            expired = cutoff is not None and mtime < cutoff
+            oversized = max_bytes is not None and total > max_bytes
+            if not (expired or oversized):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+            freed += size
+        return {"removed": removed, "freed_bytes": freed, "files": len(files) - removed, "bytes": total}
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report cache effectiveness.
+
+        Returns:
+            Dictionary with hits, misses and hit_rate.
+        """
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
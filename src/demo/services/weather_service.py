@@ -1,26 +1,245 @@
 """Weather service module."""
-from typing import List
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Protocol, Sequence
 from ..schemas.base import WeatherResponse
+from ..core.cache import CacheBackend, InMemoryCacheBackend, normalize_query
+
+UNITS = ("celsius", "fahrenheit")
+
+
+class WeatherProvider(Protocol):
+    """Upstream source of current weather."""
+    
+    def fetch(self, location: str) -> Dict[str, Any]:
+        """
+        Fetch the current weather of a location.
+        
+        Args:
+            location: Location as requested by the caller
+        
+        Returns:
+            Dict[str, Any]: ``temperature_c`` (float, Celsius) and ``forecast`` (list of str)
+        """
+        ...
+
+
+class MockWeatherProvider:
+    """Provider returning fixed weather, optionally after a simulated round-trip."""
+    
+    def __init__(self, temperature_c: float = 22.0, forecast: Sequence[str] = ("sunny", "windy"),
+                 latency_seconds: float = 0.0):
+        """
+        Initialize the mock provider.
+        
+        Args:
+            temperature_c: Temperature reported for every location
+            forecast: Forecast reported for every location
+            latency_seconds: Delay of every fetch, to stand in for a remote API
+        """
+        self.temperature_c = temperature_c
+        self.forecast = list(forecast)
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+    
+    def fetch(self, location: str) -> Dict[str, Any]:
+        """Return the configured weather after the configured latency."""
+        self.calls += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return {"temperature_c": self.temperature_c, "forecast": list(self.forecast)}
+
+
+def format_temperature(celsius: float, unit: str) -> str:
+    """
+    Convert a Celsius temperature to ``unit`` and format it.
+    
+    Args:
+        celsius: Temperature in Celsius
+        unit: celsius or fahrenheit
+    
+    Returns:
+        str: Temperature rounded to one decimal, without a trailing ``.0``
+    
+    Raises:
+        ValueError: If the unit is not supported
+    """
+    if unit == "celsius":
+        value = celsius
+    elif unit == "fahrenheit":
+        value = celsius * 9 / 5 + 32
+    else:
+        raise ValueError(f"Unsupported unit: {unit}")
+    return f"{round(value, 1):g}"
+
+
+def _location_key(location: str) -> str:
+    # Place names are case-insensitive, unlike the queries normalize_query is built for
+    return normalize_query(location).casefold()
+
 
 class WeatherService:
-    """Service for weather-related operations."""
+    """
+    Service for weather-related operations.
     
-    @staticmethod
-    def get_current_weather(location: str, unit: str = "celsius") -> WeatherResponse:
+    Lookups are cached per normalized location with a TTL. The cache holds
+    the Celsius reading, so both units share one entry, and concurrent
+    misses for the same location share one upstream fetch.
+    """
+    
+    def __init__(
+            self,
+            provider: Optional[WeatherProvider] = None,
+            cache: Optional[CacheBackend] = None,
+            max_workers: int = 8
+        ):
+        """
+        Initialize the weather service.
+        
+        Args:
+            provider: Upstream weather source; defaults to :class:`MockWeatherProvider`
+            cache: Cache backend; defaults to an in-process LRU with a
+                10 minute TTL. A ``RedisCacheBackend`` shares it between workers.
+            max_workers: Threads :meth:`get_weather_many` fetches misses with
+        """
+        self.provider = provider or MockWeatherProvider()
+        self.cache = cache if cache is not None else InMemoryCacheBackend(max_size=1024, ttl_seconds=600.0)
+        self.max_workers = max_workers
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def get_current_weather(self, location: str, unit: str = "celsius") -> WeatherResponse:
         """
         Get the current weather for a location.
         
         Args:
             location: The location to get weather for
             unit: Temperature unit (celsius/fahrenheit)
-            
+        
         Returns:
             WeatherResponse: Weather data
+        
+        Raises:
+            ValueError: If the unit is not supported
+        """
+        if unit not in UNITS:
+            raise ValueError(f"Unsupported unit: {unit}")
+        return self._response(location, unit, self._lookup(location))
+    
+    def get_weather_many(self, locations: Sequence[str], unit: str = "celsius") -> List[WeatherResponse]:
         """
-        # Mock weather data
+        Get the current weather for several locations, fetching misses concurrently.
+        
+        Args:
+            locations: Locations to get weather for; duplicates are fetched once
+            unit: Temperature unit (celsius/fahrenheit)
+        
+        Returns:
+            List[WeatherResponse]: Weather data in the order of ``locations``
+        
+        Raises:
+            ValueError: If the unit is not supported
+        """
+        if unit not in UNITS:
+            raise ValueError(f"Unsupported unit: {unit}")
+        readings: Dict[str, Any] = {}
+        for location in locations:
+            key = _location_key(location)
+            if key not in readings:
+                readings[key] = self._cached(key)
+        misses = [location for location in locations
+                  if readings[_location_key(location)] is None]
+        if misses:
+            futures = {}
+            for location in misses:
+                key = _location_key(location)
+                if key not in futures:
+                    futures[key] = self._pool().submit(self._lookup, location)
+            for key, future in futures.items():
+                readings[key] = future.result()
+        return [self._response(location, unit, readings[_location_key(location)]) for location in locations]
+    
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        reading = self.cache.get(key)
+        if reading is not None:
+            with self._lock:
+                self.hits += 1
+        return reading
+    
+    def _lookup(self, location: str) -> Dict[str, Any]:
+        """Return the cached reading of a location, fetching it at most once concurrently."""
+        key = _location_key(location)
+        reading = self._cached(key)
+        if reading is not None:
+            return reading
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            upstream = self.provider.fetch(location)
+            reading = {"temperature_c": float(upstream["temperature_c"]), "forecast": list(upstream["forecast"])}
+            self.cache.set(key, reading)
+            future.set_result(reading)
+        except BaseException as e:
+            # Waiters get the same error; nothing is cached, so the next lookup retries
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return reading
+    
+    @staticmethod
+    def _response(location: str, unit: str, reading: Dict[str, Any]) -> WeatherResponse:
         return WeatherResponse(
             location=location,
-            temperature="22",
+            temperature=format_temperature(reading["temperature_c"], unit),
             unit=unit,
-            forecast=["sunny", "windy"]
+            forecast=reading["forecast"]
         )
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="weather")
+            return self._executor
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Report cache effectiveness.
+        
+        Returns:
+            Dict[str, float]: hits, misses (upstream fetches), coalesced
+            lookups that waited for another fetch, and hit_rate
+        """
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / total if total else 0.0
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the fetch pool of :meth:`get_weather_many`.
+        
+        Args:
+            wait: Whether to wait for running fetches
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -1,38 +1,255 @@
 """Helper functions for the application."""
 import json
 import re
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Sequence
 
+if TYPE_CHECKING:
+    import numpy as np
 
-def extract_json_from_response(response: str) -> Optional[Dict[str, Any]]:
+
+# A JSON object starts with "{" followed by optional whitespace and either a
+# key or "}". Braces in prose ("{参数名: 值}") never open a candidate.
+# The empty alternative matches an opening brace at the end of a chunk.
+_OBJECT_START_RE = re.compile(r'\{\s*(?:["}]|$)')
+# Tokens that matter inside a JSON string / between tokens of a JSON object.
+# Outside strings a markdown fence can never be part of the object being
+# scanned, so it re-synchronizes the scanner after a truncated object;
+# inside a string it is ordinary text.
+_IN_STRING_RE = re.compile(r'["\\]')
+_IN_OBJECT_RE = re.compile(r'[{}"]|```')
+_FENCE = "```"
+
+
+class IncrementalJSONScanner:
+    """
+    Incremental, string-aware scanner for top-level JSON objects in a token stream.
+
+    Chunks are fed as they arrive; :meth:`feed` returns every top-level
+    object completed by the chunk. The input is scanned exactly once: prose
+    between objects is skipped by a compiled regex that only stops at a
+    plausible object start, and inside a candidate only structural tokens
+    are visited.
+
+    Example:
+        >>> scanner = IncrementalJSONScanner()
+        >>> scanner.feed('```json\\n{"function": "calc", ')
+        []
+        >>> scanner.feed('"parameters": {}}\\n``` trailing')
+        [{'function': 'calc', 'parameters': {}}]
+    """
+
+    def __init__(self):
+        """Initialize an empty scanner."""
+        self._offset = 0  # global offset of the next chunk
+        self._escape_next = False  # a backslash ended the previous chunk
+        self._drop_candidate()
+
+    def _drop_candidate(self) -> None:
+        self._chunks: List[str] = []
+        self._chunks_offset = 0  # global offset of self._chunks[0]
+        self._depth = 0
+        self._in_string = False
+        self._tentative = False  # "{" seen at a chunk end, key not seen yet
+        self._backticks = 0  # backticks outside strings that ended the previous chunk
+        self._start = -1  # global offset of the current top-level '{'
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume a chunk of text.
+
+        Args:
+            chunk: Next piece of the model output.
+
+        Returns:
+            Top-level JSON objects completed by this chunk, in order.
+        """
+        return list(self.iter_feed(chunk))
+
+    def iter_feed(self, chunk: str) -> Iterator[Dict[str, Any]]:
+        """
+        Consume a chunk of text lazily.
+
+        Scanning pauses at every completed object, so a caller that stops
+        iterating never scans the rest of the chunk.
+
+        Args:
+            chunk: Next piece of the model output.
+
+        Yields:
+            Top-level JSON objects completed by this chunk, in order.
+        """
+        base = self._offset
+        self._offset += len(chunk)
+        position = 0
+        end = len(chunk)
+        if self._depth:
+            self._chunks.append(chunk)
+            if self._tentative:
+                stripped = len(chunk) - len(chunk.lstrip())
+                if stripped == end:
+                    return
+                if chunk[stripped] in '"}':
+                    self._tentative = False
+                else:
+                    self._drop_candidate()
+                    position = stripped
+            elif self._escape_next and chunk:
+                position = 1
+                self._escape_next = False
+            elif self._backticks:
+                # A fence split across chunks
+                run = len(chunk) - len(chunk.lstrip("`"))
+                if self._backticks + run >= len(_FENCE):
+                    position = len(_FENCE) - self._backticks
+                    self._drop_candidate()
+
+        while position < end:
+            if self._depth == 0:
+                # Outside any object only a plausible object start matters
+                match = _OBJECT_START_RE.search(chunk, position)
+                if match is None:
+                    break
+                position = match.start() + 1
+                self._depth = 1
+                self._tentative = match.end() == end and chunk[-1] not in '"}'
+                self._start = base + match.start()
+                self._chunks = [chunk]
+                self._chunks_offset = base
+                continue
+
+            match = (_IN_STRING_RE if self._in_string else _IN_OBJECT_RE).search(chunk, position)
+            if match is None:
+                break
+            token = match.group()
+            position = match.end()
+            if token == _FENCE:
+                self._drop_candidate()
+            elif self._in_string:
+                if token == '"':
+                    self._in_string = False
+                elif position < end:  # backslash: skip the escaped character
+                    position += 1
+                else:
+                    self._escape_next = True
+            elif token == '"':
+                self._in_string = True
+            elif token == "{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    value = self._parse(base + match.start())
+                    self._chunks = []
+                    if isinstance(value, dict):
+                        yield value
+        if self._depth == 0:
+            self._chunks = []
+            self._backticks = 0
+        elif self._in_string:
+            self._backticks = 0
+        else:
+            run = len(chunk) - len(chunk.rstrip("`"))
+            self._backticks = self._backticks + run if run == end else run
+
+    def _parse(self, end: int) -> Optional[Any]:
+        text = self._chunks[0] if len(self._chunks) == 1 else "".join(self._chunks)
+        try:
+            return json.loads(text[self._start - self._chunks_offset:end - self._chunks_offset + 1])
+        except json.JSONDecodeError:
+            return None
+
+
+def iter_json_objects(text: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every top-level JSON object embedded in a string, in order.
+
+    Args:
+        text: Text that may contain JSON objects mixed with prose or
+            markdown code fences.
+
+    Yields:
+        Parsed JSON objects.
+    """
+    yield from IncrementalJSONScanner().iter_feed(text)
+
+
+def matches_function_schema(candidate: Dict[str, Any], functions: Sequence[Dict[str, Any]]) -> bool:
+    """
+    Check whether a parsed object is a call to one of the declared functions.
+
+    Args:
+        candidate: Parsed JSON object.
+        functions: Function schemas in the ``FUNCTIONS`` format.
+
+    Returns:
+        True if ``candidate["function"]`` names a declared function and all
+        of its required parameters are present.
+    """
+    name = candidate.get("function")
+    parameters = candidate.get("parameters", {})
+    if not isinstance(parameters, dict):
+        return False
+    for schema in functions:
+        if schema["name"] == name:
+            required = schema.get("parameters", {}).get("required", [])
+            return all(key in parameters for key in required)
+    return False
+
+
+def extract_json_from_response(
+        response: str,
+        functions: Optional[Sequence[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
     """
     Extract JSON from a string response.
-    
+
+    The response is scanned once; objects inside markdown code fences are
+    found like any other.
+
     Args:
         response: String containing JSON data.
-        
+        functions: If given, return the first object that is a valid call
+            to one of these function schemas instead of the first object.
+
     Returns:
         Extracted JSON data as a dictionary, or None if no valid JSON found.
     """
-    # Try to find JSON in markdown code blocks
-    json_match = re.search(r"```json\s*(.*?)\s*```", response, re.DOTALL)
-    if json_match:
-        try:
-            return json.loads(json_match.group(1))
-        except json.JSONDecodeError:
-            pass
-    
-    # Try to find JSON without markdown
-    try:
-        # Find the first occurrence of '{'
-        start = response.find('{')
-        if start != -1:
-            # Find the last occurrence of '}'
-            end = response.rfind('}')
-            if end != -1:
-                json_str = response[start:end + 1]
-                return json.loads(json_str)
-    except json.JSONDecodeError:
-        pass
-    
+    for candidate in iter_json_objects(response):
+        if functions is None or matches_function_schema(candidate, functions):
+            return candidate
     return None
+
+
+def aggregate_windows(
+        timestamps: "np.ndarray",
+        start_ts: float,
+        end_ts: float,
+        data_points: int,
+        weights: Optional["np.ndarray"] = None
+    ) -> "np.ndarray":
+    """
+    Bin timestamps into equal half-open windows in a single vectorized pass.
+
+    Args:
+        timestamps: Event (or bucket) timestamps in seconds.
+        start_ts: Start of the first window.
+        end_ts: End of the last window.
+        data_points: Number of windows.
+        weights: Optional count per timestamp, e.g. per-second bucket totals.
+
+    Returns:
+        Sum of weights (or number of events) per window.
+    """
+    # Imported here so JSON extraction does not pay for loading NumPy
+    import numpy as np
+
+    if data_points <= 0 or end_ts <= start_ts:
+        return np.zeros(max(data_points, 0))
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    window_size = (end_ts - start_ts) / data_points
+    index = np.floor((timestamps - start_ts) / window_size).astype(np.int64)
+    inside = (index >= 0) & (index < data_points)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[inside]
+    return np.bincount(index[inside], weights=weights, minlength=data_points).astype(np.float64)
+
@@ -0,0 +1,98 @@
+"""Tests of the asyncio query path and the bounded batch API."""
+import asyncio
+import json
+import re
+import time
+
+import pytest
+
+from src.demo.main import FunctionCallingDemo
+
+
+class FakeAsyncLLM:
+    """Answers "第N个问题" with N * 2 after a short delay and tracks calls in flight."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, prompt: str) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        number = int(re.search(r"第(\d+)个问题", prompt).group(1))
+        if number == 4:
+            return '{"function": "calculator", "parameters": {"x": "four", "y": 2, "operation": "*"}}'
+        if number == 5:
+            return "{}"
+        return json.dumps({"function": "calculator", "parameters": {"x": number, "y": 2, "operation": "*"}})
+
+
+def _demo(llm: FakeAsyncLLM) -> FunctionCallingDemo:
+    return FunctionCallingDemo(llm=llm, enable_fast_path=False, enable_cache=False)
+
+
+def test_batch_keeps_input_order_and_reports_errors_per_item():
+    llm = FakeAsyncLLM()
+    queries = [f"第{number}个问题" for number in range(10)]
+    results = asyncio.run(_demo(llm).aprocess_many(queries, max_concurrency=3))
+    assert [result.query for result in results] == queries
+    for number, result in enumerate(results):
+        if number == 4:
+            assert result.result is None and "Invalid parameters for calculator" in result.error
+        elif number == 5:
+            assert result.result is None and result.error is None
+        else:
+            assert result.error is None and result.result.result == number * 2
+    assert llm.max_in_flight == 3
+
+
+def test_llm_calls_overlap_up_to_the_limit():
+    llm = FakeAsyncLLM(delay=0.05)
+    demo = _demo(llm)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await demo.aprocess_many([f"第{number}个问题" for number in range(8)], max_concurrency=8)
+        return loop.time() - start
+
+    # Sequential calls would take 8 * 50 ms
+    assert asyncio.run(run()) < 0.25
+    assert llm.max_in_flight == 8
+
+
+def test_service_calls_do_not_block_the_event_loop(monkeypatch):
+    demo = FunctionCallingDemo(llm=FakeAsyncLLM(delay=0))
+    calls = []
+    ticks = []
+
+    calculate = demo.calculator_service.calculate
+
+    def slow_calculate(**arguments):
+        calls.append(time.monotonic())
+        time.sleep(0.1)
+        calls.append(time.monotonic())
+        return calculate(**arguments)
+
+    monkeypatch.setattr(demo.calculator_service, "calculate", slow_calculate)
+
+    async def run():
+        async def tick():
+            for _ in range(10):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+        return (await asyncio.gather(demo.aprocess_query("帮我计算23乘以45"), tick()))[0]
+
+    assert asyncio.run(run()).result == 23 * 45
+    started, finished = calls
+    assert any(started < tick < finished for tick in ticks)
+
+
+def test_concurrency_limit_must_be_positive():
+    with pytest.raises(ValueError):
+        asyncio.run(_demo(FakeAsyncLLM()).aprocess_many(["第1个问题"], max_concurrency=0))
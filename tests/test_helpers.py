@@ -0,0 +1,44 @@
+"""Tests of the incremental JSON scanner and function-call extraction."""
+import pytest
+
+from src.demo.utils.helpers import IncrementalJSONScanner, extract_json_from_response, iter_json_objects
+
+INPUTS = [
+    '{"a": "```"}',
+    'prose {"a": "x ``` y", "b": {"c": 1}} more',
+    '```json\n{"function": "calc", "parameters": {"x": "\\"}"}}\n```',
+    '{"function": "cut off\n```\n{"function": "ok", "parameters": {}}',
+    '{"a": 1, ```\n{"b": 2}',
+    '{"a": 1 ````{"b": 2}',
+    'no {json} here { "a": [1, {"b": "}"}]} {}',
+    '{"a": "\\\\"} {"b": "\\u0041"}',
+    '{ \n "a": 1} { x } {\t}',
+]
+
+
+def _fed(chunks):
+    scanner = IncrementalJSONScanner()
+    return [value for chunk in chunks for value in scanner.feed(chunk)]
+
+
+@pytest.mark.parametrize("text", INPUTS)
+def test_chunk_boundaries_do_not_change_the_result(text):
+    whole = list(iter_json_objects(text))
+    for split in range(len(text) + 1):
+        assert _fed([text[:split], text[split:]]) == whole, split
+    assert _fed(list(text)) == whole
+
+
+def test_fence_inside_a_string_is_text():
+    assert list(iter_json_objects('{"a": "```"}')) == [{"a": "```"}]
+
+
+def test_fence_outside_strings_drops_a_truncated_object():
+    assert list(iter_json_objects('{"a": 1, ```\n{"b": 2}')) == [{"b": 2}]
+
+
+def test_extract_returns_the_first_valid_function_call():
+    functions = [{"name": "calc", "parameters": {"required": ["x"]}}]
+    response = '{"function": "other"} {"function": "calc", "parameters": {}} {"function": "calc", "parameters": {"x": 1}}'
+    assert extract_json_from_response(response, functions) == {"function": "calc", "parameters": {"x": 1}}
+    assert extract_json_from_response("no json") is None
@@ -0,0 +1,13 @@
+"""Tests of building the pooled Ollama client from its settings."""
+from src.demo.core.llm import PooledOllama
+from src.demo.core.settings import OllamaSettings
+
+
+def test_fractional_timeouts_reach_the_http_client():
+    settings = OllamaSettings.from_env(env_file=None, environ={"OLLAMA_TIMEOUT": "2.5",
+                                                               "OLLAMA_CONNECT_TIMEOUT": "0.5"})
+    llm = PooledOllama.from_settings(settings)
+    assert llm.timeout == 2.5
+    timeout = llm._sync_client().timeout
+    assert (timeout.read, timeout.connect) == (2.5, 0.5)
+    llm.close()
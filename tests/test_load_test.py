@@ -0,0 +1,108 @@
+"""Tests of the Ollama stand-in server and the load generator."""
+import threading
+import time
+
+import httpx
+import pytest
+
+from benchmarks.load_test import DEFAULT_QUERIES, LoadReport, build_demo, run_closed_loop, run_open_loop
+from benchmarks.ollama_stub import OllamaStubServer, StubConfig
+from src.demo.core.llm import PooledOllama
+from src.demo.core.prompt import PROMPT_TEMPLATE
+
+
+def _prompt(query: str) -> str:
+    return PROMPT_TEMPLATE.replace("{query}", query, 1).replace("{functions}", "[]", 1)
+
+
+@pytest.fixture
+def stub():
+    with OllamaStubServer(StubConfig(ttft_ms=0, tokens_per_second=0)) as server:
+        yield server
+
+
+def test_replies_are_chosen_by_keyword():
+    server = OllamaStubServer(StubConfig(fenced=True))
+    try:
+        assert '"get_current_weather"' in server.reply_for(_prompt("北京的天气怎么样？"))
+        assert '"calculate_qps"' in server.reply_for(_prompt("计算最近5分钟的QPS"))
+        assert server.reply_for(_prompt("讲个笑话")) == "```json\n{}\n```"
+    finally:
+        server.stop()
+
+
+def test_generate_streams_the_canned_call(stub):
+    llm = PooledOllama(model="stub", base_url=stub.base_url)
+    assert '"calculator"' in llm.invoke(_prompt("帮我计算23乘以45"))
+    assert "".join(llm.stream(_prompt("查询用户12345的订单"))).startswith('{"function": "get_recent_orders"')
+    assert llm.warm_up() >= 0
+    assert stub.requests_served == 3
+    llm.close()
+
+
+def test_other_endpoints(stub):
+    with httpx.Client(base_url=stub.base_url) as client:
+        assert client.get("/api/tags").json()["models"][0]["name"] == stub.config.model
+        assert client.get("/api/version").status_code == 200
+        assert client.get("/missing").status_code == 404
+        assert client.post("/api/generate", content=b"not json").status_code == 400
+
+
+def test_time_to_first_token_and_pacing_are_simulated():
+    config = StubConfig(ttft_ms=100, tokens_per_second=100, chars_per_token=4)
+    with OllamaStubServer(config) as server:
+        llm = PooledOllama(model="stub", base_url=server.base_url)
+        start = time.perf_counter()
+        reply = llm.invoke(_prompt("北京的天气怎么样？"))
+        elapsed = time.perf_counter() - start
+        llm.close()
+    tokens = -(-len(reply) // 4)
+    assert elapsed >= 0.1 + (tokens - 1) / 100 - 0.01
+
+
+def test_report_percentiles():
+    report = LoadReport.from_latencies("test", [0.001 * value for value in range(1, 101)], errors=2, duration_s=2.0)
+    assert (report.requests, report.errors, report.throughput_rps) == (100, 2, 50.0)
+    assert report.p50_ms == pytest.approx(50.5)
+    assert report.p99_ms == pytest.approx(99.01)
+    assert report.max_ms == pytest.approx(100.0)
+    assert LoadReport.from_latencies("empty", [], errors=0, duration_s=0.0).p99_ms == 0.0
+
+
+def test_closed_loop_keeps_the_concurrency():
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def process(query):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        if query == "fail":
+            raise ValueError(query)
+
+    report = run_closed_loop(process, ["ok", "fail"], total=20, concurrency=4)
+    assert (report.requests, report.errors) == (20, 10)
+    assert in_flight[1] == 4
+    with pytest.raises(ValueError):
+        run_closed_loop(process, ["ok"], total=1, concurrency=0)
+
+
+def test_open_loop_keeps_the_arrival_rate():
+    report = run_open_loop(lambda query: None, ["ok"], total=20, rate=200)
+    assert report.requests == 20
+    assert report.duration_s >= 19 / 200
+    with pytest.raises(ValueError):
+        run_open_loop(lambda query: None, ["ok"], total=1, rate=0)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_demo_runs_end_to_end_against_the_stub(stub, streaming, capsys):
+    demo = build_demo(stub.base_url, "stub", streaming=streaming)
+    report = run_closed_loop(demo.process_query, DEFAULT_QUERIES, total=12, concurrency=3)
+    assert (report.requests, report.errors) == (12, 0)
+    assert stub.requests_served == 12
+    assert demo.route_counts["llm"] == 12
+    demo.llm.close()
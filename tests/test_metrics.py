@@ -0,0 +1,81 @@
+"""Tests of the latency histograms and their OpenMetrics exposition."""
+import re
+from typing import Dict, List, Tuple
+
+import pytest
+
+from src.demo.core.metrics import LatencyHistogram, PipelineMetrics, _bucket_index, _bucket_upper_bound
+from src.demo.main import FunctionCallingDemo
+
+_SAMPLE_RE = re.compile(r'(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>.*)\})? (?P<value>\S+)')
+_LABEL_RE = re.compile(r'(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)="(?P<value>(?:[^"\\\n]|\\[\\"n])*)"(?:,|$)')
+_UNESCAPE = {"\\\\": "\\", '\\"': '"', "\\n": "\n"}
+
+
+def _parse(text: str) -> List[Tuple[str, Dict[str, str], float]]:
+    lines = text.split("\n")
+    assert lines[-2:] == ["# EOF", ""]
+    samples = []
+    for line in lines[:-2]:
+        if line.startswith("#"):
+            continue
+        match = _SAMPLE_RE.fullmatch(line)
+        assert match, line
+        labels = {}
+        position = 0
+        body = match.group("labels") or ""
+        while position < len(body):
+            label = _LABEL_RE.match(body, position)
+            assert label, line
+            labels[label.group("name")] = re.sub(r'\\[\\"n]', lambda m: _UNESCAPE[m.group()], label.group("value"))
+            position = label.end()
+        samples.append((match.group("name"), labels, float(match.group("value"))))
+    return samples
+
+
+def test_bucket_bounds_contain_their_values():
+    for value in list(range(100)) + [2 ** exponent + delta for exponent in range(5, 40) for delta in (-1, 0, 1)]:
+        index = _bucket_index(value)
+        assert value <= _bucket_upper_bound(index)
+        if index:
+            assert value > _bucket_upper_bound(index - 1)
+        # About 6% relative precision
+        assert _bucket_upper_bound(index) - value <= max(value / 16, 1)
+
+
+def test_percentiles_and_cumulative_counts():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(value * 1000)
+    p50, p99, p100 = histogram.percentiles((0.5, 0.99, 1.0))
+    assert p50 == pytest.approx(500_000, rel=0.07)
+    assert p99 == pytest.approx(990_000, rel=0.07)
+    assert p100 == 1_000_000
+    assert histogram.cumulative_counts([0, 10 ** 9]) == [0, 1000]
+    histogram.record(2 ** 60)
+    assert histogram.percentiles((1.0,)) == [_bucket_upper_bound(_bucket_index(2 ** 60))]
+
+
+def test_label_values_are_escaped():
+    metrics = PipelineMetrics()
+    weird = 'x"},evil="1\\\nlast'
+    metrics.count_tool_call(weird, success=False)
+    with metrics.time('stage "quoted"'):
+        pass
+    samples = _parse(metrics.to_openmetrics())
+    assert ("demo_tool_calls_total", {"tool": weird, "outcome": "error"}, 1.0) in samples
+    counts = [labels for name, labels, _ in samples if name == "demo_stage_latency_seconds_count"]
+    assert counts == [{"stage": 'stage "quoted"'}]
+
+
+def test_tools_missing_from_the_registry_are_counted_as_unknown():
+    demo = FunctionCallingDemo(enable_fast_path=False)
+    for name in ("no_such_tool", 'a"b', "calculator"):
+        with pytest.raises(ValueError):
+            demo._execute_function({"function": name, "parameters": {"x": "abc"}})
+    assert demo.metrics.stats()["tools"] == {
+        "unknown": {"success": 0, "error": 2},
+        "calculator": {"success": 0, "error": 1}
+    }
+    assert {labels["tool"] for name, labels, _ in _parse(demo.openmetrics())
+            if name == "demo_tool_calls_total"} == {"unknown", "calculator"}
@@ -0,0 +1,69 @@
+"""Tests of order paging in OrderService, on stored and on demo orders."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.demo.services.order_service import OrderService
+
+
+def _service_with_orders(count: int) -> OrderService:
+    service = OrderService()
+    now = datetime.now()
+    service.create_orders(
+        {"order_id": f"A-{i:03d}", "user_id": "u1", "created_at": now - timedelta(minutes=i),
+         "items": [{"product": "p", "quantity": 1, "price": 1.0 + i}]}
+        for i in range(count)
+    )
+    return service
+
+
+def _all_pages(service: OrderService, limit: int):
+    pages = []
+    cursor = None
+    while True:
+        response = service.get_recent_orders("u1", limit=limit, cursor=cursor)
+        pages.append([order.order_id for order in response.orders])
+        cursor = response.next_cursor
+        if cursor is None:
+            return pages, response.total_orders
+
+
+@pytest.mark.parametrize("count, limit", [(7, 3), (6, 3), (3, 1), (3, 5)])
+def test_cursor_pages_cover_every_order_once(count, limit):
+    service = _service_with_orders(count)
+    pages, total = _all_pages(service, limit)
+    assert [order_id for page in pages for order_id in page] == [f"A-{i:03d}" for i in range(count)]
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+    assert total == count
+
+
+def test_demo_orders_page_like_stored_orders():
+    service = OrderService()
+    assert service.store.is_empty()
+    pages, total = _all_pages(service, 2)
+    assert pages == [["ORD-3", "ORD-2"], ["ORD-1"]]
+    assert total == 3
+    assert [order.order_id for order in service.get_recent_orders("u1", offset=1).orders] == ["ORD-2", "ORD-1"]
+    assert service.get_recent_orders("u1", limit=0).orders == []
+    assert [order.order_id for order in service.stream_recent_orders("u1")] == ["ORD-3", "ORD-2", "ORD-1"]
+
+
+def test_last_page_has_no_cursor():
+    service = _service_with_orders(4)
+    response = service.get_recent_orders("u1", limit=4)
+    assert len(response.orders) == 4
+    assert response.next_cursor is None
+
+
+def test_offset_applies_after_the_cursor():
+    service = _service_with_orders(6)
+    first = service.get_recent_orders("u1", limit=2)
+    second = service.get_recent_orders("u1", limit=2, offset=1, cursor=first.next_cursor)
+    assert [order.order_id for order in second.orders] == ["A-003", "A-004"]
+
+
+@pytest.mark.parametrize("kwargs", [{"cursor": "not-a-cursor"}, {"limit": -1}, {"offset": -1}])
+def test_invalid_paging_arguments_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        OrderService().get_recent_orders("u1", **kwargs)
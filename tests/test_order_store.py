@@ -0,0 +1,84 @@
+"""Tests of the order storage backends; both must page and aggregate alike."""
+import threading
+
+import pytest
+
+from src.demo.services.order_store import InMemoryOrderStore, SQLiteOrderStore
+
+
+def _order(index: int, user_id: str = "u1", created_ts: float = 1_000_000.0, status: str = "completed"):
+    return {
+        "order_id": f"O-{index:05d}", "user_id": user_id, "items": [{"product": "p", "quantity": 1, "price": 2.0}],
+        "status": status, "total": 2.0, "created_at": "2024-01-01T00:00:00", "created_ts": created_ts + index // 2
+    }
+
+
+@pytest.fixture(params=["memory", "sqlite", "sqlite_file"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = InMemoryOrderStore()
+    else:
+        store = SQLiteOrderStore(":memory:" if request.param == "sqlite" else str(tmp_path / "orders.db"))
+    yield store
+    if hasattr(store, "close"):
+        store.close()
+
+
+def test_cursor_paging_matches_a_full_listing(store):
+    # Pairs of orders share a timestamp, so the order id breaks ties
+    store.add([_order(index) for index in range(25)] + [_order(index, user_id="u2") for index in range(25, 30)])
+    everything = [order["order_id"] for order in store.page("u1", 0.0)]
+    assert everything == [f"O-{index:05d}" for index in reversed(range(25))]
+
+    seen = []
+    before = None
+    while True:
+        page = store.page("u1", 0.0, before=before, limit=4)
+        seen.extend(order["order_id"] for order in page)
+        if len(page) < 4:
+            break
+        before = (page[-1]["created_ts"], page[-1]["order_id"])
+    assert seen == everything
+    assert [order["order_id"] for order in store.page("u1", 0.0, offset=23)] == ["O-00001", "O-00000"]
+    assert store.page("u1", 1_000_000.0 + 12) == store.page("u1", 0.0, limit=1)
+
+
+def test_range_count_summary_and_lookup(store):
+    assert store.is_empty()
+    store.add([_order(index, status="completed" if index % 3 else "refunded") for index in range(10)])
+    assert not store.is_empty()
+    assert store.count_range("u1", 1_000_000.0 + 3) == 4
+    assert store.summarize("u1", 0.0) == {"completed": (6, 12.0), "refunded": (4, 8.0)}
+    assert store.get("O-00004")["items"] == [{"product": "p", "quantity": 1, "price": 2.0}]
+    assert store.get("missing") is None
+
+
+def test_reads_during_writes_never_fail(store):
+    errors = []
+    stop = threading.Event()
+
+    def write():
+        try:
+            for batch in range(40):
+                store.add([_order(batch * 25 + index) for index in range(25)])
+        except Exception as e:
+            errors.append(e)
+        finally:
+            stop.set()
+
+    def read():
+        try:
+            while not stop.is_set():
+                page = store.page("u1", 0.0, limit=10)
+                assert store.count_range("u1", 0.0) >= len(page)
+                store.summarize("u1", 0.0)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert store.count_range("u1", 0.0) == 1000
@@ -0,0 +1,98 @@
+"""Tests of the lazily paged OrderStream and how the CLI prints it."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.demo.main import FunctionCallingDemo
+from src.demo.services.order_service import OrderService
+from src.demo.services.order_store import InMemoryOrderStore
+
+
+class RecordingStore(InMemoryOrderStore):
+    """In-memory store that records the page sizes and summaries it is asked for."""
+
+    def __init__(self):
+        super().__init__()
+        self.pages = []
+        self.summaries = 0
+
+    def page(self, user_id, since_ts, before=None, limit=50):
+        self.pages.append(limit)
+        return super().page(user_id, since_ts, before=before, limit=limit)
+
+    def summarize(self, user_id, since_ts):
+        self.summaries += 1
+        return super().summarize(user_id, since_ts)
+
+
+def _service(count: int, page_size: int = 3):
+    store = RecordingStore()
+    service = OrderService(store, page_size=page_size)
+    now = datetime.now()
+    service.create_orders(
+        {"order_id": f"A-{i:03d}", "user_id": "u1", "created_at": now - timedelta(minutes=i),
+         "items": [{"product": "p", "quantity": 2, "price": 1.0 + i}],
+         "status": "completed" if i % 2 else "created"}
+        for i in range(count)
+    )
+    return service, store
+
+
+def test_pages_are_fetched_while_iterating():
+    service, store = _service(7)
+    stream = service.stream_recent_orders("u1")
+    assert store.pages == []
+    orders = iter(stream)
+    assert next(orders).order_id == "A-000"
+    assert store.pages == [3]
+    assert [order.order_id for order in orders] == [f"A-{i:03d}" for i in range(1, 7)]
+    assert store.pages == [3, 3, 3]
+
+
+def test_full_last_page_fetches_one_empty_page():
+    service, store = _service(6)
+    pages = list(service.stream_recent_orders("u1").pages())
+    assert [len(page) for page in pages] == [3, 3]
+    assert store.pages == [3, 3, 3]
+
+
+@pytest.mark.parametrize("limit, sizes", [(0, []), (2, [2]), (3, [3]), (5, [3, 2]), (20, [3, 3, 3])])
+def test_limit_shrinks_the_last_page(limit, sizes):
+    service, store = _service(7)
+    orders = list(service.stream_recent_orders("u1", limit=limit))
+    assert [order.order_id for order in orders] == [f"A-{i:03d}" for i in range(min(limit, 7))]
+    assert store.pages == sizes
+
+
+def test_summary_covers_the_whole_period_without_paging():
+    service, store = _service(7)
+    stream = service.stream_recent_orders("u1", limit=2)
+    summary = stream.summary
+    assert store.pages == []
+    assert stream.summary is summary
+    assert store.summaries == 1
+    assert summary.total_orders == 7
+    assert summary.total_amount == pytest.approx(sum(2 * (1.0 + i) for i in range(7)))
+    assert summary.status_counts == {"created": 4, "completed": 3}
+    assert summary.period == "Last 3 months"
+
+
+def test_empty_history_streams_nothing():
+    service, _ = _service(3)
+    stream = service.stream_recent_orders("someone-else")
+    assert list(stream) == []
+    assert stream.summary.total_orders == 0
+
+
+def test_stream_is_printed_summary_first_then_page_by_page(capsys):
+    service, _ = _service(4)
+    demo = FunctionCallingDemo()
+    demo._print_result(service.stream_recent_orders("u1"))
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "u1 的订单查询结果:"
+    assert "订单总数: 4" in lines
+    statuses = next(line for line in lines if line.startswith("状态分布: "))
+    assert sorted(statuses[len("状态分布: "):].split(", ")) == ["completed 2", "created 2"]
+    rows = [line.split()[0] for line in lines if line.startswith("A-")]
+    assert rows == ["A-000", "A-001", "A-002", "A-003"]
+    assert lines[-1] == "-" * 80
@@ -0,0 +1,47 @@
+"""Tests of package QR codes kept in the content-addressed store."""
+import os
+
+from src.demo.services.package_service import PackageService
+from src.demo.services.qr_renderer import QRRenderer
+from src.demo.services.qr_store import QRStore
+
+
+def _stored_files(root):
+    return [os.path.join(directory, name) for directory, _, names in os.walk(root) for name in names]
+
+
+def test_identical_packages_share_one_stored_file(tmp_path):
+    service = PackageService(qr_mode="sync", output_dir=str(tmp_path))
+    first = service.create_custom_package("VIP", duration=12, features=["专属支持"])
+    second = service.create_custom_package("VIP", duration=12, features=["专属支持"])
+    assert first.package.id != second.package.id
+    assert first.qr_file == second.qr_file
+    assert _stored_files(tmp_path) == [first.qr_file]
+    assert service.store.stats()["misses"] == 1
+    assert service.get_qr_image(first.package.id).bytes() == service.get_qr_image(second.package.id).bytes()
+    assert first.package.id in first.payment_url
+
+
+def test_pending_renders_of_identical_packages_are_shared(tmp_path):
+    service = PackageService(qr_mode="background", output_dir=str(tmp_path))
+    first = service.create_custom_package("VIP", duration=12)
+    second = service.create_custom_package("VIP", duration=12)
+    assert service.get_qr_image(first.package.id).wait(5) == service.get_qr_image(second.package.id).wait(5)
+    assert service.store.stats()["misses"] == 1
+    service.renderer.shutdown()
+
+
+def test_handles_survive_garbage_collection_of_their_file(tmp_path):
+    renderer = QRRenderer()
+    store = QRStore(str(tmp_path), renderer=renderer, gc_every=0)
+    rendered = store.get("amount=100", background=False).bytes()
+    stored = store.get("amount=100")
+    assert store.gc(max_bytes=0)["removed"] == 1
+    assert stored.bytes() == rendered
+    assert os.path.exists(stored.path)
+
+    background = store.get("amount=200")
+    background.bytes(5)
+    store.gc(max_bytes=0)
+    assert os.path.exists(background.wait(5))
+    renderer.shutdown()
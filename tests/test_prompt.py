@@ -0,0 +1,38 @@
+"""Tests of per-query tool selection in PromptBuilder."""
+import pytest
+
+from src.demo.core.prompt import PromptBuilder
+from src.demo.main import TOOLS
+
+
+@pytest.fixture
+def builder():
+    return PromptBuilder(TOOLS)
+
+
+@pytest.mark.parametrize("query, tool", [
+    ("北京的天气怎么样？", "get_current_weather"),
+    ("上海现在多少度", "get_current_weather"),
+    ("What's the weather like in Beijing?", "get_current_weather"),
+    ("帮我计算23乘以45", "calculator"),
+    ("计算 (23*45+12)/3", "evaluate_expression"),
+    ("查询用户12345最近3个月的订单", "get_recent_orders"),
+    ("请问 2024-01-01 下单的东西到了吗", "get_recent_orders"),
+    ("创建3个月的高级套餐，包含数据分析和专家咨询功能", "create_custom_package"),
+    ("我想要一个12个月的VIP会员", "create_custom_package"),
+    ("计算最近5分钟的QPS", "calculate_qps"),
+])
+def test_needed_tool_is_selected_first(builder, query, tool):
+    selected = builder.select(query)
+    assert selected[0] == tool
+    assert len(selected) == builder.max_tools
+    assert f'"name":"{tool}"' in builder.build(query)
+
+
+def test_single_characters_and_symbols_are_not_keywords(builder):
+    scores = builder.scores("2024-01-01 + 3 * 4 / 2")
+    assert all(score < builder.min_confidence for score in scores.values())
+
+
+def test_ambiguous_query_gets_every_tool(builder):
+    assert builder.select("讲个笑话") == TOOLS.names()
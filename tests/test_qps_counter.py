@@ -0,0 +1,83 @@
+"""Tests of the in-process ring-buffer QPS counter."""
+import threading
+
+import numpy as np
+import pytest
+
+from src.demo.core.qps_counter import RingBufferQPSCounter
+from src.demo.services.qps_service import QPSService
+
+NOW = 1_700_000_000
+
+
+class FakeClock:
+    """Clock the test moves by hand."""
+
+    def __init__(self, now: float = NOW):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_counts_are_kept_per_second():
+    counter = RingBufferQPSCounter(capacity_seconds=60, clock=FakeClock())
+    counter.record()
+    counter.record(count=4)
+    counter.record(timestamp=NOW - 2.5)
+    assert counter.per_second_counts(NOW - 3, NOW + 1).tolist() == [1, 0, 0, 5]
+    assert counter.per_second_counts(NOW, NOW).tolist() == []
+
+
+def test_reused_slots_forget_the_older_second():
+    counter = RingBufferQPSCounter(capacity_seconds=10, clock=FakeClock())
+    counter.record(count=3, timestamp=NOW)
+    counter.record(count=1, timestamp=NOW + 10)
+    assert counter.per_second_counts(NOW, NOW + 1).tolist() == [0]
+    assert counter.per_second_counts(NOW + 10, NOW + 11).tolist() == [1]
+    # Older than the retained history: dropped instead of overwriting newer data
+    counter.record(count=7, timestamp=NOW)
+    assert counter.per_second_counts(NOW, NOW + 11).tolist() == [0] * 10 + [1]
+
+
+def test_concurrent_records_are_not_lost():
+    counter = RingBufferQPSCounter(capacity_seconds=60, clock=FakeClock())
+
+    def worker():
+        for _ in range(5000):
+            counter.record()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.per_second_counts(NOW, NOW + 1).tolist() == [40_000]
+
+
+def test_calculate_qps_averages_each_window():
+    clock = FakeClock()
+    counter = RingBufferQPSCounter(capacity_seconds=3600, clock=clock)
+    # 2 requests/s over the last minute, 1 request/s in the minute before
+    for second in range(NOW - 120, NOW):
+        counter.record(count=2 if second >= NOW - 60 else 1, timestamp=second)
+    response = counter.calculate_qps(time_window_minutes=4, data_points=4)
+    assert response.values.tolist() == [0.0, 0.0, 1.0, 2.0]
+    assert len(response) == 4
+    step = response.timestamps[1] - response.timestamps[0]
+    assert step == np.timedelta64(60, "s")
+
+
+def test_qps_service_uses_the_counter_as_backend():
+    clock = FakeClock()
+    counter = RingBufferQPSCounter(capacity_seconds=600, clock=clock)
+    service = QPSService(backend=counter)
+    for _ in range(300):
+        service.record_request()
+    clock.now += 1
+    assert service.calculate_qps(time_window_minutes=1, data_points=2).values.tolist() == [0.0, 10.0]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        RingBufferQPSCounter(capacity_seconds=0)
@@ -0,0 +1,73 @@
+"""Tests of the columnar QPSResponse and its per-point view."""
+import importlib
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.demo.models.qps import QPSData, QPSResponse
+
+demo_main = importlib.import_module("src.demo.main")
+
+START = datetime(2024, 1, 2, 3, 4, 5, 678901)
+
+
+def _response(count: int = 4) -> QPSResponse:
+    timestamps = np.datetime64(START, "us") + np.arange(count) * np.timedelta64(30, "s")
+    return QPSResponse(status="success", message="ok", timestamps=timestamps, values=np.arange(count) * 1.005)
+
+
+def test_point_view_matches_the_columns():
+    response = _response()
+    points = response.data
+    assert len(response) == len(points) == 4
+    assert points[0] == QPSData(timestamp=START, qps_value=0.0)
+    assert points[-1] == QPSData(timestamp=START + timedelta(seconds=90), qps_value=3 * 1.005)
+    assert list(points[1:3]) == [points[1], points[2]]
+    assert [point.qps_value for point in points] == response.values.tolist()
+    with pytest.raises(IndexError):
+        points[4]
+
+
+def test_columns_are_not_copied():
+    values = np.linspace(0, 1, 1000)
+    timestamps = np.datetime64(START, "us") + np.arange(1000) * np.timedelta64(1, "s")
+    response = QPSResponse(status="success", message="ok", timestamps=timestamps, values=values)
+    assert np.shares_memory(response.values, values)
+    assert np.shares_memory(response.timestamps, timestamps)
+
+
+def test_from_points_round_trips():
+    response = _response()
+    rebuilt = QPSResponse.from_points(response.status, response.message, list(response.data))
+    np.testing.assert_array_equal(rebuilt.timestamps, response.timestamps)
+    np.testing.assert_array_equal(rebuilt.values, response.values)
+
+
+def test_serialization_formats_every_point():
+    response = _response(2)
+    assert json.loads(response.to_json()) == {
+        "status": "success",
+        "data": {"timestamps": ["2024-01-02 03:04:05", "2024-01-02 03:04:35"], "qps_values": [0.0, 1.0]},
+        "message": "ok"
+    }
+    assert response.to_csv() == "timestamp,qps_value\n2024-01-02 03:04:05,0.00\n2024-01-02 03:04:35,1.00\n"
+    assert response.format_lines().splitlines()[1] == "时间: 2024-01-02 03:04:35, QPS: 1.00"
+
+
+def test_empty_response_serializes_and_is_printed(monkeypatch, capsys):
+    empty = _response(0)
+    assert len(empty) == 0 and list(empty.data) == []
+    assert empty.to_csv() == "timestamp,qps_value\n"
+    assert json.loads(empty.to_json())["data"] == {"timestamps": [], "qps_values": []}
+
+    # An empty result is still a result, not an unknown question
+    answers = iter(["计算最近0分钟的QPS", "q"])
+    monkeypatch.setenv("OLLAMA_WARM_UP", "false")
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    monkeypatch.setattr(demo_main.FunctionCallingDemo, "process_query", lambda self, query: empty)
+    demo_main.main()
+    output = capsys.readouterr().out
+    assert "QPS统计结果" in output
+    assert "无法理解你的问题" not in output
@@ -0,0 +1,81 @@
+"""Tests of the vectorized QPS simulation against the per-point path."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.demo.services.qps_service import QPSService, _exponential_moving_average
+
+
+def _scalar_ema(values, alphas, initial):
+    result = []
+    current = initial
+    for value, alpha in zip(values, alphas):
+        current = (1 - alpha) * current + alpha * value
+        result.append(current)
+    return np.array(result)
+
+
+@pytest.mark.parametrize("count, low, high", [
+    (10, 0.0, 1.0),
+    (10_000, 0.0, 0.01),    # spans several blocks
+    (5_000, 0.2, 0.9),      # strong decay ends blocks early
+    (200, 0.99, 1.0),       # alpha close to 1 steps one point at a time
+])
+def test_blocked_ema_matches_the_recurrence(count, low, high):
+    rng = np.random.default_rng(count)
+    values = rng.uniform(10, 100, count)
+    alphas = rng.uniform(low, high, count)
+    alphas[::97] = 0.0
+    alphas[::89] = 1.0
+    expected = _scalar_ema(values, alphas, 42.0)
+    np.testing.assert_allclose(_exponential_moving_average(values, alphas, 42.0), expected, rtol=1e-9)
+
+
+def _timestamps(start: datetime, step: timedelta, count: int):
+    return [start + step * index for index in range(count)]
+
+
+def _batch(service: QPSService, timestamps):
+    return service._generate_realistic_qps_batch(np.array(timestamps, dtype="datetime64[us]"))
+
+
+def test_unsmoothed_values_have_the_expected_distribution():
+    # Daily samples at 03:00: off-peak factor 0.5, and a day apart alpha is 1
+    start = (datetime.now() + timedelta(days=1)).replace(hour=3, minute=0, second=0, microsecond=0)
+    service = QPSService(seed=7)
+    values = _batch(service, _timestamps(start, timedelta(days=1), 20_000)) / (service.base_qps * 0.5)
+    assert values.min() >= 0.8 - 0.01 and values.max() <= 1.2 * 2.5 + 0.01
+    # noise ~ U(0.8, 1.2); burst 5% of the time ~ U(1.5, 2.5)
+    assert values.mean() == pytest.approx(1.0 * (0.95 + 0.05 * 2.0), rel=0.01)
+    assert (values > 1.2 + 0.01).mean() == pytest.approx(0.05, abs=0.005)
+
+
+def test_batch_and_scalar_paths_are_statistically_alike():
+    start = (datetime.now() + timedelta(days=1)).replace(hour=12, minute=0, second=0, microsecond=0)
+    timestamps = _timestamps(start, timedelta(seconds=10), 20_000)
+    scalar_service = QPSService(seed=1)
+    batch_service = QPSService(seed=2)
+    batch_service.base_qps = scalar_service.base_qps
+    batch_service.current_qps = batch_service.base_qps
+    scalar = np.array([scalar_service._generate_realistic_qps(timestamp) for timestamp in timestamps])
+    batch = _batch(batch_service, timestamps)
+    for statistic in (np.mean, np.std, lambda values: np.percentile(values, 5), lambda values: np.percentile(values, 95)):
+        assert statistic(batch) == pytest.approx(statistic(scalar), rel=0.03)
+    assert batch_service.current_qps == pytest.approx(batch[-1], abs=0.005)
+    assert batch_service.last_update == timestamps[-1]
+
+
+def test_points_before_the_last_update_keep_the_current_value():
+    service = QPSService(seed=3)
+    past = _timestamps(service.last_update - timedelta(minutes=5), timedelta(minutes=1), 3)
+    current = service.current_qps
+    assert _batch(service, past).tolist() == [round(current, 2)] * 3
+    assert service.current_qps == current
+
+
+def test_seeded_simulation_is_reproducible():
+    first, second = QPSService(seed=11), QPSService(seed=11)
+    second.last_update = first.last_update
+    timestamps = _timestamps(first.last_update + timedelta(seconds=30), timedelta(seconds=30), 10)
+    np.testing.assert_array_equal(_batch(first, timestamps), _batch(second, timestamps))
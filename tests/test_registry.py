@@ -0,0 +1,26 @@
+"""Tests of tool-call validation in the tool registry."""
+import pytest
+
+from src.demo.main import TOOLS
+
+
+def test_parameters_are_coerced_and_aliases_applied():
+    assert TOOLS.validate("calculator", {"x": "23", "y": 45, "operation": "乘"}) == {
+        "x": 23.0, "y": 45.0, "operation": "*"
+    }
+
+
+@pytest.mark.parametrize("parameters", [[["x", 1], ["y", 2], ["operation", "+"]], "x=1", [], 0, True])
+def test_parameters_that_are_not_an_object_are_rejected(parameters):
+    with pytest.raises(ValueError, match="Invalid parameters for calculator: expected an object"):
+        TOOLS.validate("calculator", parameters)
+
+
+def test_missing_parameters_fail_schema_validation():
+    with pytest.raises(ValueError, match="Invalid parameters for calculator"):
+        TOOLS.validate("calculator", None)
+
+
+def test_unknown_tool_is_rejected():
+    with pytest.raises(ValueError, match="Unknown function"):
+        TOOLS.validate("no_such_tool", {})
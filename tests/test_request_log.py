@@ -0,0 +1,127 @@
+"""Tests of RedisRequestRecorder against an in-process fake Redis."""
+import threading
+import time
+
+import fakeredis
+import numpy as np
+import pytest
+
+from src.demo.core.request_log import RedisRequestRecorder
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis()
+
+
+def _expected_windows(counts, start_ts, end_ts, data_points):
+    size = (end_ts - start_ts) / data_points
+    sums = np.zeros(data_points)
+    for second, count in counts.items():
+        if start_ts <= second < end_ts:
+            sums[min(int((second - start_ts) // size), data_points - 1)] += count
+    return sums
+
+
+def test_concurrent_requests_in_one_second_are_all_counted(client):
+    recorder = RedisRequestRecorder(client=client)
+    second = int(time.time())
+
+    def worker():
+        for _ in range(100):
+            recorder.record(timestamp=second + 0.5)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert recorder.per_second_counts(second, second + 1) == [800]
+
+
+def test_batched_counts_are_written_in_one_pipeline(client):
+    recorder = RedisRequestRecorder(client=client, flush_interval_ms=60_000)
+    now = int(time.time())
+    for offset in range(3):
+        recorder.record(count=offset + 1, timestamp=now + offset)
+    assert recorder.per_second_counts(now, now + 3) == [0, 0, 0]
+
+    pipelines = []
+    pipeline = client.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipelines.append(1)
+        return pipeline(*args, **kwargs)
+
+    client.pipeline = counting_pipeline
+    recorder.close()
+    assert len(pipelines) == 1
+    assert recorder.per_second_counts(now, now + 3) == [1, 2, 3]
+
+
+def test_background_flusher_writes_and_survives_errors(client):
+    recorder = RedisRequestRecorder(client=client, flush_interval_ms=20)
+    write = recorder._write
+    failures = []
+
+    def failing_once(counts):
+        if not failures:
+            failures.append(counts)
+            raise TypeError("not serializable")
+        write(counts)
+
+    recorder._write = failing_once
+    now = int(time.time())
+    recorder.record(timestamp=now)
+    deadline = time.time() + 2
+    while not failures and time.time() < deadline:
+        time.sleep(0.01)
+    recorder.record(count=5, timestamp=now)
+    while recorder.per_second_counts(now, now + 1) != [5] and time.time() < deadline:
+        time.sleep(0.01)
+    recorder.close()
+    assert failures
+    assert recorder.per_second_counts(now, now + 1) == [5]
+
+
+@pytest.mark.parametrize("span, strategy", [(120, "client"), (600, "server")])
+def test_window_sums_on_both_sides_of_the_threshold(client, span, strategy):
+    recorder = RedisRequestRecorder(client=client, retention_seconds=600)
+    assert recorder.server_side_threshold == 300
+    end_ts = int(time.time())
+    start_ts = end_ts - span
+    counts = {second: second % 7 for second in range(start_ts - 50, end_ts)}
+    for second, count in counts.items():
+        if count:
+            recorder.record(count=count, timestamp=second)
+
+    used = []
+    window_sum = recorder._window_sum
+    recorder._window_sum = lambda **kwargs: used.append("server") or window_sum(**kwargs)
+    auto = recorder.window_counts(start_ts, end_ts, 10)
+    assert used == (["server"] if strategy == "server" else [])
+
+    expected = _expected_windows(counts, start_ts, end_ts, 10)
+    np.testing.assert_array_equal(auto, expected)
+    np.testing.assert_array_equal(recorder.window_counts(start_ts, end_ts, 10, strategy="client"), expected)
+    np.testing.assert_array_equal(recorder.window_counts(start_ts, end_ts, 10, strategy="server"), expected)
+
+
+def test_windows_longer_than_retention_read_only_retained_seconds(client):
+    recorder = RedisRequestRecorder(client=client, retention_seconds=100)
+    end_ts = int(time.time())
+    for second in range(end_ts - 100, end_ts):
+        recorder.record(timestamp=second)
+    for strategy in ("client", "server"):
+        sums = recorder.window_counts(end_ts - 1000, end_ts, 10, strategy=strategy)
+        assert sums.tolist() == [0] * 9 + [100]
+
+
+def test_counters_expire_after_retention(client):
+    recorder = RedisRequestRecorder(client=client, retention_seconds=1)
+    now = int(time.time())
+    recorder.record(timestamp=now)
+    assert 0 < client.ttl(recorder.key(now)) <= 1
+    time.sleep(1.1)
+    assert client.get(recorder.key(now)) is None
+    assert recorder.per_second_counts(now, now + 1) == [0]
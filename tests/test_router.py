@@ -0,0 +1,44 @@
+"""Tests of the deterministic fast-path router."""
+import subprocess
+import sys
+
+import pytest
+
+from src.demo.core.router import FastPathRouter
+
+
+@pytest.fixture
+def router():
+    return FastPathRouter()
+
+
+@pytest.mark.parametrize("query, expression", [
+    ("计算 (23*45+12)/3", "(23*45+12)/3"),
+    ("计算 2*3-4", "2*3-4"),
+    ("算一下 2^10-1", "2^10-1"),
+])
+def test_expressions_are_routed(router, query, expression):
+    assert router.route(query) == {"function": "evaluate_expression", "parameters": {"expression": expression}}
+
+
+@pytest.mark.parametrize("query", [
+    "2023-01-01",
+    "计算 2023-01-01",
+    "计算 2024/1/2",
+    "计算 10/2/2024",
+    "计算 ((1+2)",
+    "计算 5%",
+])
+def test_dates_and_invalid_expressions_fall_back_to_the_llm(router, query):
+    assert router.route(query) is None
+
+
+def test_routing_keeps_case_of_identifiers(router):
+    assert router.route("查询用户AbC最近3个月的订单")["parameters"]["user_id"] == "AbC"
+
+
+def test_importing_the_cli_loads_no_services():
+    script = ("import sys, src.demo.main; "
+              "print(sorted(name for name in sys.modules if name.startswith('src.demo.services')))")
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,51 @@
+"""Tests of the routing cache and how FunctionCallingDemo fills it."""
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from src.demo.core.cache import RoutingCache
+from src.demo.main import FunctionCallingDemo
+
+
+class FakeLLM:
+    """Returns the same reply to every prompt and counts the calls."""
+
+    def __init__(self, reply: Dict[str, Any]):
+        self.reply = json.dumps(reply, ensure_ascii=False)
+        self.prompts: List[str] = []
+
+    def invoke(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self.reply
+
+
+def _demo(reply: Dict[str, Any]) -> FunctionCallingDemo:
+    return FunctionCallingDemo(llm=FakeLLM(reply), enable_fast_path=False)
+
+
+def test_invalid_llm_call_is_not_cached():
+    demo = _demo({"function": "calculator", "parameters": {"x": "abc", "y": 2, "operation": "乘以"}})
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            demo.process_query("帮我算一下abc乘以2")
+    assert len(demo.llm.prompts) == 3
+    assert demo.route_counts == {"fast_path": 0, "cache": 0, "llm": 3}
+    assert demo.routing_cache.get("帮我算一下abc乘以2") is None
+
+
+def test_executed_llm_call_is_cached():
+    demo = _demo({"function": "calculator", "parameters": {"x": 23, "y": 45, "operation": "*"}})
+    first = demo.process_query("二十三乘四十五是多少")
+    second = demo.process_query("二十三乘四十五是多少？")
+    assert first.result == second.result == 1035
+    assert len(demo.llm.prompts) == 1
+    assert demo.route_counts["cache"] == 1
+
+
+def test_cache_keys_keep_case():
+    cache = RoutingCache()
+    cache.set("查询用户AbC的订单", {"function": "get_recent_orders", "parameters": {"user_id": "AbC"}})
+    assert cache.get("查询用户abc的订单") is None
+    assert cache.get("查询用户AbC的订单？")["parameters"]["user_id"] == "AbC"
+    assert cache.get("  查询用户AbC的订单  ") is not None
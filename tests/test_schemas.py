@@ -0,0 +1,36 @@
+"""Tests of the schemas services build without validation."""
+from datetime import datetime
+
+import pytest
+
+from src.demo.schemas import base
+
+_ITEM = {"order_id": "ORD-1", "date": "2024-01-01T00:00:00", "product": "Product 1",
+         "quantity": 2, "price": 10.0, "total": 20.0, "status": "completed"}
+_PACKAGE = {"id": "p-1", "name": "VIP", "price": 1200.0, "duration": 12, "features": ["专属支持"]}
+
+SAMPLES = {
+    base.BatchCalculationResponse: {"operation": "+", "count": 2, "results": [1.0, 2.5]},
+    base.OrderItem: _ITEM,
+    base.OrderResponse: {"user_id": "12345", "period": "Last 3 months", "total_orders": 1,
+                         "orders": [base.OrderItem(**_ITEM)]},
+    base.OrderSummary: {"user_id": "12345", "period": "Last 3 months", "total_orders": 1,
+                        "total_amount": 20.0, "status_counts": {"completed": 1}},
+    base.Package: _PACKAGE,
+    base.PackageResponse: {"package": base.Package(**_PACKAGE), "payment_url": "https://example.com/pay"},
+    base.QPSData: {"timestamp": datetime(2024, 1, 1), "qps_value": 12.5},
+}
+
+
+def test_every_trusted_model_has_a_sample():
+    assert set(base.TrustedModel.__subclasses__()) == set(SAMPLES)
+
+
+@pytest.mark.parametrize("model", list(SAMPLES), ids=lambda model: model.__name__)
+def test_trusted_equals_validated(model):
+    data = SAMPLES[model]
+    trusted = model.trusted(**data)
+    validated = model.model_validate(data)
+    assert trusted == validated
+    assert trusted.model_fields_set == validated.model_fields_set
+    assert trusted.model_dump() == validated.model_dump()
@@ -0,0 +1,79 @@
+"""Tests of streaming function calls that stop generation at the first complete call."""
+import asyncio
+from typing import List
+
+import pytest
+
+from src.demo.main import FunctionCallingDemo
+
+CALL = '```json\n{"function": "calculator", "parameters": {"x": 6, "y": 7, "operation": "*"}}\n```'
+
+
+class FakeStreamingLLM:
+    """Streams a reply in small chunks, then keeps generating filler; records how far it got."""
+
+    def __init__(self, reply: str, filler: int = 1000):
+        self.chunks = [reply[i:i + 3] for i in range(0, len(reply), 3)] + [" 解释"] * filler
+        self.sent = 0
+        self.closed = False
+
+    def stream(self, prompt: str):
+        try:
+            for chunk in self.chunks:
+                self.sent += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+    async def astream(self, prompt: str):
+        try:
+            for chunk in self.chunks:
+                self.sent += 1
+                yield chunk
+                await asyncio.sleep(0)
+        finally:
+            self.closed = True
+
+    def invoke(self, prompt: str) -> str:
+        raise AssertionError("streaming mode must not call invoke")
+
+    async def ainvoke(self, prompt: str) -> str:
+        raise AssertionError("streaming mode must not call ainvoke")
+
+
+def _demo(llm: FakeStreamingLLM) -> FunctionCallingDemo:
+    return FunctionCallingDemo(llm=llm, streaming=True, enable_fast_path=False, enable_cache=False)
+
+
+def _chunks_until(reply: str, text: str) -> int:
+    return -(-(reply.index(text) + len(text)) // 3)
+
+
+def test_generation_stops_after_the_closing_brace():
+    llm = FakeStreamingLLM(CALL)
+    assert _demo(llm).process_query("六乘以七").result == 42
+    assert llm.sent == _chunks_until(CALL, "}}")
+    assert llm.closed
+
+
+def test_async_generation_stops_after_the_closing_brace():
+    llm = FakeStreamingLLM(CALL)
+    assert asyncio.run(_demo(llm).aprocess_query("六乘以七")).result == 42
+    assert llm.sent == _chunks_until(CALL, "}}")
+    assert llm.closed
+
+
+def test_objects_that_are_not_calls_are_skipped():
+    reply = '例如 {"note": "x"} 或 {"function": "nope"} ' + CALL
+    llm = FakeStreamingLLM(reply)
+    assert _demo(llm).process_query("六乘以七").result == 42
+    assert llm.sent == _chunks_until(reply, "}}")
+
+
+@pytest.mark.parametrize("reply", ["{}", "没有合适的函数"])
+def test_no_call_returns_none(reply):
+    llm = FakeStreamingLLM(reply, filler=5)
+    assert _demo(llm).process_query("讲个笑话") is None
+    assert llm.closed
+    if reply == "{}":
+        assert llm.sent == 1
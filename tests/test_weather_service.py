@@ -0,0 +1,107 @@
+"""Tests of WeatherService caching, TTL expiry and coalescing of concurrent misses."""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from src.demo.core.cache import InMemoryCacheBackend
+from src.demo.services.weather_service import MockWeatherProvider, WeatherService
+
+
+class BlockingProvider(MockWeatherProvider):
+    """Mock provider whose fetches wait until released, optionally failing."""
+
+    def __init__(self, error: Optional[Exception] = None):
+        super().__init__()
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def fetch(self, location: str) -> Dict[str, Any]:
+        self.started.set()
+        assert self.release.wait(5)
+        if self.error is not None:
+            self.calls += 1
+            raise self.error
+        return super().fetch(location)
+
+
+def _concurrent_lookups(service: WeatherService, provider: BlockingProvider, count: int) -> List[Any]:
+    outcomes: List[Any] = [None] * count
+
+    def lookup(index: int) -> None:
+        try:
+            outcomes[index] = service.get_current_weather("Beijing")
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=lookup, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    assert provider.started.wait(5)
+    # Let every other lookup reach the in-flight fetch before it completes
+    deadline = time.monotonic() + 5
+    while service.coalesced < count - 1 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    provider.release.set()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_repeated_lookups_are_served_from_cache():
+    provider = MockWeatherProvider(temperature_c=20.0)
+    service = WeatherService(provider=provider)
+    celsius = service.get_current_weather("Beijing")
+    fahrenheit = service.get_current_weather(" beijing ", unit="fahrenheit")
+    assert (celsius.temperature, fahrenheit.temperature) == ("20", "68")
+    assert provider.calls == 1
+    assert service.stats()["hits"] == 1
+
+
+def test_entries_expire_after_ttl():
+    provider = MockWeatherProvider()
+    service = WeatherService(provider=provider, cache=InMemoryCacheBackend(ttl_seconds=0.05))
+    service.get_current_weather("Beijing")
+    service.get_current_weather("Beijing")
+    assert provider.calls == 1
+    time.sleep(0.06)
+    service.get_current_weather("Beijing")
+    assert provider.calls == 2
+
+
+def test_concurrent_misses_share_one_fetch():
+    provider = BlockingProvider()
+    service = WeatherService(provider=provider)
+    outcomes = _concurrent_lookups(service, provider, 16)
+    assert provider.calls == 1
+    assert all(outcome.temperature == "22" for outcome in outcomes)
+    assert service.stats()["misses"] == 1
+    assert service.stats()["coalesced"] == 15
+
+
+def test_fetch_error_reaches_every_waiter_and_is_not_cached():
+    provider = BlockingProvider(error=ConnectionError("upstream down"))
+    service = WeatherService(provider=provider)
+    outcomes = _concurrent_lookups(service, provider, 8)
+    assert provider.calls == 1
+    assert all(isinstance(outcome, ConnectionError) for outcome in outcomes)
+
+    provider.error = None
+    assert service.get_current_weather("Beijing").temperature == "22"
+    assert provider.calls == 2
+
+
+def test_get_weather_many_fetches_each_location_once():
+    provider = MockWeatherProvider()
+    service = WeatherService(provider=provider)
+    responses = service.get_weather_many(["Beijing", "Shanghai", "beijing", "Beijing"])
+    assert [response.location for response in responses] == ["Beijing", "Shanghai", "beijing", "Beijing"]
+    assert provider.calls == 2
+    service.shutdown()
+
+
+def test_unknown_unit_is_rejected():
+    with pytest.raises(ValueError):
+        WeatherService().get_current_weather("Beijing", unit="kelvin")